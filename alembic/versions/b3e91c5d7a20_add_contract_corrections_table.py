@@ -0,0 +1,43 @@
+"""Add contract corrections table
+
+Revision ID: b3e91c5d7a20
+Revises: a88fe1bbb3ab
+Create Date: 2026-10-19 06:10:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e91c5d7a20'
+down_revision: Union[str, None] = 'a88fe1bbb3ab'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('contract_corrections',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('contract_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('correction_id', sa.String(length=36), nullable=False),
+    sa.Column('section', sa.String(length=255), nullable=False),
+    sa.Column('reason', sa.Text(), nullable=False),
+    sa.Column('diff', sa.LargeBinary(), nullable=False),
+    sa.Column('compressed', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['contract_id'], ['contracts.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_contract_corrections_id'), 'contract_corrections', ['id'], unique=False)
+    op.create_index('ix_contract_corrections_contract_id_id', 'contract_corrections', ['contract_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_contract_corrections_contract_id_id', table_name='contract_corrections')
+    op.drop_index(op.f('ix_contract_corrections_id'), table_name='contract_corrections')
+    op.drop_table('contract_corrections')
@@ -0,0 +1,40 @@
+"""Add contract variants table
+
+Revision ID: c5a7e2f91b34
+Revises: b3e91c5d7a20
+Create Date: 2026-10-19 09:40:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5a7e2f91b34'
+down_revision: Union[str, None] = 'b3e91c5d7a20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('contract_variants',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('contract_id', sa.Integer(), nullable=False),
+    sa.Column('jurisdiction', sa.String(length=100), nullable=False),
+    sa.Column('prefix_length', sa.Integer(), nullable=False),
+    sa.Column('suffix_length', sa.Integer(), nullable=False),
+    sa.Column('delta', sa.Text(), nullable=False),
+    sa.Column('base_checksum', sa.String(length=64), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['contract_id'], ['contracts.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('contract_id', 'jurisdiction', name='uq_contract_variants_contract_id_jurisdiction')
+    )
+    op.create_index(op.f('ix_contract_variants_id'), 'contract_variants', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_contract_variants_id'), table_name='contract_variants')
+    op.drop_table('contract_variants')
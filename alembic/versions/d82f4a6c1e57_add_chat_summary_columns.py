@@ -0,0 +1,32 @@
+"""Add chat summary columns
+
+Revision ID: d82f4a6c1e57
+Revises: c5a7e2f91b34
+Create Date: 2026-10-19 12:10:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd82f4a6c1e57'
+down_revision: Union[str, None] = 'c5a7e2f91b34'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('chats', sa.Column('summary', sa.Text(), nullable=True))
+    op.add_column('chats', sa.Column('summarized_message_id', sa.Integer(), nullable=True))
+    op.add_column('chats', sa.Column('summary_updated_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index('ix_messages_chat_id_id', 'messages', ['chat_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_messages_chat_id_id', table_name='messages')
+    op.drop_column('chats', 'summary_updated_at')
+    op.drop_column('chats', 'summarized_message_id')
+    op.drop_column('chats', 'summary')
@@ -0,0 +1,59 @@
+import re
+from typing import Dict, List, Optional
+
+from app.agents.contract_document import ContractDocument
+from app.agents.contract_layout import clause_number
+
+
+# Inline markers and the citation lists placed after major sections
+_CITATION = re.compile(
+    r"\[Ref\.?\s*(?P<ref>\d+)\]"
+    r"|\[References used:(?P<refs>[^\]\n]*)\]",
+    re.I
+)
+_REF_IN_LIST = re.compile(r"Ref\.?\s*(\d+)", re.I)
+
+
+def _section_title(section) -> str:
+    if section.key == ContractDocument.PREAMBLE:
+        return "Preamble"
+    if clause_number(section.heading):
+        # A clause's heading is its whole first line; its number names it
+        return section.key
+    return section.heading or section.key
+
+
+def index_citations(
+    draft: str,
+    reference_count: Optional[int] = None,
+    document: Optional[ContractDocument] = None
+) -> Dict[int, List[str]]:
+    """
+    Map each cited reference number to the sections citing it.
+
+    Both ``[Ref N]`` markers and ``[References used: Ref X, Ref Y]`` lists
+    are found in one scan of ``draft``; the section of each match comes
+    from the ContractDocument section index, walked alongside the scan.
+    Sections are named by heading ("2. FEES"), clauses by their number
+    ("1.1"), and listed in order of first citation. Numbers outside 1..``reference_count`` are ignored.
+    """
+    document = document or ContractDocument(draft)
+    sections = document.sections
+    cited: Dict[int, Dict[str, None]] = {}  # dicts as insertion-ordered sets
+    section_index = 0
+    for match in _CITATION.finditer(draft):
+        while section_index + 1 < len(sections) and sections[section_index + 1].start <= match.start():
+            section_index += 1
+        section = sections[section_index]
+        title = _section_title(section)
+
+        if match.lastgroup == "ref":
+            numbers = (match.group("ref"),)
+        else:
+            numbers = _REF_IN_LIST.findall(match.group("refs"))
+        for number in numbers:
+            number = int(number)
+            if number < 1 or (reference_count is not None and number > reference_count):
+                continue
+            cited.setdefault(number, {})[title] = None
+    return {number: list(titles) for number, titles in cited.items()}
@@ -0,0 +1,96 @@
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional
+
+
+# Section kinds
+CLAUSE = "clause"
+GOVERNING_LAW = "governing_law"
+COMPLIANCE = "compliance"
+MULTI_JURISDICTION = "multi_jurisdiction"
+
+
+@dataclass(frozen=True)
+class ContractSection:
+    """A block of text appended to a contract"""
+    key: str
+    kind: str
+    text: str
+
+
+class ContractBuilder:
+    """
+    Append-only contract text.
+
+    Agents append typed sections after the drafted body instead of
+    concatenating onto the content string, which copies the whole contract
+    on every append. Sections are keyed: appending a key that is already
+    present replaces its text in place, so a clause added twice appears
+    once. The text is joined once, when ``build`` is called, and cached
+    until the next append.
+    """
+
+    SEPARATOR = "\n\n"
+
+    def __init__(self, body: str = ""):
+        self.body = body
+        self._sections: Dict[str, ContractSection] = {}
+        self._text: Optional[str] = body
+
+    @classmethod
+    def from_text(cls, text: str, prefixes: Mapping[str, str]) -> "ContractBuilder":
+        """
+        Builder for ``text`` that already ends with appended sections.
+
+        Trailing paragraphs starting with one of ``prefixes`` (key -> opening
+        words) become keyed sections again, so customizing a contract twice
+        replaces those sections instead of repeating them. Only the tail of
+        the text is examined.
+        """
+        end = len(text)
+        trailing: List[ContractSection] = []
+        while True:
+            start = text.rfind(cls.SEPARATOR, 0, end)
+            if start < 0:
+                break
+            paragraph = text[start + len(cls.SEPARATOR):end]
+            key = next((key for key, prefix in prefixes.items() if paragraph.startswith(prefix)), None)
+            if key is None or any(section.key == key for section in trailing):
+                break
+            trailing.append(ContractSection(key=key, kind=key, text=paragraph))
+            end = start
+        # Slice the body only if sections were found
+        builder = cls(text[:end] if end < len(text) else text)
+        for section in reversed(trailing):
+            builder.append(section.key, section.text, section.kind)
+        return builder
+
+    def append(self, key: str, text: str, kind: str = CLAUSE) -> bool:
+        """Add (or replace) section ``key``. Returns True if the key is new."""
+        is_new = key not in self._sections
+        self._sections[key] = ContractSection(key=key, kind=kind, text=text)
+        self._text = None
+        return is_new
+
+    def discard(self, key: str) -> None:
+        if self._sections.pop(key, None) is not None:
+            self._text = None
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._sections
+
+    def get(self, key: str) -> Optional[ContractSection]:
+        return self._sections.get(key)
+
+    @property
+    def sections(self) -> List[ContractSection]:
+        return list(self._sections.values())
+
+    def build(self) -> str:
+        """The full contract text: the body followed by each section."""
+        if self._text is None:
+            parts = [self.body]
+            for section in self._sections.values():
+                parts.append(self.SEPARATOR)
+                parts.append(section.text)
+            self._text = "".join(parts)
+        return self._text
@@ -0,0 +1,268 @@
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.agents.contract_layout import clause_number, heading_text
+
+
+# "2.", "2.1", "Section 2", "Article IV": roman numerals only after a keyword
+_HEADING_NUMBER = re.compile(
+    r"^(?:(?:article|section|clause)\s+(\d+(?:\.\d+)*|[ivxlc]+)|(\d+(?:\.\d+)*))\b[.:)]?\s*", re.I
+)
+
+
+def _section_number(name: str) -> Optional[str]:
+    match = _HEADING_NUMBER.match(name)
+    if not match:
+        return None
+    return (match.group(1) or match.group(2)).lower()
+
+
+def normalize_section_name(name: str) -> str:
+    """Lower-case a section reference and drop "Section"/"Clause" words and numbering."""
+    name = _HEADING_NUMBER.sub("", name.strip().lower())
+    return " ".join(name.strip(" .:-–—").split())
+
+
+@dataclass(frozen=True)
+class Section:
+    """
+    One addressable part of a contract.
+
+    ``start`` and ``end`` are character offsets into the original text;
+    ``body_start`` is where the replaceable text begins, after the heading
+    line or the clause number. ``parent`` is the index of the enclosing
+    section, if any, and ``last`` the index of its last sub-section (its
+    own index when it has none), so ``start``..``end`` covers sections
+    ``index``..``last``.
+    """
+    index: int
+    key: str
+    heading: str
+    level: int
+    parent: Optional[int]
+    start: int
+    body_start: int
+    end: int
+    last: int
+
+
+class _Fenwick:
+    """Prefix sums over section lengths with O(log n) updates."""
+
+    def __init__(self, values: List[int]):
+        self._tree = [0] + list(values)
+        size = len(self._tree)
+        for i in range(1, size):
+            parent = i + (i & -i)
+            if parent < size:
+                self._tree[parent] += self._tree[i]
+
+    def add(self, index: int, delta: int) -> None:
+        i = index + 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def prefix(self, index: int) -> int:
+        """Sum of the first ``index`` values."""
+        total = 0
+        i = index
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+
+# A piece is (buffer, start, length); buffer -1 is the original text,
+# otherwise an index into the added strings
+Piece = Tuple[int, int, int]
+
+
+class ContractDocument:
+    """
+    Contract text with a section index and a piece table for edits.
+
+    The text is scanned once for section headings (numbered or all-caps
+    headings, markdown headings, numbered clauses such as "2.1"); each
+    section runs until the next heading of the same or a higher level, so
+    "2" covers its clauses 2.1 and 2.2, and text before the first heading
+    is the "preamble". Sections can be looked up by number ("2.1",
+    "Section 2") or heading ("Payment Terms") in O(1).
+
+    The text between one heading and the next is stored as that section's
+    pieces. Replacing a section's body appends the new text to an add
+    buffer and swaps the pieces of the section and its sub-sections, so an
+    edit costs time proportional to the edit, not the document. Current
+    offsets come from a Fenwick tree of those lengths. The full text is
+    only assembled when ``text`` is read, and then cached until the next
+    edit.
+    """
+
+    PREAMBLE = "preamble"
+
+    def __init__(self, text: str):
+        self._original = text
+        self._added: List[str] = []
+        self.sections: List[Section] = []
+        self._by_key: Dict[str, int] = {}
+        # Sub-sections replaced along with their parent; they no longer exist
+        self._removed: Set[int] = set()
+        self._scan()
+        starts = [section.start for section in self.sections] + [len(text)]
+        self._pieces: List[List[Piece]] = [
+            [(-1, starts[index], starts[index + 1] - starts[index])] for index in range(len(self.sections))
+        ]
+        self._lengths = _Fenwick([starts[index + 1] - starts[index] for index in range(len(self.sections))])
+        self._text: Optional[str] = text
+        self.edits = 0
+
+    def _scan(self) -> None:
+        headers = []  # (start, body_start, key, heading, level)
+        offset = 0
+        for raw_line in self._original.splitlines(keepends=True):
+            line = raw_line.strip()
+            if line:
+                leading = len(raw_line) - len(raw_line.lstrip())
+                number = clause_number(line)
+                heading = None if number else heading_text(line)
+                if number:
+                    body_offset = len(raw_line) - len(raw_line.lstrip()[len(number):].lstrip(". \t"))
+                    headers.append((offset, offset + body_offset, number, line, number.count(".") + 1))
+                elif heading is not None:
+                    number = _section_number(heading)
+                    key = number or heading
+                    if number and number[0].isdigit():
+                        # "2. PAYMENT TERMS" is at the level of its number, whatever its markdown depth
+                        level = number.count(".") + 1
+                    else:
+                        level = len(line) - len(line.lstrip("#")) or 1
+                    headers.append((offset + leading, offset + len(raw_line), key, heading, level))
+            offset += len(raw_line)
+
+        if not headers or headers[0][0] > 0:
+            headers.insert(0, (0, 0, self.PREAMBLE, "", 0))
+
+        # A section's last sub-section is the one before the next heading at its level or above
+        parents: List[Optional[int]] = []
+        lasts = list(range(len(headers)))
+        stack: List[int] = []
+        for index, (_, _, key, _, level) in enumerate(headers):
+            while stack and headers[stack[-1]][4] >= level:
+                lasts[stack.pop()] = index - 1
+            parents.append(stack[-1] if stack else None)
+            if key != self.PREAMBLE:
+                stack.append(index)
+        for index in stack:
+            lasts[index] = len(headers) - 1
+
+        for index, (start, body_start, key, heading, level) in enumerate(headers):
+            last = lasts[index]
+            end = headers[last + 1][0] if last + 1 < len(headers) else len(self._original)
+            if index == 0:
+                start = 0
+            section = Section(
+                index=index,
+                key=key,
+                heading=heading,
+                level=level,
+                parent=parents[index],
+                start=start,
+                body_start=max(body_start, start),
+                end=end,
+                last=last,
+            )
+            self.sections.append(section)
+            for name in (key.lower(), normalize_section_name(heading)):
+                # First occurrence wins, so a later duplicate heading cannot shadow an earlier section
+                if name and name not in self._by_key:
+                    self._by_key[name] = index
+
+    def find(self, name: str) -> Optional[int]:
+        """Index of the section called ``name`` (number or heading), if any."""
+        name = name.strip()
+        lowered = name.lower()
+        index = self._by_key.get(lowered)
+        if index is None:
+            index = self._by_key.get(_section_number(lowered))
+        if index is None:
+            index = self._by_key.get(normalize_section_name(name))
+        return None if index in self._removed else index
+
+    def offset(self, index: int) -> int:
+        """Current character offset of section ``index``."""
+        return self._lengths.prefix(index)
+
+    def children(self, index: int) -> List[int]:
+        return [section.index for section in self.sections if section.parent == index]
+
+    def section_text(self, index: int) -> str:
+        """Current text of section ``index``, heading and sub-sections included."""
+        return "".join(
+            self._piece_text(piece)
+            for pieces in self._pieces[index:self.sections[index].last + 1]
+            for piece in pieces
+        )
+
+    def own_text(self, index: int) -> str:
+        """Current text of section ``index`` up to its first sub-section, heading included."""
+        return "".join(self._piece_text(piece) for piece in self._pieces[index])
+
+    def section_body(self, index: int) -> str:
+        """Current text of section ``index`` after its heading, without surrounding whitespace."""
+        section = self.sections[index]
+        return self.section_text(index)[section.body_start - section.start:].strip()
+
+    def replace_section(self, index: int, body: str) -> str:
+        """
+        Replace the body of section ``index``, keeping its heading and the
+        whitespace around the body (the blank line after the heading, the
+        separation from the next section). Its sub-sections are part of the
+        body, so they are replaced too and can no longer be found. Returns
+        the previous body.
+        """
+        section = self.sections[index]
+        current = self.section_text(index)
+        heading_length = section.body_start - section.start
+        previous = current[heading_length:]
+        stripped = previous.strip()
+        lead = previous[:len(previous) - len(previous.lstrip())] if stripped else ""
+        tail = previous[len(previous.rstrip()):]
+        body = lead + body if body else body
+
+        head = self._pieces[index][0]
+        pieces: List[Piece] = []
+        if heading_length:
+            # The heading is never edited, so it is always the start of the first piece
+            pieces.append((head[0], head[1], heading_length))
+        if body:
+            self._added.append(body)
+            pieces.append((len(self._added) - 1, 0, len(body)))
+        if tail:
+            self._added.append(tail)
+            pieces.append((len(self._added) - 1, 0, len(tail)))
+
+        new_length = heading_length + len(body) + len(tail)
+        self._lengths.add(index, new_length - sum(piece[2] for piece in self._pieces[index]))
+        self._pieces[index] = pieces
+        for child in range(index + 1, section.last + 1):
+            self._lengths.add(child, -sum(piece[2] for piece in self._pieces[child]))
+            self._pieces[child] = []
+            self._removed.add(child)
+        self._text = None
+        self.edits += 1
+        return stripped
+
+    @property
+    def text(self) -> str:
+        """The full current text, assembled once per batch of edits."""
+        if self._text is None:
+            self._text = "".join(
+                self._piece_text(piece) for pieces in self._pieces for piece in pieces
+            )
+        return self._text
+
+    def _piece_text(self, piece: Piece) -> str:
+        buffer, start, length = piece
+        source = self._original if buffer < 0 else self._added[buffer]
+        return source[start:start + length]
@@ -0,0 +1,259 @@
+import os
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import BinaryIO, Dict, List, Optional, Union
+from xml.sax.saxutils import escape
+
+from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas as pdf_canvas
+from reportlab.platypus import KeepTogether, Paragraph, SimpleDocTemplate, Spacer
+
+from app.core.config import settings
+
+
+# Block kinds produced by parse_contract
+TITLE = "title"
+HEADING = "heading"
+CLAUSE = "clause"
+LIST_ITEM = "list_item"
+SIGNATURE = "signature"
+PARAGRAPH = "paragraph"
+
+
+@dataclass(frozen=True)
+class Block:
+    """One structural element of a contract"""
+    kind: str
+    text: str
+    level: int = 0
+
+
+_NUMBERED_HEADING = re.compile(r"^(?:(?:ARTICLE|SECTION)\s+[\dIVXLC]+\b.*|\d{1,2}\.\s+[A-Z][A-Z0-9 ,;:&'()/\-]+)$")
+_CLAUSE_NUMBER = re.compile(r"^(\d+(?:\.\d+)+)\.?\s+")
+_LIST_MARKER = re.compile(r"^\s*(?:[-•*]|\(?[a-z]\)|\(?[ivx]+\)|\d+\))\s+")
+# Only lines that open or fill in a signature block: underscore rules and
+# labels at the start of the line, never clauses that merely mention them
+_SIGNATURE_LINE = re.compile(
+    r"^(?:_{4,}|(?:signature|by|(?:printed\s+)?name|title|designation|date|place|company seal)\s*:"
+    r"|witness(?:es)?(?:\s*\d+)?\s*:?$|in witness whereof\b|signed(?:,? sealed and delivered)?\s+(?:by|for)\b)",
+    re.I,
+)
+_MARKDOWN_HEADING = re.compile(r"^#{1,6}\s+")
+_BOLD = re.compile(r"\*\*(.+?)\*\*")
+
+
+def _is_heading(line: str) -> bool:
+    if _NUMBERED_HEADING.match(line):
+        return True
+    letters = [c for c in line if c.isalpha()]
+    return 0 < len(line) <= 80 and len(letters) >= 3 and line.upper() == line and not line.endswith(".")
+
+
+def heading_text(line: str) -> Optional[str]:
+    """Text of ``line`` (already stripped) if it is a heading, else None."""
+    text = _MARKDOWN_HEADING.sub("", line).strip("*").strip()
+    if _MARKDOWN_HEADING.match(line) or _is_heading(text):
+        return text
+    return None
+
+
+def clause_number(line: str) -> Optional[str]:
+    """Number of a clause line such as "2.1 The Client shall ...", else None."""
+    match = _CLAUSE_NUMBER.match(line)
+    return match.group(1) if match else None
+
+
+def _starts_section(line: str) -> bool:
+    """True for numbered clauses and numbered or markdown headings."""
+    return bool(_CLAUSE_NUMBER.match(line) or _MARKDOWN_HEADING.match(line) or _NUMBERED_HEADING.match(line))
+
+
+def parse_contract(text: str) -> List[Block]:
+    """
+    Split contract text into structural blocks in one pass over its lines.
+
+    Recognises the title (first heading-like line), section headings
+    (numbered or all-caps lines, markdown ``#`` headings), numbered clauses
+    with their depth, list items, and signature blocks (a line starting
+    with a signature label or underscore rule, plus the short lines after
+    it). Numbered clauses and headings are never taken as signature lines,
+    whatever they mention. Other lines are joined into paragraphs at blank
+    lines.
+    """
+    blocks: List[Block] = []
+    paragraph: List[str] = []
+    signature: List[str] = []
+
+    def flush_paragraph():
+        if paragraph:
+            blocks.append(Block(PARAGRAPH, " ".join(paragraph)))
+            paragraph.clear()
+
+    def flush_signature():
+        if signature:
+            blocks.append(Block(SIGNATURE, "\n".join(signature)))
+            signature.clear()
+
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if not line:
+            flush_paragraph()
+            flush_signature()
+            continue
+
+        if not _starts_section(line):
+            if _SIGNATURE_LINE.match(line):
+                flush_paragraph()
+                signature.append(line)
+                continue
+            if signature and len(line) <= 60:
+                # Short lines following a signature line belong to the same block
+                signature.append(line)
+                continue
+        flush_signature()
+
+        heading = heading_text(line)
+        if heading is not None:
+            flush_paragraph()
+            kind = TITLE if not blocks else HEADING
+            blocks.append(Block(kind, heading))
+            continue
+        number = clause_number(line)
+        if number:
+            flush_paragraph()
+            blocks.append(Block(CLAUSE, line, level=number.count(".")))
+            continue
+        if _LIST_MARKER.match(raw_line):
+            flush_paragraph()
+            indent = len(raw_line) - len(raw_line.lstrip())
+            blocks.append(Block(LIST_ITEM, _LIST_MARKER.sub("", raw_line, count=1).strip(), level=indent // 2))
+            continue
+        paragraph.append(line)
+
+    flush_paragraph()
+    flush_signature()
+    return blocks
+
+
+@lru_cache(maxsize=1)
+def _fonts() -> Dict[str, str]:
+    """
+    Register fonts once per process.
+
+    Uses the TTFs at ``PDF_FONT_PATH`` and ``PDF_BOLD_FONT_PATH`` when
+    configured, else the built-in Times.
+    """
+    regular_path = settings.PDF_FONT_PATH
+    bold_path = settings.PDF_BOLD_FONT_PATH
+    if regular_path and os.path.exists(regular_path):
+        pdfmetrics.registerFont(TTFont("ContractRegular", regular_path))
+        bold = "ContractRegular"
+        if bold_path and os.path.exists(bold_path):
+            pdfmetrics.registerFont(TTFont("ContractBold", bold_path))
+            bold = "ContractBold"
+        pdfmetrics.registerFontFamily("ContractRegular", normal="ContractRegular", bold=bold)
+        return {"regular": "ContractRegular", "bold": bold}
+    return {"regular": "Times-Roman", "bold": "Times-Bold"}
+
+
+@lru_cache(maxsize=1)
+def _styles() -> Dict[str, ParagraphStyle]:
+    """Paragraph styles, built once per process and shared by all documents."""
+    fonts = _fonts()
+    base = getSampleStyleSheet()["Normal"]
+    body = ParagraphStyle("ContractBody", parent=base, fontName=fonts["regular"], fontSize=11,
+                          leading=15, alignment=TA_JUSTIFY, spaceAfter=8)
+    return {
+        TITLE: ParagraphStyle("ContractTitle", parent=body, fontName=fonts["bold"], fontSize=16,
+                              leading=20, alignment=TA_CENTER, spaceAfter=18),
+        HEADING: ParagraphStyle("ContractHeading", parent=body, fontName=fonts["bold"], fontSize=12,
+                                leading=16, spaceBefore=10, spaceAfter=6, keepWithNext=1),
+        CLAUSE: body,
+        LIST_ITEM: ParagraphStyle("ContractListItem", parent=body, leftIndent=18, bulletIndent=6, spaceAfter=4),
+        SIGNATURE: ParagraphStyle("ContractSignature", parent=body, alignment=0, leading=18, spaceBefore=12),
+        PARAGRAPH: body,
+    }
+
+
+@lru_cache(maxsize=None)
+def _clause_style(level: int) -> ParagraphStyle:
+    """Indented style for clauses nested ``level`` deep, built once per level."""
+    return ParagraphStyle(f"ContractClause{level}", parent=_styles()[CLAUSE], leftIndent=12 * (level - 1))
+
+
+def _markup(text: str) -> str:
+    """Escape text for reportlab's paragraph markup, keeping **bold**."""
+    return _BOLD.sub(r"<b>\1</b>", escape(text))
+
+
+class _NumberedCanvas(pdf_canvas.Canvas):
+    """
+    Canvas that stamps "Page X of Y" in a single build.
+
+    Every page references a form XObject for the total page count; the
+    form is only drawn in save(), once the total is known, so no second
+    layout pass is needed.
+    """
+
+    _TOTAL_FORM = "contractPageTotal"
+
+    def showPage(self):
+        fonts = _fonts()
+        width, _ = self._pagesize
+        label = f"Page {self._pageNumber} of "
+        self.saveState()
+        self.setFont(fonts["regular"], 9)
+        label_width = self.stringWidth(label, fonts["regular"], 9)
+        x = (width - label_width) / 2
+        self.drawString(x, 0.5 * inch, label)
+        self.translate(x + label_width, 0.5 * inch)
+        self.doForm(self._TOTAL_FORM)
+        self.restoreState()
+        super().showPage()
+
+    def save(self):
+        self.beginForm(self._TOTAL_FORM)
+        self.setFont(_fonts()["regular"], 9)
+        self.drawString(0, 0, str(self._pageNumber - 1))
+        self.endForm()
+        super().save()
+
+
+def _flowables(blocks: List[Block]) -> list:
+    styles = _styles()
+    story = []
+    for block in blocks:
+        style = styles[block.kind]
+        if block.kind == SIGNATURE:
+            lines = "<br/>".join(_markup(line) for line in block.text.split("\n"))
+            story.append(KeepTogether([Paragraph(lines, style)]))
+        elif block.kind == LIST_ITEM:
+            story.append(Paragraph(_markup(block.text), style, bulletText="•"))
+        elif block.kind == CLAUSE and block.level > 1:
+            story.append(Paragraph(_markup(block.text), _clause_style(block.level)))
+        else:
+            story.append(Paragraph(_markup(block.text), style))
+    if not story:
+        story.append(Spacer(1, 12))
+    return story
+
+
+def build_pdf(blocks: List[Block], output: Union[str, BinaryIO], title: str = "Contract") -> int:
+    """Lay out ``blocks`` into ``output`` (path or binary file) and return the page count."""
+    doc = SimpleDocTemplate(
+        output,
+        pagesize=letter,
+        leftMargin=inch,
+        rightMargin=inch,
+        topMargin=inch,
+        bottomMargin=inch,
+        title=title,
+    )
+    doc.build(_flowables(blocks), canvasmaker=_NumberedCanvas)
+    return doc.page
@@ -0,0 +1,167 @@
+import logging
+import math
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, List, Sequence, Tuple
+
+from app.agents.contract_document import ContractDocument
+from app.core.openai_client import estimate_tokens
+
+
+# Texts -> one vector per text
+Embedder = Callable[[List[str]], Sequence[Sequence[float]]]
+
+_WORD = re.compile(r"[a-z0-9]{2,}")
+_STOPWORDS = frozenset(
+    "the and of to in or a an by for on at is be shall any such this that with as from are which "
+    "will may its it all under not been has have".split()
+)
+
+
+def hashing_embedding(texts: List[str], dimensions: int = 1024) -> List[List[float]]:
+    """
+    Local embedder without a model: hashed word and word-pair counts
+    (log-scaled, signed, L2-normalized). Matches wording rather than
+    meaning, so it suits development and tests.
+    """
+    vectors = []
+    for text in texts:
+        vector = [0.0] * dimensions
+        words = [word for word in _WORD.findall(text.lower()) if word not in _STOPWORDS]
+        counts = {}
+        for i, word in enumerate(words):
+            counts[word] = counts.get(word, 0) + 1
+            if i:
+                pair = f"{words[i - 1]} {word}"
+                counts[pair] = counts.get(pair, 0) + 1
+        for feature, count in counts.items():
+            hashed = zlib.crc32(feature.encode("utf-8"))
+            vector[hashed % dimensions] += (1.0 + math.log(count)) * (1 if hashed & 0x80000000 else -1)
+        vectors.append(vector)
+    return vectors
+
+
+def _normalized(vector: Sequence[float]) -> Tuple[float, ...]:
+    norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+    return tuple(float(value) / norm for value in vector)
+
+
+@dataclass(frozen=True)
+class ContractChunk:
+    """A section (or part of a long section) of a contract"""
+    title: str
+    text: str
+    tokens: int
+
+
+@dataclass
+class ContractGrounding:
+    """The contract sections chosen for one chat question"""
+    sections: List[ContractChunk]
+    contract_tokens: int
+
+    @property
+    def prompt_tokens(self) -> int:
+        return sum(chunk.tokens for chunk in self.sections)
+
+    @property
+    def tokens_saved(self) -> int:
+        """Prompt tokens saved compared with sending the whole contract"""
+        return max(self.contract_tokens - self.prompt_tokens, 0)
+
+    @property
+    def excerpt(self) -> str:
+        return "\n\n".join(f"[{chunk.title}]\n{chunk.text}" for chunk in self.sections)
+
+
+def chunk_contract(content: str, max_chunk_tokens: int = 400) -> List[ContractChunk]:
+    """
+    ``content`` split into its sections, titled with their headings.
+
+    Sections with no text of their own (a heading followed straight by
+    numbered clauses) lend their heading to the clauses' titles instead.
+    Sections longer than ``max_chunk_tokens`` are split at paragraph breaks.
+    """
+    document = ContractDocument(content)
+    chunks: List[ContractChunk] = []
+    for section in document.sections:
+        own_text = document.own_text(section.index)
+        text = own_text.strip()
+        if section.key == ContractDocument.PREAMBLE:
+            title = "Preamble"
+        else:
+            title = section.heading if len(section.heading) <= 60 else section.key
+            if section.parent is not None:
+                parent = document.sections[section.parent]
+                title = f"{parent.heading if len(parent.heading) <= 60 else parent.key} / {title}"
+        if not own_text[section.body_start - section.start:].strip():
+            continue
+        part: List[str] = []
+        part_tokens = 0
+        for paragraph in text.split("\n\n"):
+            tokens = estimate_tokens(paragraph)
+            if part and part_tokens + tokens > max_chunk_tokens:
+                chunks.append(ContractChunk(title, "\n\n".join(part), part_tokens))
+                part, part_tokens = [], 0
+            part.append(paragraph)
+            part_tokens += tokens
+        if part:
+            chunks.append(ContractChunk(title, "\n\n".join(part), part_tokens))
+    return chunks
+
+
+class ContractSectionIndex:
+    """
+    Section embeddings per contract, for grounding chat answers.
+
+    Each contract is chunked into sections and embedded once; the result is
+    cached by contract id together with the contract's ``updated_at``, so
+    an edited contract is re-embedded on its next question and an
+    unchanged one never is. The contract text is only loaded (through
+    ``load_content``) on a cache miss. A question is embedded and the
+    ``top_k`` most similar sections are returned, in contract order.
+    """
+
+    def __init__(self, embed: Embedder, top_k: int = 4, max_chunk_tokens: int = 400, cache_size: int = 256):
+        self.logger = logging.getLogger(__name__)
+        self.embed = embed
+        self.top_k = top_k
+        self.max_chunk_tokens = max_chunk_tokens
+        self._cache: "OrderedDict[int, Tuple[object, List[ContractChunk], List[Tuple[float, ...]], int]]" = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+
+    def _entry(self, contract_id: int, updated_at, load_content: Callable[[], str]):
+        with self._lock:
+            entry = self._cache.get(contract_id)
+            if entry is not None and entry[0] == updated_at:
+                self._cache.move_to_end(contract_id)
+                return entry
+        content = load_content()
+        chunks = chunk_contract(content, self.max_chunk_tokens)
+        vectors = [_normalized(vector) for vector in self.embed([chunk.text for chunk in chunks])] if chunks else []
+        entry = (updated_at, chunks, vectors, estimate_tokens(content))
+        self.logger.info(f"Embedded {len(chunks)} sections of contract {contract_id}")
+        with self._lock:
+            self._cache[contract_id] = entry
+            self._cache.move_to_end(contract_id)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return entry
+
+    def retrieve(self, contract_id: int, updated_at, load_content: Callable[[], str], question: str) -> ContractGrounding:
+        """The contract sections most relevant to ``question``."""
+        _, chunks, vectors, contract_tokens = self._entry(contract_id, updated_at, load_content)
+        if len(chunks) <= self.top_k:
+            return ContractGrounding(sections=list(chunks), contract_tokens=contract_tokens)
+        query = _normalized(self.embed([question])[0])
+        scores = [sum(a * b for a, b in zip(query, vector)) for vector in vectors]
+        best = sorted(range(len(chunks)), key=scores.__getitem__, reverse=True)[:self.top_k]
+        return ContractGrounding(sections=[chunks[i] for i in sorted(best)], contract_tokens=contract_tokens)
+
+    def invalidate(self, contract_id: int) -> None:
+        with self._lock:
+            self._cache.pop(contract_id, None)
@@ -0,0 +1,370 @@
+import logging
+import re
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from app.agents.contract_document import ContractDocument
+from app.core.metrics import metrics
+
+
+ERROR = "error"
+WARNING = "warning"
+
+# Finding codes
+NUMBERING = "numbering"
+UNDEFINED_TERM = "undefined_term"
+DANGLING_REFERENCE = "dangling_reference"
+PARTY_MISMATCH = "party_mismatch"
+PARTY_MISSING = "party_missing"
+
+# Defects a rewrite of the section body can fix; numbering lives in the
+# headings, which regeneration keeps
+REGENERABLE = frozenset({UNDEFINED_TERM, DANGLING_REFERENCE, PARTY_MISMATCH})
+
+# Every construct the validator looks at, matched in one scan of the text
+# and dispatched on the name of the outer group
+_TOKENS = re.compile(
+    r"(?P<ref>\[Ref\.?\s*(?P<ref_number>\d+)\])"
+    r"|(?P<used>\[References used:(?P<used_list>[^\]\n]*)\])"
+    r"|(?P<definition>[\"“](?P<defined>[A-Z][\w'’-]*(?:\s+[A-Z][\w'’-]*)*)[\"”])"
+    r"|(?P<use>\bthe\s+(?P<used_term>[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*))"
+    r"|(?P<between>\bbetween\s+(?P<first>[^,(\n\[]+?)\s+and\s+"
+    r"(?P<second>(?:\b(?i:pvt|ltd|co|corp|inc|m/s|mr|mrs|ms|dr|smt)\.|[^,(.;\n\[])+))"
+    r"|(?P<name>\b(?i:(?:printed\s+)?name)[ \t]*:[ \t]*(?P<name_value>[^\n]*))"
+    r"|(?P<signing_for>^[ \t]*(?i:for(?:[ \t]+and[ \t]+on[ \t]+behalf[ \t]+of)?|on[ \t]+behalf[ \t]+of)[ \t]+"
+    r"(?P<signing_party>[^\n,;:]+?)[ \t]*:?[ \t]*$)"
+    r"|(?P<witness>^[ \t]*(?i:witness(?:es)?)\b[^\n]*$)",
+    re.M,
+)
+_REF_IN_LIST = re.compile(r"Ref\.?\s*(\d+)")
+_NUMBER = re.compile(r"^\d+(?:\.\d+)*$")
+_TITLES = re.compile(r"^(?:m/s\.?|mr\.?|mrs\.?|ms\.?|dr\.?|shri|smt\.?)\s+")
+_NON_WORD = re.compile(r"[^\w\s]")
+_ARTICLE = re.compile(r"^(?:the|said|such|each|both)\s+")
+_BLANK_LINE = re.compile(r"\n[ \t]*\n")
+# Abbreviated company suffixes, so "Acme Pvt. Ltd." matches "Acme Private Limited"
+_NAME_WORDS = {
+    "pvt": "private", "pte": "private", "ltd": "limited", "co": "company", "corp": "corporation",
+    "inc": "incorporated", "intl": "international", "mfg": "manufacturing", "bros": "brothers",
+}
+# Words that mark a name as an organisation rather than a person
+_COMPANY_WORDS = frozenset({
+    "private", "limited", "company", "corporation", "incorporated", "llp", "llc", "plc", "industries",
+    "enterprises", "holdings", "associates", "trust", "society", "bank", "group",
+})
+
+# Capitalised phrases that are names of things rather than defined terms
+_BUILT_IN_TERMS = frozenset({"agreement", "contract", "party", "parties", "schedule", "annexure"})
+# Words naming a party in a "between ... and ..." clause other than by name
+_PARTY_REFERENCES = frozenset({
+    "it", "itself", "them", "themselves", "us", "you", "him", "her", "each other", "one another", "parties",
+    "buyer", "seller", "purchaser", "vendor", "vendee", "employer", "employee", "lessor", "lessee",
+    "licensor", "licensee", "landlord", "tenant", "owner", "client", "customer", "supplier", "contractor",
+    "consultant", "service provider", "borrower", "lender", "creditor", "debtor", "guarantor", "pledgor",
+    "pledgee", "mortgagor", "mortgagee", "franchisor", "franchisee", "company", "partner", "partners",
+    "promoter", "developer", "distributor", "principal", "agent", "assignor", "assignee",
+})
+_INSTITUTION_WORDS = frozenset({
+    "act", "acts", "code", "rules", "regulations", "court", "courts", "government", "constitution",
+    "schedule", "annexure", "republic", "state", "union", "tribunal", "bank", "ministry", "india",
+})
+
+
+def _normalize_name(name: str) -> str:
+    name = _TITLES.sub("", name.strip().lower())
+    return " ".join(_NAME_WORDS.get(word, word) for word in _NON_WORD.sub(" ", name).split())
+
+
+def _is_company(name: str) -> bool:
+    return not _COMPANY_WORDS.isdisjoint(_normalize_name(name).split())
+
+
+@dataclass
+class Finding:
+    """One defect found in a contract"""
+    code: str
+    severity: str
+    message: str
+    section: Optional[str] = None
+    line: Optional[int] = None
+    section_index: Optional[int] = None
+
+
+@dataclass
+class ValidationReport:
+    """Findings for one contract, in document order"""
+    findings: List[Finding] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def errors(self) -> List[Finding]:
+        return [finding for finding in self.findings if finding.severity == ERROR]
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def sections_to_regenerate(self) -> Dict[int, List[Finding]]:
+        """Findings a section rewrite could fix, by section index."""
+        sections: Dict[int, List[Finding]] = {}
+        for finding in self.findings:
+            if finding.code in REGENERABLE and finding.section_index is not None:
+                sections.setdefault(finding.section_index, []).append(finding)
+        return sections
+
+    def to_dict(self) -> Dict:
+        return {
+            "ok": self.ok,
+            "seconds": self.seconds,
+            "findings": [asdict(finding) for finding in self.findings],
+        }
+
+
+class ContractValidator:
+    """
+    Structural consistency checks for generated contracts.
+
+    One scan of the text finds reference markers, quoted definitions, uses
+    of capitalised terms and party names; section numbering is checked
+    over the section index of a ContractDocument. Checks that need the
+    whole document (undefined terms, missing parties) are resolved against
+    the sets built during the scan, so the cost is linear in the text.
+
+    Checks:
+      - numbering: section and clause numbers run 1, 2, 3 ... at each
+        level, and "3.1" sits under section 3
+      - dangling_reference: ``[Ref N]`` with no reference N
+      - undefined_term: "the Capitalised Term" never defined in quotes;
+        only checked in contracts that define terms at all (warning)
+      - party_mismatch / party_missing: names in the "between ... and ..."
+        clause of the opening (text up to the end of the first numbered
+        section), "For <party>" signature headers and company names on
+        "Name:" lines match the requested parties; defined terms, party
+        roles ("the Lessor") and pronouns are accepted, and abbreviated
+        company suffixes ("Pvt. Ltd.") match their long forms. A person
+        named under a "For <party>" header signs for that party and
+        witnesses are not parties, so neither is checked; any other
+        person on a "Name:" line who is not a party is a warning
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+    def validate(
+        self,
+        text: str,
+        parties: Sequence[str] = (),
+        reference_count: Optional[int] = None,
+        document: Optional[ContractDocument] = None
+    ) -> ValidationReport:
+        """
+        Validate ``text``.
+
+        Args:
+            text: Contract text
+            parties: Expected party names (``party1``, ``party2``)
+            reference_count: Number of legal references given to the
+                drafting step; None skips the reference check
+            document: Section index of ``text``, if already built
+        """
+        started = time.perf_counter()
+        document = document or ContractDocument(text)
+        sections = document.sections
+        findings: List[Finding] = []
+        findings.extend(self._check_numbering(document))
+
+        expected = {_normalize_name(party): party for party in parties if party and party.strip()}
+        definitions: Set[str] = set()
+        uses: List[Tuple[str, int, int]] = []  # (term, line, section index)
+        names: List[Tuple[str, int, int, str]] = []  # (party name, line, section index, severity)
+        signing_block = None  # "For <party>" or witness header of the current signature block
+        signing_line = signing_index = 0
+        signing_checked = False
+        opening_end = self._opening_end(document)
+        section_index = 0
+        line = 1
+        position = 0
+
+        for match in _TOKENS.finditer(text):
+            start = match.start()
+            line += text.count("\n", position, start)
+            position = start
+            while section_index + 1 < len(sections) and sections[section_index + 1].start <= start:
+                section_index += 1
+
+            kind = match.lastgroup
+            if kind == "ref":
+                numbers = [match.group("ref_number")]
+            elif kind == "used":
+                numbers = _REF_IN_LIST.findall(match.group("used_list"))
+            else:
+                numbers = []
+            if numbers and reference_count is not None:
+                for number in numbers:
+                    if not 1 <= int(number) <= reference_count:
+                        findings.append(self._finding(
+                            DANGLING_REFERENCE, ERROR,
+                            f"Ref {number} does not match any of the {reference_count} legal references",
+                            sections, section_index, line
+                        ))
+            elif kind == "definition":
+                definitions.add(match.group("defined").lower())
+            elif kind == "use":
+                uses.append((match.group("used_term"), line, section_index))
+            elif expected and kind == "between":
+                # "between" elsewhere is usually about dates, amounts or obligations
+                if start < opening_end:
+                    names.append((match.group("first"), line, section_index, ERROR))
+                    names.append((match.group("second"), line, section_index, ERROR))
+            elif expected and kind in ("signing_for", "witness"):
+                signing_block, signing_line, signing_index, signing_checked = match, line, section_index, False
+            elif expected and kind == "name":
+                # A signature block header covers the Name: lines up to the next blank line
+                if signing_block and _BLANK_LINE.search(text, signing_block.end(), start):
+                    signing_block = None
+                value = match.group("name_value")
+                if signing_block is None:
+                    names.append((value, line, section_index, ERROR if _is_company(value) else WARNING))
+                elif signing_block.lastgroup == "signing_for":
+                    if not signing_checked:
+                        # Checked only here, so a sentence opening with "For ..." is never taken for a party
+                        names.append((signing_block.group("signing_party"), signing_line, signing_index, ERROR))
+                        signing_checked = True
+                    if _is_company(value):
+                        names.append((value, line, section_index, ERROR))
+
+        # Checked after the scan, as roles are often defined after the names ("Acme Ltd (the "Seller")")
+        for name, name_line, index, severity in names:
+            finding = self._check_party_name(name, expected, definitions, sections, index, name_line, severity)
+            if finding:
+                findings.append(finding)
+
+        if definitions:
+            findings.extend(self._undefined_terms(uses, definitions, expected, sections))
+
+        if expected:
+            # Compared word by word in normalised form, so "Acme Pvt. Ltd." is found as "Acme Private Limited"
+            normalized_text = f" {_normalize_name(text)} "
+            for normalized, party in expected.items():
+                if f" {normalized} " not in normalized_text:
+                    findings.append(Finding(PARTY_MISSING, ERROR, f"Party '{party}' is not named in the contract"))
+
+        findings.sort(key=lambda finding: finding.line or 0)
+        report = ValidationReport(findings=findings, seconds=time.perf_counter() - started)
+        metrics.observe("contract_validation_seconds", report.seconds)
+        for finding in findings:
+            metrics.inc("contract_validation_findings_total", labels={"code": finding.code})
+        return report
+
+    @staticmethod
+    def _finding(code: str, severity: str, message: str, sections, index: Optional[int], line: Optional[int]) -> Finding:
+        section = sections[index] if index is not None else None
+        return Finding(
+            code=code,
+            severity=severity,
+            message=message,
+            section=(section.heading or section.key) if section else None,
+            line=line,
+            section_index=index,
+        )
+
+    def _check_numbering(self, document: ContractDocument) -> List[Finding]:
+        findings = []
+        last: Dict[Tuple[int, ...], int] = {}
+        path: Tuple[int, ...] = ()
+        line = 1
+        position = 0
+        text = document.text
+        for section in document.sections:
+            if not _NUMBER.match(section.key):
+                continue
+            line += text.count("\n", position, section.start)
+            position = section.start
+            number = tuple(int(part) for part in section.key.split("."))
+            parent, value = number[:-1], number[-1]
+            if parent and parent != path[:len(parent)]:
+                findings.append(self._finding(
+                    NUMBERING, ERROR,
+                    f"Clause {section.key} appears under section {'.'.join(map(str, path)) or 'none'}",
+                    document.sections, section.index, line
+                ))
+            previous = last.get(parent, 0)
+            if value != previous + 1:
+                expected = ".".join(map(str, parent + (previous + 1,)))
+                problem = "repeats or goes back" if value <= previous else "skips numbers"
+                findings.append(self._finding(
+                    NUMBERING, ERROR,
+                    f"Numbering {problem}: {section.key} where {expected} was expected",
+                    document.sections, section.index, line
+                ))
+            last[parent] = value
+            path = number
+        return findings
+
+    @staticmethod
+    def _opening_end(document: ContractDocument) -> int:
+        """Offset where the opening of the contract (preamble and first numbered section) ends."""
+        for section in document.sections:
+            if _NUMBER.match(section.key):
+                return section.end
+        return document.sections[min(1, len(document.sections) - 1)].end
+
+    def _check_party_name(
+        self,
+        name: str,
+        expected: Dict[str, str],
+        definitions: Set[str],
+        sections,
+        index: int,
+        line: int,
+        severity: str = ERROR
+    ) -> Optional[Finding]:
+        name = name.strip().strip("*")
+        normalized = _normalize_name(name)
+        if not normalized or "_" in name or name.startswith("["):
+            # Blank signature line or placeholder
+            return None
+        if any(party == normalized or party in normalized for party in expected):
+            return None
+        reference = _ARTICLE.sub("", normalized)
+        if (
+            reference in definitions
+            or reference in _PARTY_REFERENCES
+            or reference.split()[-1] in ("party", "parties")
+        ):
+            return None
+        return self._finding(
+            PARTY_MISMATCH, severity,
+            f"Party name '{name}' does not match {' or '.join(repr(p) for p in expected.values())}",
+            sections, index, line
+        )
+
+    def _undefined_terms(
+        self,
+        uses: List[Tuple[str, int, int]],
+        definitions: Set[str],
+        expected: Dict[str, str],
+        sections
+    ) -> List[Finding]:
+        findings = []
+        reported: Set[str] = set()
+        for term, line, index in uses:
+            key = term.lower()
+            words = key.split()
+            if (
+                key in reported
+                or key in definitions
+                or key.rstrip("s") in definitions
+                or key in _BUILT_IN_TERMS
+                or key in expected
+                or words[0] in _INSTITUTION_WORDS
+                or words[-1] in _INSTITUTION_WORDS
+            ):
+                continue
+            reported.add(key)
+            findings.append(self._finding(
+                UNDEFINED_TERM, WARNING, f"'{term}' is used as a defined term but never defined",
+                sections, index, line
+            ))
+        return findings
@@ -4,6 +4,12 @@ from datetime import datetime
 import logging
 import uuid
 
+from app.agents.contract_document import ContractDocument
+from app.agents.correction_rules import RuleEngine, standard_rule_engine
+from app.agents.spell_checker import SpellChecker, get_spell_checker
+from app.core.config import settings
+from app.core.correction_history import correction_history
+
 
 @dataclass
 class Correction:
@@ -19,10 +25,21 @@ class Correction:
 class CorrectionAgent:
     """
     Simplified Correction Agent for implementing feedback and maintaining contract quality.
+
+    A single instance is shared across requests, so it keeps no per-request
+    data: corrections are returned to the caller rather than stored here.
     """
-    def __init__(self):
+    def __init__(self, rule_engine: Optional[RuleEngine] = None, spell_checker: Optional[SpellChecker] = None):
         self.logger = logging.getLogger(__name__)
-        self.corrections_history = []
+        self.rule_engine = rule_engine or standard_rule_engine
+        self._spell_checker = spell_checker
+
+    @property
+    def spell_checker(self) -> Optional[SpellChecker]:
+        """The spelling checker, loaded on first use; None when SPELLCHECK_ENABLED is off."""
+        if self._spell_checker is None and settings.SPELLCHECK_ENABLED:
+            self._spell_checker = get_spell_checker()
+        return self._spell_checker
 
     def correct_draft(self, contract: Union[Dict, str]) -> Union[Dict, str]:
         """
@@ -64,6 +81,11 @@ class CorrectionAgent:
         """
         Process feedback and implement corrections.
 
+        When the contract holds its text under ``content``, sections are
+        addressed by number or heading ("2.1", "Section 3", "Payment Terms")
+        through a ContractDocument, and each correction replaces just that
+        section's body. Other keys of the dict are corrected as before.
+
         Args:
             contract (Dict): Current contract draft
             feedback (List[Dict]): List of feedback items with format:
@@ -75,36 +97,53 @@ class CorrectionAgent:
         try:
             corrections = []
             updated_contract = contract.copy()
+            content = updated_contract.get("content")
+            document = ContractDocument(content) if isinstance(content, str) else None
 
             for item in feedback:
                 if self._validate_feedback(item):
-                    correction = self._implement_correction(updated_contract, item)
+                    correction = self._implement_correction(updated_contract, item, document)
                     if correction:
                         corrections.append(correction)
-                        updated_contract = self._apply_single_correction(
-                            updated_contract,
-                            correction
-                        )
-
-            # Store corrections in history
-            self.corrections_history.extend(corrections)
+                        self._apply_single_correction(updated_contract, correction, document)
 
+            if document is not None and document.edits:
+                # Assemble the edited text once, after all corrections
+                updated_contract["content"] = document.text
             return updated_contract, corrections
 
         except Exception as e:
             self.logger.error(f"Error processing feedback: {str(e)}")
             return contract, []
 
+    def get_correction_history(self, contract_id: Optional[int] = None, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Corrections recorded recently by this process, newest first.
+
+        Bounded by CORRECTION_HISTORY_BUFFER_SIZE; the complete history is
+        stored per contract in the database.
+        """
+        return correction_history.recent(contract_id, limit)
+
     def _validate_feedback(self, feedback: Dict) -> bool:
         """Validate feedback format"""
         required_fields = ['section', 'suggested_change', 'reason']
         return all(field in feedback and feedback[field] for field in required_fields)
 
-    def _implement_correction(self, contract: Dict, feedback: Dict) -> Optional[Correction]:
+    def _implement_correction(
+        self,
+        contract: Dict,
+        feedback: Dict,
+        document: Optional[ContractDocument] = None
+    ) -> Optional[Correction]:
         """Create a correction based on feedback"""
         try:
             section = feedback['section']
-            original_text = contract.get(section, '')
+            index = document.find(section) if document is not None else None
+            if index is not None:
+                original_text = document.section_body(index)
+            else:
+                original_text = contract.get(section, '')
 
             if not original_text:
                 return None
@@ -122,29 +161,41 @@ class CorrectionAgent:
             self.logger.error(f"Error implementing correction: {str(e)}")
             return None
 
-    def _apply_single_correction(self, contract: Dict, correction: Correction) -> Dict:
-        """Apply a single correction to the contract"""
-        updated_contract = contract.copy()
+    def _apply_single_correction(
+        self,
+        contract: Dict,
+        correction: Correction,
+        document: Optional[ContractDocument] = None
+    ) -> Dict:
+        """Apply a single correction to the contract in place"""
         try:
-            if correction.section in updated_contract:
-                updated_contract[correction.section] = correction.corrected_text
-            return updated_contract
+            index = document.find(correction.section) if document is not None else None
+            if index is not None:
+                document.replace_section(index, correction.corrected_text)
+            elif correction.section in contract:
+                contract[correction.section] = correction.corrected_text
         except Exception as e:
             self.logger.error(f"Error applying correction: {str(e)}")
-            return contract
+        return contract
 
     def _apply_standard_corrections(self, contract: Dict) -> Dict:
-        """Apply standard corrections to the contract"""
+        """Apply standard corrections to the contract, preserving its layout"""
         try:
             updated_contract = contract.copy()
 
-            # Apply basic formatting corrections
+            spell_checker = self.spell_checker
+
+            # Apply basic formatting corrections in one pass per section,
+            # then spelling corrections in a second
             for section, content in updated_contract.items():
                 if isinstance(content, str):
-                    # Remove extra whitespace
-                    content = ' '.join(content.split())
-                    # Ensure proper sentence capitalization
-                    content = '. '.join(s.capitalize() for s in content.split('. '))
+                    content, hits = self.rule_engine.apply(content)
+                    if hits:
+                        self.logger.debug(f"Standard corrections in '{section}': {dict(hits)}")
+                    if spell_checker is not None:
+                        content, spelling = spell_checker.correct(content)
+                        if spelling:
+                            self.logger.debug(f"Spelling corrections in '{section}': {spelling}")
                     updated_contract[section] = content
 
             return updated_contract
@@ -152,7 +203,3 @@ class CorrectionAgent:
         except Exception as e:
             self.logger.error(f"Error applying standard corrections: {str(e)}")
             return contract
-
-    def get_correction_history(self) -> List[Correction]:
-        """Get the history of all corrections made"""
-        return self.corrections_history
@@ -0,0 +1,123 @@
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from app.core.metrics import metrics
+
+
+Replacement = Union[str, Callable[[str], str]]
+
+
+@dataclass(frozen=True)
+class Rule:
+    """
+    A textual correction: every match of ``pattern`` is replaced.
+
+    ``replacement`` is a literal string or a function of the matched text.
+    Patterns may use look-arounds and non-capturing groups but no capturing
+    groups, since all rules are compiled into one alternation.
+    """
+    name: str
+    pattern: str
+    replacement: Replacement
+    description: str = ""
+
+
+# Abbreviations whose full stop does not end a sentence (matched in any case)
+ABBREVIATIONS = (
+    "etc", "viz", "e.g", "i.e", "cf", "al", "vs", "v", "approx", "incl", "excl", "w.e.f",
+    "No", "Nos", "Rs", "Re", "Ltd", "Pvt", "Pte", "Co", "Corp", "Inc", "Bros", "Messrs", "Regd",
+    "Govt", "Dept", "Sec", "Secs", "Cl", "Art", "Arts", "Sch", "Para", "Paras", "Ch", "Vol",
+    "Ref", "Reg", "Annex", "Encl", "Mr", "Mrs", "Ms", "Dr", "Sr", "Jr", "Smt", "Shri", "Sh", "Hon",
+    "Adv", "Ors", "Anr", "St", "Rd", "Dist",
+)
+
+
+def _not_after(abbreviations: Iterable[str]) -> str:
+    """Look-behinds rejecting a match that starts after ``abbreviation. ``"""
+    return "".join(rf"(?<!\b(?i:{re.escape(abbreviation)})\. )" for abbreviation in abbreviations)
+
+
+# Rules only touch spacing inside lines, punctuation and capitalisation, so
+# line breaks, indentation and paragraph structure are preserved.
+STANDARD_RULES: List[Rule] = [
+    Rule(
+        "excess_blank_lines",
+        r"(?:\r\n?|\n)(?:[ \t]*(?:\r\n?|\n)){2,}",
+        "\n\n",
+        "Collapse runs of blank lines to one",
+    ),
+    Rule("line_endings", r"\r\n?", "\n", "Normalise Windows and old Mac line endings"),
+    Rule("trailing_whitespace", r"[ \t]+(?=[\r\n]|\Z)", "", "Strip spaces at the end of lines"),
+    Rule(
+        "space_before_punctuation",
+        r"[ \t](?<=\w[ \t])[ \t]*(?=[,;:](?:\s|\Z)|\.(?:\s|\Z))",
+        "",
+        "Remove spaces before commas, semicolons, colons and full stops",
+    ),
+    Rule("repeated_spaces", r"[ \t](?<=\S[ \t])[ \t]+(?=\S)", " ", "Collapse repeated spaces between words"),
+    Rule("missing_space_after_comma", r",(?<=[a-z],)(?=[A-Za-z])", ", ", "Add a space after a comma between words"),
+    Rule("doubled_punctuation", r"\.(?<!\.\.)\.(?!\.)|,{2,}|;{2,}", lambda text: text[0], "Drop doubled stops and commas"),
+    Rule(
+        "sentence_capitalization",
+        r"[.!?](?<=[a-z0-9)][.!?]) " + _not_after(ABBREVIATIONS) + "[a-z]",
+        lambda text: text[:-1] + text[-1].upper(),
+        "Capitalise the first letter of a sentence, leaving the rest as written",
+    ),
+]
+# Matched by the start of every standard rule match. A single space before
+# a word starts none of them, so most positions in prose are skipped early.
+STANDARD_GUARD = r"[\r\n.,;!?]|[ \t](?:[ \t\r\n.,;:]|\Z)"
+
+
+class RuleEngine:
+    """
+    Applies a set of rules in a single pass over the text.
+
+    The rules are compiled once into one alternation of named groups; each
+    match is dispatched to its rule through ``match.lastgroup``. Where rules
+    overlap, the leftmost match wins, then the rule declared first.
+
+    ``guard`` is an optional pattern that matches at the start of every
+    rule match. Other positions are then rejected by one cheap test instead
+    of trying every rule, which on ordinary prose is most of them.
+    """
+
+    def __init__(self, rules: Iterable[Rule], guard: Optional[str] = None):
+        self.rules: Tuple[Rule, ...] = tuple(rules)
+        alternatives = []
+        self._replacements: Dict[str, Callable[[str], str]] = {}
+        self._names: Dict[str, str] = {}
+        for index, rule in enumerate(self.rules):
+            if re.compile(rule.pattern).groups:
+                raise ValueError(f"Rule '{rule.name}' must not use capturing groups")
+            group = f"r{index}"
+            alternatives.append(f"(?P<{group}>{rule.pattern})")
+            replacement = rule.replacement
+            self._replacements[group] = replacement if callable(replacement) else (lambda _, r=replacement: r)
+            self._names[group] = rule.name
+        combined = "|".join(alternatives)
+        if guard:
+            combined = f"(?={guard})(?:{combined})"
+        self._pattern = re.compile(combined)
+
+    def apply(self, text: str) -> Tuple[str, Counter]:
+        """Return the corrected text and the number of hits per rule."""
+        hits: Counter = Counter()
+        replacements = self._replacements
+
+        def dispatch(match: "re.Match") -> str:
+            group = match.lastgroup
+            hits[group] += 1
+            return replacements[group](match.group())
+
+        corrected = self._pattern.sub(dispatch, text)
+        named_hits = Counter({self._names[group]: count for group, count in hits.items()})
+        for name, count in named_hits.items():
+            metrics.inc("correction_rule_hits_total", count, labels={"rule": name})
+        return corrected, named_hits
+
+
+# Create a single instance to be imported by other modules
+standard_rule_engine = RuleEngine(STANDARD_RULES, guard=STANDARD_GUARD)
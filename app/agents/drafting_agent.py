@@ -1,7 +1,18 @@
-from typing import List, Dict
+from typing import List, Dict, Optional
+from dataclasses import dataclass, field
 import logging
+import threading
 from datetime import datetime
 from openai import OpenAI
+from app.agents.citation_index import index_citations
+from app.core.llm_scheduler import llm_scheduler, LLMCallCancelled, LLMPriority
+
+
+@dataclass
+class DraftResult:
+    """Per-request output of the drafting agent"""
+    content: str
+    references_used: List[Dict] = field(default_factory=list)
 
 
 class DraftingAgent:
@@ -55,10 +66,10 @@ class DraftingAgent:
 """
     }
 
-    def __init__(self):
+    def __init__(self, client: Optional[OpenAI] = None):
+        # Shared across requests: holds no per-request state after construction
         self.logger = logging.getLogger(__name__)
-        self.client = OpenAI()
-        self.references_used = []
+        self.client = client or OpenAI()
         self.templates = self.TEMPLATES
 
     def _format_requirements(self, requirements: Dict) -> str:
@@ -104,11 +115,25 @@ class DraftingAgent:
             raise
 
     def create_initial_draft(self, contract_type: str, requirements: Dict, legal_refs: List[Dict]) -> str:
-        """Create initial contract draft with reference tracking"""
+        """Create initial contract draft and return its text"""
+        return self.create_draft(contract_type, requirements, legal_refs).content
+
+    def create_draft(
+        self,
+        contract_type: str,
+        requirements: Dict,
+        legal_refs: List[Dict],
+        user_key: Optional[str] = None,
+        cancel: Optional[threading.Event] = None
+    ) -> DraftResult:
+        """Create initial contract draft with reference tracking.
+
+        ``user_key`` identifies the requesting user to the LLM scheduler.
+        Setting ``cancel`` abandons the draft: the LLM call is skipped if it
+        has not started, and its response stream is closed if it has
+        (``LLMCallCancelled`` is raised either way).
+        """
         try:
-            # Reset references tracking
-            self.references_used = []
-            
             # Debug print incoming references
             self.logger.info("\n=== Available Legal References ===")
             for i, ref in enumerate(legal_refs, 1):
@@ -122,26 +147,35 @@ class DraftingAgent:
                 raise ValueError(f"No template found for contract type: {contract_type}")
             
             # Generate draft with GPT-3.5
-            draft = self._generate_draft_with_ai(requirements, legal_refs)
+            draft = self._generate_draft_with_ai(requirements, legal_refs, user_key, cancel)
             
-            # Add references section
-            final_draft = self._add_references_section(draft)
+            # Track the references cited in the draft and add the references section
+            references_used = self._track_references_used(draft, legal_refs)
+            final_draft = self._add_references_section(draft, references_used)
             
             # Debug print used references
             self.logger.info("\n=== References Used in Draft ===")
-            for i, ref in enumerate(self.references_used, 1):
+            for i, ref in enumerate(references_used, 1):
                 self.logger.info(f"\nReference {i}:")
                 self.logger.info(f"Source: {ref['source']}")
                 self.logger.info(f"Used in sections: {', '.join(ref['sections'])}")
             self.logger.info("=" * 50)
             
-            return final_draft
-            
+            return DraftResult(content=final_draft, references_used=references_used)
+
+        except LLMCallCancelled:
+            raise
         except Exception as e:
             self.logger.error(f"Error creating draft: {str(e)}")
             raise
 
-    def _generate_draft_with_ai(self, requirements: Dict, legal_refs: List[Dict]) -> str:
+    def _generate_draft_with_ai(
+        self,
+        requirements: Dict,
+        legal_refs: List[Dict],
+        user_key: Optional[str] = None,
+        cancel: Optional[threading.Event] = None
+    ) -> str:
         """Generate contract draft using GPT-3.5-turbo with explicit reference tracking"""
         try:
             # Format all legal references
@@ -207,59 +241,119 @@ INSTRUCTIONS FOR CONTRACT GENERATION:
    - Complete statutory compliance
 
 Generate 5 versions, analyze them, and present the best version with your selection reasoning.Present Only the Best Version with Proper Formatting."""
-            # Call GPT-3.5-turbo
-            response = self.client.chat.completions.create(
+            messages = [
+                {"role": "system", "content": "You are an Indian legal expert specializing in contract law."},
+                {"role": "user", "content": prompt}
+            ]
+            if cancel is not None:
+                # Streamed so a cancelled draft stops generating part way through
+                chunks = llm_scheduler.stream(
+                    user_key,
+                    LLMPriority.BATCH,
+                    self.client.chat.completions.create,
+                    cancel=cancel,
+                    model="gpt-3.5-turbo",
+                    messages=messages,
+                    temperature=0.7,
+                    max_tokens=2500,
+                    stream=True
+                )
+                return "".join(
+                    chunk.choices[0].delta.content or ""
+                    for chunk in chunks if chunk.choices
+                ).strip()
+
+            # Call GPT-3.5-turbo through the fair LLM scheduler
+            response = llm_scheduler.call(
+                user_key,
+                LLMPriority.BATCH,
+                self.client.chat.completions.create,
                 model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an Indian legal expert specializing in contract law."},
-                    {"role": "user", "content": prompt}
-                ],
+                messages=messages,
                 temperature=0.7,
                 max_tokens=2500
             )
 
             return response.choices[0].message.content.strip()
 
+        except LLMCallCancelled:
+            raise
         except Exception as e:
             self.logger.error(f"Error in AI draft generation: {str(e)}")
             raise
 
-    def _track_references_used(self, draft: str, legal_refs: List[Dict]) -> None:
-        """Enhanced reference tracking"""
-        self.references_used = []
-        sections = draft.split('\n\n')
-        
-        for i, ref in enumerate(legal_refs, 1):
-            ref_marker = f"[Ref {i}]"
-            found_sections = []
-            
-            for section in sections:
-                if ref_marker in section:
-                    # Extract section title
-                    lines = section.split('\n')
-                    if lines:
-                        title = lines[0].strip()
-                        if title and title not in found_sections:
-                            found_sections.append(title)
-            
-            if found_sections:
-                self.references_used.append({
-                    'source': ref['source'],
-                    'content': ref['content'],
-                    'sections': found_sections
-                })
+    def regenerate_section(
+        self,
+        section_text: str,
+        problems: List[str],
+        requirements: Dict,
+        reference_count: int,
+        user_key: Optional[str] = None
+    ) -> str:
+        """
+        Rewrite the body of one contract section to fix ``problems``.
+
+        Only the section is sent, so this costs a fraction of redrafting
+        the whole contract. Returns the new body, without the heading.
+        """
+        try:
+            allowed_refs = ", ".join(f"[Ref {i}]" for i in range(1, reference_count + 1)) or "none"
+            problem_list = "\n".join(f"- {problem}" for problem in problems)
+            prompt = f"""Rewrite the following section of an Indian legal contract to fix the listed problems.
+
+SECTION:
+{section_text}
+
+PROBLEMS:
+{problem_list}
+
+RULES:
+- Keep the meaning, numbering and formatting of the section
+- Name the parties exactly as {requirements.get('party1', 'Party 1')} and {requirements.get('party2', 'Party 2')}
+- Only cite these reference markers: {allowed_refs}
+- Return only the section text after its heading, with no commentary"""
+            response = llm_scheduler.call(
+                user_key,
+                LLMPriority.BATCH,
+                self.client.chat.completions.create,
+                model="gpt-3.5-turbo",
+                messages=[
+                    {"role": "system", "content": "You are an Indian legal expert specializing in contract law."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.2,
+                max_tokens=800
+            )
+            return response.choices[0].message.content.strip()
+
+        except Exception as e:
+            self.logger.error(f"Error regenerating section: {str(e)}")
+            raise
+
+    def _track_references_used(self, draft: str, legal_refs: List[Dict]) -> List[Dict]:
+        """References cited in the draft, with the sections citing each, in reference order"""
+        cited = index_citations(draft, len(legal_refs))
+        return [
+            {
+                'number': number,
+                'source': legal_refs[number - 1]['source'],
+                'content': legal_refs[number - 1]['content'],
+                'sections': sections
+            }
+            for number, sections in sorted(cited.items())
+        ]
 
-    def _add_references_section(self, draft: str) -> str:
+    def _add_references_section(self, draft: str, references_used: List[Dict]) -> str:
         """Add detailed references section"""
-        if not self.references_used:
+        if not references_used:
             return draft
             
         references_section = "\n\nLEGAL REFERENCES AND SOURCES\n"
         references_section += "=" * 50 + "\n\n"
         references_section += "The following legal references were used in drafting this contract:\n\n"
         
-        for i, ref in enumerate(self.references_used, 1):
-            references_section += f"Reference {i}:\n"
+        for i, ref in enumerate(references_used, 1):
+            references_section += f"Reference {ref.get('number', i)}:\n"
             references_section += f"Source: {ref['source']}\n"
             references_section += "Used in sections:\n"
             for section in ref['sections']:
@@ -0,0 +1,433 @@
+import html
+import io
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+import zipfile
+from collections import OrderedDict
+from typing import Any, BinaryIO, Dict, Hashable, List, Optional, Tuple, Union
+from xml.sax.saxutils import escape
+
+from app.agents.contract_layout import (
+    CLAUSE, HEADING, LIST_ITEM, SIGNATURE, TITLE, Block, build_pdf, parse_contract
+)
+
+
+_DOCUMENT_CACHE_SIZE = 32
+# contract id (or text, for unsaved contracts) -> (version, document model)
+_documents: "OrderedDict[Hashable, Tuple[Any, Tuple[Block, ...]]]" = OrderedDict()
+_documents_lock = threading.Lock()
+
+
+def document_model(content: str, contract_id: Optional[int] = None, updated_at: Any = None) -> Tuple[Block, ...]:
+    """
+    Intermediate model of a contract, shared by every export format.
+
+    Cached per process by contract id and ``updated_at``, the contract's
+    version in the database, so exporting one contract to several formats
+    parses its text once, and a contract updated through another worker is
+    parsed afresh on its next export instead of being served from a stale
+    entry. Text without a contract id is cached by the text itself.
+    """
+    key, version = (contract_id, updated_at) if contract_id is not None else (content, None)
+    with _documents_lock:
+        entry = _documents.get(key)
+        if entry is not None and entry[0] == version:
+            _documents.move_to_end(key)
+            return entry[1]
+    blocks = tuple(parse_contract(content))
+    with _documents_lock:
+        _documents[key] = (version, blocks)
+        _documents.move_to_end(key)
+        while len(_documents) > _DOCUMENT_CACHE_SIZE:
+            _documents.popitem(last=False)
+    return blocks
+
+
+class Exporter:
+    """
+    Renders the document model to one file format.
+
+    ``settings`` identifies the output layout and is part of the storage
+    key; change it whenever the renderer's output changes.
+    """
+    format: str = ""
+    suffix: str = ""
+    media_type: str = ""
+    settings: str = ""
+
+    def render(self, blocks: Tuple[Block, ...], output: Union[str, BinaryIO]) -> Optional[int]:
+        """
+        Write ``blocks`` to ``output`` (a path or binary file); return the
+        page count for paginated formats.
+        """
+        raise NotImplementedError
+
+
+def _write_text(output: Union[str, BinaryIO], text: str) -> None:
+    if isinstance(output, str):
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        output.write(text.encode("utf-8"))
+
+
+class PdfExporter(Exporter):
+    format = "pdf"
+    suffix = ".pdf"
+    media_type = "application/pdf"
+    settings = "pagesize=letter;layout=structured;v2"
+
+    def render(self, blocks, output):
+        return build_pdf(list(blocks), output)
+
+
+class HtmlExporter(Exporter):
+    format = "html"
+    suffix = ".html"
+    media_type = "text/html; charset=utf-8"
+    settings = "html;v1"
+
+    _STYLE = (
+        "body{font-family:'Times New Roman',serif;max-width:48em;margin:2em auto;line-height:1.45}"
+        "h1{text-align:center}p{text-align:justify}.signature{margin-top:2em}"
+    )
+
+    def render(self, blocks, output):
+        title = next((block.text for block in blocks if block.kind == TITLE), "Contract")
+        parts = [
+            "<!DOCTYPE html>",
+            '<html lang="en"><head><meta charset="utf-8">',
+            f"<title>{html.escape(title)}</title><style>{self._STYLE}</style></head><body>",
+        ]
+        in_list = False
+        for block in blocks:
+            if block.kind != LIST_ITEM and in_list:
+                parts.append("</ul>")
+                in_list = False
+            text = html.escape(block.text)
+            if block.kind == TITLE:
+                parts.append(f"<h1>{text}</h1>")
+            elif block.kind == HEADING:
+                parts.append(f"<h2>{text}</h2>")
+            elif block.kind == LIST_ITEM:
+                if not in_list:
+                    parts.append("<ul>")
+                    in_list = True
+                parts.append(f"<li>{text}</li>")
+            elif block.kind == SIGNATURE:
+                parts.append(f'<p class="signature">{text.replace(chr(10), "<br>")}</p>')
+            elif block.kind == CLAUSE and block.level > 1:
+                parts.append(f'<p class="clause" style="margin-left:{block.level - 1}em">{text}</p>')
+            else:
+                parts.append(f'<p class="{block.kind}">{text}</p>')
+        if in_list:
+            parts.append("</ul>")
+        parts.append("</body></html>\n")
+        _write_text(output, "\n".join(parts))
+        return None
+
+
+class MarkdownExporter(Exporter):
+    format = "md"
+    suffix = ".md"
+    media_type = "text/markdown; charset=utf-8"
+    settings = "markdown;v1"
+
+    def render(self, blocks, output):
+        lines: List[str] = []
+        previous = None
+        for block in blocks:
+            # Consecutive list items form one list; everything else is its own paragraph
+            if lines and not (block.kind == LIST_ITEM and previous == LIST_ITEM):
+                lines.append("")
+            if block.kind == TITLE:
+                lines.append(f"# {block.text}")
+            elif block.kind == HEADING:
+                lines.append(f"## {block.text}")
+            elif block.kind == LIST_ITEM:
+                lines.append(f"{'  ' * block.level}- {block.text}")
+            elif block.kind == SIGNATURE:
+                # Trailing double spaces keep the signature lines apart
+                lines.append("  \n".join(block.text.split("\n")))
+            else:
+                lines.append(block.text)
+            previous = block.kind
+        _write_text(output, "\n".join(lines) + "\n")
+        return None
+
+
+class DocxExporter(Exporter):
+    """
+    Minimal WordprocessingML writer.
+
+    Emits only the parts Word needs (content types, relationships, styles
+    and the document body), so no extra dependency is required.
+    """
+    format = "docx"
+    suffix = ".docx"
+    media_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+    settings = "docx;v1"
+
+    _W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    _CONTENT_TYPES = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/word/document.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+        '<Override PartName="/word/styles.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>'
+        '</Types>'
+    )
+    _ROOT_RELS = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="word/document.xml"/>'
+        '</Relationships>'
+    )
+    _DOCUMENT_RELS = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+        'Target="styles.xml"/>'
+        '</Relationships>'
+    )
+    _STYLES = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f'<w:styles xmlns:w="{_W}">'
+        '<w:docDefaults><w:rPrDefault><w:rPr>'
+        '<w:rFonts w:ascii="Times New Roman" w:hAnsi="Times New Roman" w:cs="Times New Roman"/>'
+        '<w:sz w:val="22"/></w:rPr></w:rPrDefault>'
+        '<w:pPrDefault><w:pPr><w:spacing w:after="160"/><w:jc w:val="both"/></w:pPr></w:pPrDefault>'
+        '</w:docDefaults>'
+        '<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/></w:style>'
+        '<w:style w:type="paragraph" w:styleId="Title"><w:name w:val="Title"/><w:basedOn w:val="Normal"/>'
+        '<w:pPr><w:jc w:val="center"/><w:spacing w:after="360"/></w:pPr><w:rPr><w:b/><w:sz w:val="32"/></w:rPr></w:style>'
+        '<w:style w:type="paragraph" w:styleId="Heading1"><w:name w:val="heading 1"/><w:basedOn w:val="Normal"/>'
+        '<w:pPr><w:keepNext/><w:spacing w:before="240" w:after="120"/><w:jc w:val="left"/><w:outlineLvl w:val="0"/></w:pPr>'
+        '<w:rPr><w:b/><w:sz w:val="24"/></w:rPr></w:style>'
+        '<w:style w:type="paragraph" w:styleId="ListParagraph"><w:name w:val="List Paragraph"/>'
+        '<w:basedOn w:val="Normal"/><w:pPr><w:ind w:left="720" w:hanging="360"/></w:pPr></w:style>'
+        '<w:style w:type="paragraph" w:styleId="Signature"><w:name w:val="Signature"/>'
+        '<w:basedOn w:val="Normal"/><w:pPr><w:keepLines/><w:spacing w:before="360"/><w:jc w:val="left"/></w:pPr></w:style>'
+        '</w:styles>'
+    )
+    _STYLE_IDS = {TITLE: "Title", HEADING: "Heading1", LIST_ITEM: "ListParagraph", SIGNATURE: "Signature"}
+
+    def _paragraph(self, block: Block) -> str:
+        properties = ""
+        style = self._STYLE_IDS.get(block.kind)
+        if style:
+            properties += f'<w:pStyle w:val="{style}"/>'
+        if block.kind == CLAUSE and block.level > 1:
+            properties += f'<w:ind w:left="{360 * (block.level - 1)}"/>'
+        text = block.text if block.kind != LIST_ITEM else f"•\t{block.text}"
+        runs = '<w:r><w:br/></w:r>'.join(
+            f'<w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r>' for line in text.split("\n")
+        )
+        return f"<w:p><w:pPr>{properties}</w:pPr>{runs}</w:p>"
+
+    def render(self, blocks, output):
+        body = "".join(self._paragraph(block) for block in blocks)
+        document = (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            f'<w:document xmlns:w="{self._W}"><w:body>{body}'
+            '<w:sectPr><w:pgSz w:w="12240" w:h="15840"/>'
+            '<w:pgMar w:top="1440" w:right="1440" w:bottom="1440" w:left="1440" '
+            'w:header="720" w:footer="720" w:gutter="0"/></w:sectPr>'
+            '</w:body></w:document>'
+        )
+        with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("[Content_Types].xml", self._CONTENT_TYPES)
+            archive.writestr("_rels/.rels", self._ROOT_RELS)
+            archive.writestr("word/_rels/document.xml.rels", self._DOCUMENT_RELS)
+            archive.writestr("word/styles.xml", self._STYLES)
+            archive.writestr("word/document.xml", document)
+        return None
+
+
+EXPORTERS: Dict[str, Exporter] = {}
+
+
+def register_exporter(exporter: Exporter) -> None:
+    EXPORTERS[exporter.format] = exporter
+
+
+for _exporter in (PdfExporter(), DocxExporter(), HtmlExporter(), MarkdownExporter()):
+    register_exporter(_exporter)
+
+
+def get_exporter(fmt: str) -> Exporter:
+    try:
+        return EXPORTERS[fmt.lower()]
+    except KeyError:
+        raise ValueError(f"Unsupported export format '{fmt}'. Supported: {', '.join(sorted(EXPORTERS))}")
+
+
+def render_export(
+    fmt: str, content: str, path: str, contract_id: Optional[int] = None, updated_at: Any = None
+) -> Dict:
+    """
+    Render contract text in format ``fmt`` to ``path``.
+
+    Top-level so it can run in a worker process. ``contract_id`` and
+    ``updated_at`` identify the stored contract version for the document
+    model cache. Returns the format, page count (None for unpaginated
+    formats) and render time in seconds.
+    """
+    started = time.perf_counter()
+    exporter = get_exporter(fmt)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    # Build into a private file and rename, so readers never see a partial file
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        pages = exporter.render(document_model(content, contract_id, updated_at), tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return {
+        "path": path,
+        "format": exporter.format,
+        "pages": pages,
+        "seconds": time.perf_counter() - started,
+    }
+
+
+class SpillBuffer(io.RawIOBase):
+    """
+    Binary output held in memory until it would exceed ``threshold`` bytes,
+    then moved to a temporary file that the rest of the output is written
+    to. ``path`` is set once spilled; the caller must delete that file.
+    ``peak_buffered`` is the most output ever held in memory.
+    """
+
+    def __init__(self, threshold: int, suffix: str = ""):
+        super().__init__()
+        self.threshold = threshold
+        self.suffix = suffix
+        self.path: Optional[str] = None
+        self.peak_buffered = 0
+        self._file: Union[io.BytesIO, BinaryIO] = io.BytesIO()
+
+    def readable(self) -> bool:
+        return True
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        if self.path is None and self._file.tell() + len(data) > self.threshold:
+            self._spill()
+        written = self._file.write(data)
+        if self.path is None:
+            self.peak_buffered = max(self.peak_buffered, len(self._file.getbuffer()))
+        return written
+
+    def _spill(self) -> None:
+        spill = tempfile.NamedTemporaryFile(prefix="contract-", suffix=self.suffix, delete=False)
+        try:
+            spill.write(self._file.getbuffer())
+            spill.seek(self._file.tell())
+        except BaseException:
+            spill.close()
+            os.remove(spill.name)
+            raise
+        self._file = spill
+        self.path = spill.name
+
+    def read(self, size: int = -1) -> bytes:
+        return self._file.read(size)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        return self._file.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._file.tell()
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def size(self) -> int:
+        position = self._file.tell()
+        end = self._file.seek(0, io.SEEK_END)
+        self._file.seek(position)
+        return end
+
+    def getvalue(self) -> bytes:
+        """The output, when it was never spilled."""
+        return self._file.getvalue()
+
+    def close(self) -> None:
+        if not self.closed:
+            super().close()
+            self._file.close()
+
+    def discard(self) -> None:
+        """Close and delete any spill file."""
+        self.close()
+        if self.path is not None and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def render_export_buffer(
+    fmt: str,
+    content: str,
+    spill_threshold: int,
+    trace_memory: bool = True,
+    contract_id: Optional[int] = None,
+    updated_at: Any = None
+) -> Dict:
+    """
+    Render contract text in format ``fmt`` without writing it to storage.
+
+    Top-level so it can run in a worker process. Output is written to a
+    ``SpillBuffer``: up to ``spill_threshold`` bytes stay in memory and are
+    returned in ``data``; output that would grow beyond it moves to a
+    temporary file while it is written, whose path is returned in
+    ``spill_path`` and which the caller must delete. Every render reports
+    the output it held in memory in ``buffered_bytes``. With
+    ``trace_memory`` the render's Python allocation high-water mark is
+    also reported in ``peak_memory_bytes`` (tracing slows rendering, so it
+    can be turned off).
+    """
+    started = time.perf_counter()
+    exporter = get_exporter(fmt)
+    tracing = trace_memory and not tracemalloc.is_tracing()
+    buffer = SpillBuffer(spill_threshold, exporter.suffix)
+    if tracing:
+        tracemalloc.start()
+    try:
+        pages = exporter.render(document_model(content, contract_id, updated_at), buffer)
+        peak = tracemalloc.get_traced_memory()[1] if tracing else None
+    except BaseException:
+        buffer.discard()
+        raise
+    finally:
+        if tracing:
+            tracemalloc.stop()
+
+    result = {
+        "format": exporter.format,
+        "pages": pages,
+        "size": buffer.size(),
+        "buffered_bytes": buffer.peak_buffered,
+        "peak_memory_bytes": peak,
+        "data": None,
+        "spill_path": buffer.path,
+    }
+    if buffer.path is None:
+        result["data"] = buffer.getvalue()
+    buffer.close()
+    result["seconds"] = time.perf_counter() - started
+    return result
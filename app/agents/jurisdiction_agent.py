@@ -1,29 +1,53 @@
 from typing import List, Dict, Optional, Union
-from dataclasses import dataclass
+from dataclasses import asdict
 import logging
 import uuid
 
-@dataclass
-class JurisdictionRequirement:
-    """Data structure for jurisdiction-specific requirements"""
-    requirement_id: str
-    jurisdiction: str
-    category: str  # 'legal', 'regulatory', 'cultural', 'language'
-    description: str
-    mandatory: bool
-    reference: str
-    implementation_guide: str
+from app.agents.contract_builder import COMPLIANCE, GOVERNING_LAW, MULTI_JURISDICTION, ContractBuilder
+from app.agents.jurisdiction_registry import (
+    JurisdictionRegistry,
+    JurisdictionRequirement,
+    get_jurisdiction_registry
+)
+from app.agents.localization import Localizer
 
 class JurisdictionCustomizationAgent:
     """
     Jurisdiction Customization Agent for adapting contracts to specific jurisdictions.
     Handles legal, regulatory, cultural, and linguistic adaptations.
+
+    Jurisdiction names are resolved through the JurisdictionRegistry, so
+    "MH", "Bombay" and "State of Maharashtra" all customize for Maharashtra
+    with its requirements and those inherited from India.
+
+    Clauses are appended to a ContractBuilder, keyed by kind, and the
+    content is assembled once after all stages.
+
+    With ``requirements['translate']`` set, the assembled contract is
+    translated into ``requirements['target_language']`` ("auto" picks the
+    jurisdiction's first non-English language) through the Localizer and
+    its translation memory; the memory statistics are recorded in
+    ``metadata['localization']``.
     """
-    def __init__(self):
+    # Opening words of the sections this agent appends, so they are
+    # recognised (and replaced) when a contract is customized again
+    SECTION_PREFIXES = {
+        GOVERNING_LAW: "Governing Law:",
+        COMPLIANCE: "This contract complies with the regulations of ",
+        MULTI_JURISDICTION: "Multi-jurisdictional Application:",
+    }
+
+    def __init__(self, registry: Optional[JurisdictionRegistry] = None, localizer: Optional[Localizer] = None):
         self.logger = logging.getLogger(__name__)
-        # Placeholder for loading jurisdiction requirements and language mappings
-        self.jurisdiction_requirements = {}
-        self.language_mappings = {}
+        self.registry = registry or get_jurisdiction_registry()
+        self._localizer = localizer
+
+    @property
+    def localizer(self) -> Localizer:
+        """The localizer, created on first translation request."""
+        if self._localizer is None:
+            self._localizer = Localizer()
+        return self._localizer
 
     def customize_for_jurisdiction(
         self,
@@ -49,21 +73,30 @@ class JurisdictionCustomizationAgent:
             is_string_input = isinstance(contract, str)
             contract_dict = self._convert_to_dict(contract) if is_string_input else contract.copy()
 
-            # Ensure metadata exists
-            if 'metadata' not in contract_dict:
-                contract_dict['metadata'] = {}
+            # Copy metadata too so the caller's dict is never written to
+            contract_dict['metadata'] = dict(contract_dict.get('metadata') or {})
+
+            # Resolve codes and aliases to registered names
+            primary_jurisdiction = self.registry.canonical_name(primary_jurisdiction)
+            additional_jurisdictions = [
+                self.registry.canonical_name(jurisdiction) for jurisdiction in additional_jurisdictions or []
+            ]
+
+            builder = self._builder_for(contract_dict)
 
             # 1. Legal Adaptation
             contract_dict = self._adapt_legal_terms(
                 contract_dict,
                 primary_jurisdiction,
-                additional_jurisdictions
+                additional_jurisdictions,
+                builder
             )
 
             # 2. Regulatory Compliance
             contract_dict = self._ensure_regulatory_compliance(
                 contract_dict,
-                primary_jurisdiction
+                primary_jurisdiction,
+                builder
             )
 
             # 3. Cultural Adaptation
@@ -72,207 +105,33 @@ class JurisdictionCustomizationAgent:
                 primary_jurisdiction
             )
 
-            # 4. Language Localization
-            if requirements and requirements.get('translate', False):
-                contract_dict = self._localize_language(
-                    contract_dict,
-                    primary_jurisdiction
-                )
-
-            # 5. Multi-jurisdiction Handling
-            if additional_jurisdictions:
-                contract_dict = self._handle_multiple_jurisdictions(
-                    contract_dict,
-                    primary_jurisdiction,
-                    additional_jurisdictions
-                )
+            # 4. Multi-jurisdiction Handling
+            contract_dict = self._handle_multiple_jurisdictions(
+                contract_dict,
+                primary_jurisdiction,
+                additional_jurisdictions,
+                builder
+            )
 
-            # 6. Add Jurisdiction Metadata
+            # 5. Add Jurisdiction Metadata
             contract_dict['metadata']['jurisdictions'] = {
                 'primary': primary_jurisdiction,
                 'additional': additional_jurisdictions or []
             }
 
-            # Return in the same format as input
-            return self._convert_to_original_format(contract_dict, is_string_input)
+            # Materialize the text once, after all stages
+            if builder is not None:
+                contract_dict['content'] = builder.build()
 
-        except Exception as e:
-            self.logger.error(f"Error in customize_for_jurisdiction: {str(e)}")
-            # Return original contract if there's an error
-            return contract
-
-    def _convert_to_dict(self, contract_text: str) -> Dict:
-        """Convert string contract to dictionary format"""
-        return {
-            'content': contract_text,
-            'metadata': {}
-        }
-
-    def _convert_to_original_format(self, contract_dict: Dict, was_string: bool) -> Union[str, Dict]:
-        """Convert back to original format"""
-        if was_string:
-            # Include any jurisdiction-specific additions from metadata
-            content = contract_dict['content']
-            if 'metadata' in contract_dict:
-                if 'compliance_statement' in contract_dict['metadata']:
-                    content += f"\n\n{contract_dict['metadata']['compliance_statement']}"
-            return content
-        return contract_dict
-
-    def _adapt_legal_terms(
-        self,
-        contract: Dict,
-        primary_jurisdiction: str,
-        additional_jurisdictions: Optional[List[str]]
-    ) -> Dict:
-        """Adapt legal terms and concepts for jurisdiction."""
-        try:
-            # Add governing law clause to the content
-            governing_law = f"\n\nGoverning Law: This contract shall be governed by the laws of {primary_jurisdiction}."
-            if 'content' in contract:
-                contract['content'] += governing_law
-            return contract
-        except Exception as e:
-            self.logger.error(f"Error in legal terms adaptation: {str(e)}")
-            return contract
-
-    def _ensure_regulatory_compliance(self, contract: Dict, jurisdiction: str) -> Dict:
-        """Ensure compliance with jurisdiction-specific regulations."""
-        try:
-            compliance_statement = f"This contract complies with the regulations of {jurisdiction}."
-            contract['metadata']['compliance_statement'] = compliance_statement
-            if 'content' in contract:
-                contract['content'] += f"\n\n{compliance_statement}"
-            return contract
-        except Exception as e:
-            self.logger.error(f"Error in regulatory compliance: {str(e)}")
-            return contract
-
-    def _adapt_cultural_elements(self, contract: Dict, jurisdiction: str) -> Dict:
-        """Adapt contract for cultural considerations."""
-        # Placeholder implementation
-        return contract
-
-    def _localize_language(self, contract: Dict, jurisdiction: str) -> Dict:
-        """Translate and localize contract language."""
-        # Placeholder implementation
-        return contract
-
-    def _handle_multiple_jurisdictions(
-        self,
-        contract: Dict,
-        primary_jurisdiction: str,
-        additional_jurisdictions: List[str]
-    ) -> Dict:
-        """Handle contracts involving multiple jurisdictions."""
-        try:
-            multi_jurisdiction_clause = (
-                f"\n\nMulti-jurisdictional Application: While this contract is primarily "
-                f"governed by the laws of {primary_jurisdiction}, it also considers the "
-                f"relevant regulations of the following jurisdictions: "
-                f"{', '.join(additional_jurisdictions)}."
-            )
-            if 'content' in contract:
-                contract['content'] += multi_jurisdiction_clause
-            return contract
-        except Exception as e:
-            self.logger.error(f"Error in multi-jurisdiction handling: {str(e)}")
-            return contract
-from typing import List, Dict, Optional, Union
-from dataclasses import dataclass
-import logging
-import uuid
-
-@dataclass
-class JurisdictionRequirement:
-    """Data structure for jurisdiction-specific requirements"""
-    requirement_id: str
-    jurisdiction: str
-    category: str  # 'legal', 'regulatory', 'cultural', 'language'
-    description: str
-    mandatory: bool
-    reference: str
-    implementation_guide: str
-
-class JurisdictionCustomizationAgent:
-    """
-    Jurisdiction Customization Agent for adapting contracts to specific jurisdictions.
-    Handles legal, regulatory, cultural, and linguistic adaptations.
-    """
-    def __init__(self):
-        self.logger = logging.getLogger(__name__)
-        # Placeholder for loading jurisdiction requirements and language mappings
-        self.jurisdiction_requirements = {}
-        self.language_mappings = {}
-
-    def customize_for_jurisdiction(
-        self,
-        contract: Union[str, Dict],
-        primary_jurisdiction: str,
-        additional_jurisdictions: Optional[List[str]] = None,
-        requirements: Optional[Dict] = None
-    ) -> Union[str, Dict]:
-        """
-        Adapt contract for specific jurisdiction(s).
-        
-        Args:
-            contract: Either a string containing the contract text or a dictionary with contract data
-            primary_jurisdiction: The main jurisdiction for the contract
-            additional_jurisdictions: Optional list of additional jurisdictions
-            requirements: Optional dictionary of specific requirements
-            
-        Returns:
-            The customized contract in the same format as the input (string or dict)
-        """
-        try:
-            # Convert string contract to dictionary format for processing
-            is_string_input = isinstance(contract, str)
-            contract_dict = self._convert_to_dict(contract) if is_string_input else contract.copy()
-
-            # Ensure metadata exists
-            if 'metadata' not in contract_dict:
-                contract_dict['metadata'] = {}
-
-            # 1. Legal Adaptation
-            contract_dict = self._adapt_legal_terms(
-                contract_dict,
-                primary_jurisdiction,
-                additional_jurisdictions
-            )
-
-            # 2. Regulatory Compliance
-            contract_dict = self._ensure_regulatory_compliance(
-                contract_dict,
-                primary_jurisdiction
-            )
-
-            # 3. Cultural Adaptation
-            contract_dict = self._adapt_cultural_elements(
-                contract_dict,
-                primary_jurisdiction
-            )
-
-            # 4. Language Localization
+            # 6. Language Localization, of the assembled text including the clauses above
             if requirements and requirements.get('translate', False):
                 contract_dict = self._localize_language(
-                    contract_dict,
-                    primary_jurisdiction
-                )
-
-            # 5. Multi-jurisdiction Handling
-            if additional_jurisdictions:
-                contract_dict = self._handle_multiple_jurisdictions(
                     contract_dict,
                     primary_jurisdiction,
-                    additional_jurisdictions
+                    requirements.get('target_language') or 'auto',
+                    requirements.get('user_key')
                 )
 
-            # 6. Add Jurisdiction Metadata
-            contract_dict['metadata']['jurisdictions'] = {
-                'primary': primary_jurisdiction,
-                'additional': additional_jurisdictions or []
-            }
-
             # Return in the same format as input
             return self._convert_to_original_format(contract_dict, is_string_input)
 
@@ -291,38 +150,49 @@ class JurisdictionCustomizationAgent:
     def _convert_to_original_format(self, contract_dict: Dict, was_string: bool) -> Union[str, Dict]:
         """Convert back to original format"""
         if was_string:
-            # Include any jurisdiction-specific additions from metadata
-            content = contract_dict['content']
-            if 'metadata' in contract_dict:
-                if 'compliance_statement' in contract_dict['metadata']:
-                    content += f"\n\n{contract_dict['metadata']['compliance_statement']}"
-            return content
+            # The compliance statement is already one of the content's sections
+            return contract_dict['content']
         return contract_dict
 
+    def _builder_for(self, contract: Dict) -> Optional[ContractBuilder]:
+        """Builder over the contract content, or None for contracts without content"""
+        if not isinstance(contract.get('content'), str):
+            return None
+        return ContractBuilder.from_text(contract['content'], self.SECTION_PREFIXES)
+
     def _adapt_legal_terms(
         self,
         contract: Dict,
         primary_jurisdiction: str,
-        additional_jurisdictions: Optional[List[str]]
+        additional_jurisdictions: Optional[List[str]],
+        builder: Optional[ContractBuilder] = None
     ) -> Dict:
         """Adapt legal terms and concepts for jurisdiction."""
         try:
             # Add governing law clause to the content
-            governing_law = f"\n\nGoverning Law: This contract shall be governed by the laws of {primary_jurisdiction}."
-            if 'content' in contract:
-                contract['content'] += governing_law
+            governing_law = f"Governing Law: This contract shall be governed by the laws of {primary_jurisdiction}."
+            if builder is not None:
+                builder.append(GOVERNING_LAW, governing_law, GOVERNING_LAW)
             return contract
         except Exception as e:
             self.logger.error(f"Error in legal terms adaptation: {str(e)}")
             return contract
 
-    def _ensure_regulatory_compliance(self, contract: Dict, jurisdiction: str) -> Dict:
+    def _ensure_regulatory_compliance(
+        self,
+        contract: Dict,
+        jurisdiction: str,
+        builder: Optional[ContractBuilder] = None
+    ) -> Dict:
         """Ensure compliance with jurisdiction-specific regulations."""
         try:
             compliance_statement = f"This contract complies with the regulations of {jurisdiction}."
             contract['metadata']['compliance_statement'] = compliance_statement
-            if 'content' in contract:
-                contract['content'] += f"\n\n{compliance_statement}"
+            contract['metadata']['requirements'] = [
+                asdict(requirement) for requirement in self.registry.requirements(jurisdiction)
+            ]
+            if builder is not None:
+                builder.append(COMPLIANCE, compliance_statement, COMPLIANCE)
             return contract
         except Exception as e:
             self.logger.error(f"Error in regulatory compliance: {str(e)}")
@@ -333,28 +203,54 @@ class JurisdictionCustomizationAgent:
         # Placeholder implementation
         return contract
 
-    def _localize_language(self, contract: Dict, jurisdiction: str) -> Dict:
-        """Translate and localize contract language."""
-        # Placeholder implementation
-        return contract
+    def _localize_language(
+        self,
+        contract: Dict,
+        jurisdiction: str,
+        target_language: str = 'auto',
+        user_key: Optional[str] = None
+    ) -> Dict:
+        """Translate the contract content into ``target_language``."""
+        try:
+            languages = list(self.registry.languages(jurisdiction))
+            contract['metadata']['languages'] = languages
+            if target_language == 'auto':
+                target_language = next((language for language in languages if language != 'en'), 'en')
+            if target_language == 'en' or not isinstance(contract.get('content'), str):
+                return contract
+            content, stats = self.localizer.localize(contract['content'], target_language, user_key=user_key)
+            contract['content'] = content
+            contract['metadata']['localization'] = stats.to_dict()
+            return contract
+        except Exception as e:
+            # Keep the English text rather than failing the whole customization
+            self.logger.error(f"Error in language localization: {str(e)}")
+            contract['metadata']['localization'] = {'language': target_language, 'error': str(e)}
+            return contract
 
     def _handle_multiple_jurisdictions(
         self,
         contract: Dict,
         primary_jurisdiction: str,
-        additional_jurisdictions: List[str]
+        additional_jurisdictions: List[str],
+        builder: Optional[ContractBuilder] = None
     ) -> Dict:
         """Handle contracts involving multiple jurisdictions."""
         try:
+            if builder is None:
+                return contract
+            if not additional_jurisdictions:
+                # Drop the clause left by an earlier multi-jurisdiction customization
+                builder.discard(MULTI_JURISDICTION)
+                return contract
             multi_jurisdiction_clause = (
-                f"\n\nMulti-jurisdictional Application: While this contract is primarily "
+                f"Multi-jurisdictional Application: While this contract is primarily "
                 f"governed by the laws of {primary_jurisdiction}, it also considers the "
                 f"relevant regulations of the following jurisdictions: "
                 f"{', '.join(additional_jurisdictions)}."
             )
-            if 'content' in contract:
-                contract['content'] += multi_jurisdiction_clause
+            builder.append(MULTI_JURISDICTION, multi_jurisdiction_clause, MULTI_JURISDICTION)
             return contract
         except Exception as e:
             self.logger.error(f"Error in multi-jurisdiction handling: {str(e)}")
-            return contract
\ No newline at end of file
+            return contract
@@ -0,0 +1,173 @@
+import json
+import os
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+JURISDICTIONS_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "jurisdictions.json"
+)
+
+_PUNCTUATION = re.compile(r"[^\w\s&-]")
+_PREFIXES = ("the ", "state of ", "union territory of ")
+
+
+def normalize_jurisdiction(name: str) -> str:
+    """Lookup key for a jurisdiction name, code or alias: lower case, no punctuation or "State of"."""
+    key = " ".join(_PUNCTUATION.sub(" ", name.lower()).split())
+    for prefix in _PREFIXES:
+        if key.startswith(prefix):
+            key = key[len(prefix):]
+    return key
+
+
+@dataclass(frozen=True)
+class JurisdictionRequirement:
+    """Data structure for jurisdiction-specific requirements"""
+    __slots__ = (
+        "requirement_id", "jurisdiction", "category", "description", "mandatory", "reference", "implementation_guide"
+    )
+    requirement_id: str
+    jurisdiction: str
+    category: str  # 'legal', 'regulatory', 'cultural', 'language'
+    description: str
+    mandatory: bool
+    reference: str
+    implementation_guide: str
+
+
+@dataclass(frozen=True)
+class Jurisdiction:
+    """
+    A country or state with its requirements resolved.
+
+    ``requirements`` already includes those inherited from the parent
+    (a requirement with the same id as an inherited one replaces it), so
+    lookups never walk the hierarchy.
+    """
+    __slots__ = ("code", "name", "parent", "languages", "requirements")
+    code: str
+    name: str
+    parent: Optional[str]
+    languages: Tuple[str, ...]
+    requirements: Tuple[JurisdictionRequirement, ...]
+
+    def requirements_for(self, category: str) -> Tuple[JurisdictionRequirement, ...]:
+        return tuple(requirement for requirement in self.requirements if requirement.category == category)
+
+    @property
+    def mandatory_requirements(self) -> Tuple[JurisdictionRequirement, ...]:
+        return tuple(requirement for requirement in self.requirements if requirement.mandatory)
+
+
+class JurisdictionRegistry:
+    """
+    Jurisdictions loaded once, with a normalized lookup index.
+
+    Names, codes ("IN-MH") and aliases ("MH", "Bombay") all map to the same
+    entry through one dict, so lookup cost does not depend on how many
+    jurisdictions are loaded. Inheritance from country to state is resolved
+    when the registry is built.
+    """
+
+    def __init__(self, entries: Iterable[Dict]):
+        raw = {entry["code"]: entry for entry in entries}
+        self._by_code: Dict[str, Jurisdiction] = {}
+        self._index: Dict[str, str] = {}
+        for code in raw:
+            self._resolve(code, raw, ())
+        for code, entry in raw.items():
+            for name in [code, entry["name"], *entry.get("aliases", ())]:
+                key = normalize_jurisdiction(name)
+                existing = self._index.setdefault(key, code)
+                if existing != code:
+                    raise ValueError(f"Jurisdiction alias '{name}' is used by both {existing} and {code}")
+
+    def _resolve(self, code: str, raw: Dict[str, Dict], chain: Tuple[str, ...]) -> Jurisdiction:
+        if code in self._by_code:
+            return self._by_code[code]
+        if code in chain:
+            raise ValueError(f"Jurisdiction parent cycle: {' -> '.join(chain + (code,))}")
+        if code not in raw:
+            raise ValueError(f"Unknown parent jurisdiction: {code}")
+        entry = raw[code]
+        parent_code = entry.get("parent")
+        requirements: Dict[str, JurisdictionRequirement] = {}
+        languages: Tuple[str, ...] = ()
+        if parent_code:
+            parent = self._resolve(parent_code, raw, chain + (code,))
+            requirements = {requirement.requirement_id: requirement for requirement in parent.requirements}
+            languages = parent.languages
+        for item in entry.get("requirements", ()):
+            requirements[item["id"]] = JurisdictionRequirement(
+                requirement_id=item["id"],
+                jurisdiction=code,
+                category=item["category"],
+                description=item["description"],
+                mandatory=bool(item.get("mandatory", False)),
+                reference=item.get("reference", ""),
+                implementation_guide=item.get("implementation_guide", ""),
+            )
+        jurisdiction = Jurisdiction(
+            code=code,
+            name=entry["name"],
+            parent=parent_code,
+            languages=tuple(entry.get("languages") or languages),
+            requirements=tuple(requirements.values()),
+        )
+        self._by_code[code] = jurisdiction
+        return jurisdiction
+
+    def get(self, name: Optional[str]) -> Optional[Jurisdiction]:
+        """
+        The jurisdiction called ``name`` (name, code or alias), or None.
+
+        "Mumbai, Maharashtra, India" style names are tried whole, then part
+        by part from the left, so the most specific known part wins.
+        """
+        if not name:
+            return None
+        code = self._index.get(normalize_jurisdiction(name))
+        if code is None and "," in name:
+            for part in name.split(","):
+                code = self._index.get(normalize_jurisdiction(part))
+                if code is not None:
+                    break
+        return self._by_code.get(code) if code is not None else None
+
+    def canonical_name(self, name: str) -> str:
+        """The registered name for ``name``, or ``name`` unchanged if unknown."""
+        jurisdiction = self.get(name)
+        return jurisdiction.name if jurisdiction else name
+
+    def requirements(self, name: str, category: Optional[str] = None) -> Tuple[JurisdictionRequirement, ...]:
+        jurisdiction = self.get(name)
+        if jurisdiction is None:
+            return ()
+        return jurisdiction.requirements_for(category) if category else jurisdiction.requirements
+
+    def languages(self, name: str) -> Tuple[str, ...]:
+        jurisdiction = self.get(name)
+        return jurisdiction.languages if jurisdiction else ()
+
+    def codes(self) -> List[str]:
+        return list(self._by_code)
+
+    def __contains__(self, name: str) -> bool:
+        return self.get(name) is not None
+
+    def __len__(self) -> int:
+        return len(self._by_code)
+
+
+def load_jurisdiction_registry(path: str = JURISDICTIONS_FILE) -> JurisdictionRegistry:
+    with open(path, encoding="utf-8") as f:
+        return JurisdictionRegistry(json.load(f)["jurisdictions"])
+
+
+@lru_cache(maxsize=1)
+def get_jurisdiction_registry() -> JurisdictionRegistry:
+    """The process-wide registry, loaded on first use."""
+    return load_jurisdiction_registry()
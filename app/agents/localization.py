@@ -0,0 +1,128 @@
+import logging
+import re
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Tuple
+
+from app.agents.translators import TranslatorBackend, get_translator
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.translation_memory import EXACT, TranslationMemory, get_translation_memory
+
+
+# Clause numbers, list markers and headings like "ARTICLE 3" stay as they are
+_MARKER = re.compile(r"^(\s*(?:(?:ARTICLE|SECTION|CLAUSE|SCHEDULE)\s+)?(?:\d+(?:\.\d+)*\.?|\([a-zA-Z0-9]{1,4}\)|[-•*])\s+)")
+# Sentence ends, followed by the start of the next sentence
+_SENTENCE_END = re.compile(r"(?<=[.;?!])\s+(?=[A-Z(\"'])")
+_LETTERS = re.compile(r"[^\W\d_]{2,}")
+
+
+@dataclass
+class LocalizationStats:
+    """Translation memory use for one localized contract, counted per distinct segment"""
+    language: str
+    segments: int = 0
+    exact_matches: int = 0
+    fuzzy_matches: int = 0  # translated with a similar stored segment as a hint
+    translated: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.exact_matches / self.segments if self.segments else 0.0
+
+    def to_dict(self) -> Dict:
+        return {**asdict(self), "hit_rate": round(self.hit_rate, 4)}
+
+
+class Localizer:
+    """
+    Translates contract text segment by segment through a translation memory.
+
+    The text is split into sentences (keeping line breaks, clause numbers
+    and list markers in place). Each distinct segment is looked up in the
+    memory first, and only an exact match (after numbers are normalized) is
+    reused as is. A fuzzy match scoring at least ``fuzzy_hint`` is only
+    passed to the backend as a starting point: a single changed word such
+    as "not" or "or" can invert a clause, so similar text is never taken
+    as equivalent. The remaining segments are sent to the backend,
+    ``batch_size`` per call, and their translations are stored so the next
+    contract reuses them.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[TranslatorBackend] = None,
+        memory: Optional[TranslationMemory] = None,
+        fuzzy_hint: Optional[float] = None,
+        batch_size: Optional[int] = None
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.backend = backend if backend is not None else get_translator(settings.TRANSLATION_BACKEND)
+        self.memory = memory if memory is not None else get_translation_memory()
+        self.fuzzy_hint = settings.TRANSLATION_FUZZY_HINT if fuzzy_hint is None else fuzzy_hint
+        self.batch_size = batch_size or settings.TRANSLATION_BATCH_SIZE
+
+    @staticmethod
+    def segment(text: str) -> List[Tuple[str, bool]]:
+        """``text`` as (piece, translatable) pairs that join back to it"""
+        pieces: List[Tuple[str, bool]] = []
+        for line in text.splitlines(keepends=True):
+            body = line.rstrip("\r\n")
+            ending = line[len(body):]
+            marker = _MARKER.match(body)
+            if marker:
+                pieces.append((marker.group(1), False))
+                body = body[marker.end():]
+            position = 0
+            for boundary in _SENTENCE_END.finditer(body):
+                pieces.append((body[position:boundary.start()], True))
+                pieces.append((boundary.group(), False))
+                position = boundary.end()
+            pieces.append((body[position:], True))
+            if ending:
+                pieces.append((ending, False))
+        return [
+            (piece, translatable and _LETTERS.search(piece) is not None)
+            for piece, translatable in pieces if piece
+        ]
+
+    def localize(self, text: str, language: str, user_key: Optional[str] = None) -> Tuple[str, LocalizationStats]:
+        """``text`` translated into ``language`` (a registry code such as "hi")"""
+        pieces = self.segment(text)
+        stats = LocalizationStats(language=language)
+        resolved: Dict[str, str] = {}
+        pending: List[str] = []
+        hints: List[Optional[str]] = []
+        for piece, translatable in pieces:
+            if not translatable or piece in resolved:
+                continue
+            stats.segments += 1
+            match = self.memory.lookup(piece, language, min_score=self.fuzzy_hint)
+            if match is not None and match.kind == EXACT:
+                resolved[piece] = match.translation
+                stats.exact_matches += 1
+                continue
+            if match is not None:
+                stats.fuzzy_matches += 1
+            # Placeholder so a repeated segment is only sent once
+            resolved[piece] = piece
+            pending.append(piece)
+            hints.append(match.translation if match is not None else None)
+
+        for start in range(0, len(pending), self.batch_size):
+            batch = pending[start:start + self.batch_size]
+            translations = self.backend.translate(
+                batch, language, hints[start:start + self.batch_size], user_key=user_key
+            )
+            for segment, translation in zip(batch, translations):
+                resolved[segment] = translation
+                self.memory.store(segment, language, translation, self.backend.name)
+        stats.translated = len(pending)
+
+        metrics.inc("translation_segments_total", stats.segments, labels={"language": language})
+        metrics.inc("translation_segments_translated_total", stats.translated, labels={"language": language})
+        metrics.observe("translation_memory_hit_rate", stats.hit_rate)
+        self.logger.info(
+            f"Localized into {language}: {stats.segments} segments, {stats.exact_matches} exact memory matches, "
+            f"{stats.translated} translated ({stats.fuzzy_matches} with a fuzzy match as a hint)"
+        )
+        return "".join(resolved[piece] if translatable else piece for piece, translatable in pieces), stats
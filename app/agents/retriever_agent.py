@@ -118,6 +118,22 @@ class RetrieverAgent:
             
         return embedding
 
+    def embed(self, texts: List[str], batch_size: int = 16) -> List[np.ndarray]:
+        """InLegalBERT embeddings of ``texts``, computed ``batch_size`` at a time"""
+        embeddings = []
+        for start in range(0, len(texts), batch_size):
+            inputs = self.tokenizer(
+                texts[start:start + batch_size],
+                max_length=512,
+                padding=True,
+                truncation=True,
+                return_tensors='pt'
+            ).to(self.device)
+            with torch.no_grad():
+                outputs = self.model(**inputs)
+            embeddings.extend(outputs.last_hidden_state[:, 0, :].cpu().numpy())
+        return embeddings
+
     def _find_relevant_references(self, query_embedding: np.ndarray, contract_type: str) -> List[Dict]:
         """Find relevant legal references"""
         relevant_refs = []
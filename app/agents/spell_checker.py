@@ -0,0 +1,253 @@
+import gzip
+import os
+import re
+import threading
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+WORDS_FILE = os.path.join(DATA_DIR, "english_words.txt.gz")
+GLOSSARY_FILE = os.path.join(DATA_DIR, "legal_glossary.txt")
+
+# Lower-case words of four or more letters that are not part of an
+# identifier, e-mail address, URL or path; shorter words are too ambiguous
+# to correct safely, and capitalised words are usually names or defined terms
+_WORD = re.compile(r"(?<![\w@./\\'’-])[a-z]{4,}(?![\w@/\\]|\.\w|['’-])")
+
+
+# Suffixes of inflected and derived forms. Those starting with a vowel may
+# have replaced a final "e" of the stem ("demising") or doubled its last
+# consonant ("estopped").
+_SUFFIXES = ("ment", "ness", "ly", "ies", "es", "s", "ing", "ed", "ee", "er", "or", "able", "al")
+
+
+def _stems(word: str, depth: int = 2) -> Iterator[str]:
+    """Words ``word`` may be formed from by up to ``depth`` suffixes, e.g. "consign" for "consignees"."""
+    for suffix in _SUFFIXES:
+        stem = word[:-len(suffix)]
+        if not word.endswith(suffix) or len(stem) < 3:
+            continue
+        if suffix == "ies":
+            candidates = [stem + "y"]
+        elif suffix == "es":
+            candidates = [stem] if stem.endswith(("s", "x", "z", "ch", "sh")) else []
+        elif suffix == "s":
+            candidates = [] if stem.endswith("s") else [stem]
+        elif suffix[0] in "aeiou":
+            candidates = [stem, stem + "e"]
+            if len(stem) > 3 and stem[-1] == stem[-2] and stem[-1] not in "aeiou":
+                candidates.append(stem[:-1])
+        else:
+            candidates = [stem]
+        for candidate in candidates:
+            yield candidate
+            if depth > 1:
+                yield from _stems(candidate, depth - 1)
+
+
+def _read_lines(lines: Iterable[str]) -> Iterator[str]:
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield line
+
+
+def _osa_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance, or ``limit + 1`` once it exceeds ``limit``."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous_previous: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, previous_previous[j - 2] + 1)
+            current[j] = value
+            row_min = min(row_min, value)
+        if row_min > limit:
+            return limit + 1
+        previous_previous, previous = previous, current
+    return previous[-1]
+
+
+class SpellChecker:
+    """
+    Symmetric-delete (SymSpell-style) spelling corrector.
+
+    Every dictionary word is indexed under the strings obtained by deleting
+    up to ``max_edit_distance`` characters from its first ``prefix_length``
+    characters. A misspelling is looked up by generating its own deletes
+    the same way, so candidates are found with a few dict lookups instead
+    of comparing against the whole dictionary; only those candidates are
+    checked with a real (Damerau) edit distance.
+
+    Words are ranked by frequency (the order of ``words``); glossary terms
+    rank ahead of all of them. Corrections are conservative: inflections of
+    known words ("pledgee", "demising", "mortgagors") are accepted as they
+    are, and a word is only replaced when one candidate clearly wins (see
+    :meth:`suggest`).
+    """
+
+    GLOSSARY_RANK = -1
+
+    def __init__(
+        self,
+        words: Iterable[str],
+        glossary: Iterable[str] = (),
+        max_edit_distance: int = 1,
+        prefix_length: int = 7
+    ):
+        self.max_edit_distance = max_edit_distance
+        self.prefix_length = prefix_length
+        self._rank: Dict[str, int] = {}
+        for term in glossary:
+            for part in term.lower().split("-"):
+                if part:
+                    self._rank[part] = self.GLOSSARY_RANK
+        for rank, word in enumerate(words):
+            self._rank.setdefault(word, rank)
+        # delete -> word, or tuple of words when several share the delete
+        self._deletes: Dict[str, object] = {}
+        for word in self._rank:
+            for delete in self._edits(word[:prefix_length]):
+                existing = self._deletes.get(delete)
+                if existing is None:
+                    self._deletes[delete] = word
+                elif isinstance(existing, tuple):
+                    self._deletes[delete] = existing + (word,)
+                else:
+                    self._deletes[delete] = (existing, word)
+        self._cache: Dict[str, Optional[str]] = {}
+        self._cache_lock = threading.Lock()
+
+    def _edits(self, word: str) -> set:
+        """``word`` and every string reachable by deleting up to max_edit_distance characters."""
+        results = {word}
+        frontier = {word}
+        for _ in range(self.max_edit_distance):
+            next_frontier = set()
+            for item in frontier:
+                if len(item) <= 1:
+                    continue
+                for i in range(len(item)):
+                    next_frontier.add(item[:i] + item[i + 1:])
+            next_frontier -= results
+            results |= next_frontier
+            frontier = next_frontier
+        return results
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._rank
+
+    def is_known(self, word: str) -> bool:
+        """Whether ``word`` is in the dictionary or glossary, or an inflection of a word that is."""
+        rank = self._rank
+        return word in rank or any(stem in rank for stem in _stems(word))
+
+    def __len__(self) -> int:
+        return len(self._rank)
+
+    def suggest(self, word: str) -> Optional[str]:
+        """
+        Correction for ``word``, or None if it is known (see :meth:`is_known`)
+        or ambiguous.
+
+        Among candidates at the smallest edit distance, the best is used
+        only if it is the only one, a glossary term competing with general
+        words, or at least ten times more frequent (by rank) than the next.
+        """
+        if self.is_known(word):
+            return None
+        candidates: Dict[str, int] = {}
+        limit = self.max_edit_distance
+        for delete in self._edits(word[:self.prefix_length]):
+            entry = self._deletes.get(delete)
+            if entry is None:
+                continue
+            for candidate in (entry if isinstance(entry, tuple) else (entry,)):
+                if candidate not in candidates:
+                    candidates[candidate] = _osa_distance(word, candidate, limit)
+        if not candidates:
+            return None
+        best_distance = min(candidates.values())
+        if best_distance > limit:
+            return None
+        closest = sorted(
+            (self._rank[candidate], candidate)
+            for candidate, distance in candidates.items()
+            if distance == best_distance
+        )
+        best_rank, best = closest[0]
+        if len(closest) == 1:
+            return best
+        second_rank = closest[1][0]
+        if best_rank == self.GLOSSARY_RANK and second_rank != self.GLOSSARY_RANK:
+            return best
+        if best_rank >= 0 and (best_rank + 1) * 10 <= second_rank + 1:
+            return best
+        return None
+
+    def _cached_suggestion(self, word: str) -> Optional[str]:
+        try:
+            return self._cache[word]
+        except KeyError:
+            pass
+        suggestion = self.suggest(word)
+        with self._cache_lock:
+            if len(self._cache) >= 50000:
+                self._cache.clear()
+            self._cache[word] = suggestion
+        return suggestion
+
+    def correct(self, text: str) -> Tuple[str, List[Tuple[str, str]]]:
+        """
+        Correct misspelled words in one pass over ``text``.
+
+        Returns the corrected text and the (original, replacement) pairs.
+        """
+        corrections: List[Tuple[str, str]] = []
+        rank = self._rank
+
+        def replace(match: "re.Match") -> str:
+            word = match.group()
+            if word in rank:
+                return word
+            suggestion = self._cached_suggestion(word)
+            if suggestion is None:
+                return word
+            corrections.append((word, suggestion))
+            return suggestion
+
+        corrected = _WORD.sub(replace, text)
+        if corrections:
+            metrics.inc("spellcheck_corrections_total", len(corrections))
+        return corrected, corrections
+
+
+def load_spell_checker(
+    words_file: str = WORDS_FILE,
+    glossary_file: str = GLOSSARY_FILE,
+    max_edit_distance: int = 1
+) -> SpellChecker:
+    """Build a checker from the gzip word list (most frequent first) and glossary."""
+    with gzip.open(words_file, "rt", encoding="utf-8") as f:
+        words = list(_read_lines(f))
+    glossary: List[str] = []
+    if os.path.exists(glossary_file):
+        with open(glossary_file, encoding="utf-8") as f:
+            glossary = list(_read_lines(f))
+    return SpellChecker(words, glossary, max_edit_distance=max_edit_distance)
+
+
+@lru_cache(maxsize=1)
+def get_spell_checker() -> SpellChecker:
+    """The process-wide checker, loaded on first use."""
+    return load_spell_checker(max_edit_distance=settings.SPELLCHECK_MAX_EDIT_DISTANCE)
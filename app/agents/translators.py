@@ -0,0 +1,124 @@
+import json
+import logging
+from typing import Dict, List, Optional, Type
+
+from app.core.llm_scheduler import llm_scheduler, LLMPriority
+
+
+# Language codes used in the jurisdiction registry
+LANGUAGE_NAMES = {
+    "en": "English",
+    "hi": "Hindi",
+    "mr": "Marathi",
+    "kn": "Kannada",
+    "ta": "Tamil",
+    "te": "Telugu",
+    "bn": "Bengali",
+    "gu": "Gujarati",
+    "ml": "Malayalam",
+    "pa": "Punjabi",
+    "or": "Odia",
+    "as": "Assamese",
+    "ur": "Urdu",
+    "kok": "Konkani",
+    "ne": "Nepali",
+    "mni": "Manipuri",
+}
+
+
+class TranslatorBackend:
+    """
+    Translates batches of contract segments.
+
+    ``hints`` holds, per segment, a stored translation of a similar segment
+    (or None) that the backend may adapt instead of translating from
+    scratch. Numbered placeholders such as ⟦0⟧ must be kept as they are.
+    """
+    name = "base"
+
+    def translate(
+        self,
+        segments: List[str],
+        target_language: str,
+        hints: Optional[List[Optional[str]]] = None,
+        user_key: Optional[str] = None
+    ) -> List[str]:
+        raise NotImplementedError
+
+
+class StubTranslator(TranslatorBackend):
+    """Local backend for tests and development: tags each segment with the language code"""
+    name = "stub"
+
+    def __init__(self):
+        self.calls = 0
+        self.segments = 0
+
+    def translate(self, segments, target_language, hints=None, user_key=None):
+        self.calls += 1
+        self.segments += len(segments)
+        return [f"[{target_language}] {segment}" for segment in segments]
+
+
+class OpenAITranslator(TranslatorBackend):
+    """Translates a batch of segments per LLM call, queued as batch work"""
+    name = "openai"
+
+    def __init__(self, client=None, model: str = "gpt-3.5-turbo"):
+        self.logger = logging.getLogger(__name__)
+        if client is None:
+            from openai import OpenAI
+            client = OpenAI()
+        self.client = client
+        self.model = model
+
+    def translate(self, segments, target_language, hints=None, user_key=None):
+        language = LANGUAGE_NAMES.get(target_language, target_language)
+        items = []
+        for index, segment in enumerate(segments):
+            item = {"id": index, "text": segment}
+            if hints and hints[index]:
+                item["similar_translation"] = hints[index]
+            items.append(item)
+        prompt = (
+            f"Translate each contract segment below from English into {language}. "
+            "Use formal legal register and keep party names, defined terms in quotes "
+            "and placeholders such as ⟦0⟧ unchanged. Where a similar_translation is "
+            "given, adapt it rather than translating from scratch so wording stays "
+            "consistent across contracts. Reply with a JSON array of "
+            '{"id": ..., "text": ...} objects, one per segment, and nothing else.\n\n'
+            + json.dumps(items, ensure_ascii=False)
+        )
+        response = llm_scheduler.call(
+            user_key,
+            LLMPriority.BATCH,
+            self.client.chat.completions.create,
+            model=self.model,
+            messages=[
+                {"role": "system", "content": "You are a certified legal translator for Indian contracts."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0
+        )
+        reply = response.choices[0].message.content.strip()
+        if reply.startswith("```"):
+            reply = reply.strip("`").split("\n", 1)[-1]
+        translated: Dict[int, str] = {item["id"]: item["text"] for item in json.loads(reply)}
+        missing = [index for index in range(len(segments)) if index not in translated]
+        if missing:
+            raise ValueError(f"Translator returned no text for {len(missing)} of {len(segments)} segments")
+        return [translated[index] for index in range(len(segments))]
+
+
+TRANSLATOR_BACKENDS: Dict[str, Type[TranslatorBackend]] = {
+    StubTranslator.name: StubTranslator,
+    OpenAITranslator.name: OpenAITranslator,
+}
+
+
+def get_translator(name: str) -> TranslatorBackend:
+    """A new instance of the backend registered as ``name``"""
+    try:
+        return TRANSLATOR_BACKENDS[name.lower()]()
+    except KeyError:
+        raise ValueError(f"Unknown translator backend '{name}' (expected one of {', '.join(TRANSLATOR_BACKENDS)})")
@@ -1,41 +1,66 @@
-import os
 import logging
-from datetime import datetime
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet
+from typing import Dict, Optional
+from app.agents.exporters import get_exporter, render_export, render_export_buffer
+from app.core.config import settings
+from app.core.pdf_store import PdfStore, pdf_store
+
+# Identifies the layout produced by render_pdf_file; kept for callers that
+# key stored PDFs directly
+PDF_RENDER_SETTINGS = get_exporter("pdf").settings
+
+
+def render_pdf_file(content: str, path: str) -> Dict:
+    """
+    Render contract text to a PDF at ``path``.
+
+    Top-level so it can run in a worker process. Returns the page count and
+    render time in seconds.
+    """
+    return render_export("pdf", content, path)
+
 
 class UserInterfaceAgent:
     """Handles contract presentation and PDF generation."""
 
-    def __init__(self):
+    def __init__(self, store: Optional[PdfStore] = None):
         self.logger = logging.getLogger("themis_logger")
-        self.output_dir = "generated_contracts"
-        os.makedirs(self.output_dir, exist_ok=True)
+        self.store = store or pdf_store
+        self.output_dir = self.store.root
+
+    def pdf_key(self, contract: str) -> str:
+        """Content address of the PDF rendered from ``contract``."""
+        return self.export_key(contract, "pdf")
+
+    def export_key(self, contract: str, fmt: str) -> str:
+        """Content address of ``contract`` exported as ``fmt``."""
+        return self.store.key_for(contract, get_exporter(fmt).settings)
 
     def display_final_contract(self, contract: str) -> str:
         """Generate and save PDF version, return file path."""
         try:
-            timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-            pdf_filename = f"contract_{timestamp}.pdf"
-            pdf_path = os.path.join(self.output_dir, pdf_filename)
+            key = self.pdf_key(contract)
+            pdf_path = self.store.lookup(key)
+            if pdf_path:
+                self.logger.info(f"Reusing stored contract PDF {pdf_path}")
+                return pdf_path
+            pdf_path = self.store.path_for(key)
             self._create_pdf(contract, pdf_path)
+            self.store.register(key)
             self.logger.info(f"Contract saved as {pdf_path}")
-            print("Hello PDF Path : ",pdf_path)
             return pdf_path
         except Exception as e:
             self.logger.error(f"Error generating PDF: {str(e)}")
             raise
 
-    def _create_pdf(self, content: str, path: str) -> None:
-        """Create PDF from contract content."""
-        styles = getSampleStyleSheet()
-        doc = SimpleDocTemplate(path, pagesize=letter)
-        story = []
+    def render_to_buffer(self, contract: str, fmt: str = "pdf") -> Dict:
+        """
+        Render ``contract`` in this process without storing it.
 
-        # Process content into paragraphs
-        for line in content.split('\n\n'):
-            story.append(Paragraph(line.strip(), styles['Normal']))
-            story.append(Spacer(1, 12))
+        Returns the bytes in ``data``, or ``spill_path`` for output above
+        PDF_SPILL_THRESHOLD_BYTES; see render_export_buffer.
+        """
+        return render_export_buffer(fmt, contract, settings.PDF_SPILL_THRESHOLD_BYTES, trace_memory=False)
 
-        doc.build(story)
+    def _create_pdf(self, content: str, path: str) -> None:
+        """Create PDF from contract content."""
+        render_pdf_file(content, path)
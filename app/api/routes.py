@@ -1,31 +1,64 @@
 # app/api/routes.py
 
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Header, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from pydantic import BaseModel
 from datetime import datetime
+from functools import partial
+import json
+import random
+import time
 
 # Import existing schemas and models
 from app.models.schemas import (
     ContractRequirements,
     ContractResponse,
+    PdfStatusResponse,
+    FeedbackRequest,
+    FeedbackResponse,
+    CorrectionEntry,
+    CorrectionPage,
+    ContractVariantSummary,
+    ContractVariantResponse,
     UserCreate,
     Token,
     User as UserSchema
 )
 from app.core.security import security  # Correctly import the security instance
-from app.agents.user_interface_agent import UserInterfaceAgent
+from app.agents.user_interface_agent import UserInterfaceAgent, render_pdf_file
+from app.agents.exporters import get_exporter, render_export, render_export_buffer
 from app.agents.retriever_agent import RetrieverAgent
 from app.agents.drafting_agent import DraftingAgent
 from app.agents.correction_agent import CorrectionAgent
 from app.agents.jurisdiction_agent import JurisdictionCustomizationAgent
-from langgraph.graph import Graph, END
+from app.agents.contract_retrieval import ContractGrounding, ContractSectionIndex, hashing_embedding
+from app.pipeline import ContractPipeline
 from app.dependencies import get_db
+from app.core.database import SessionLocal
 from app.models.user import User
 from app.core.logger import logger
+from app.core.metrics import metrics
 from app.core.rate_limit import limiter
+from app.core.config import settings
+from app.core.coalescing import PENDING, SingleFlight, IdempotencyStore, requirements_fingerprint
+from app.core.scheduler import stage_scheduler
+from app.core.render_pool import pdf_render_pool, RenderJob, RenderQueueFull
+from app.core.pdf_store import pdf_store
+from app.core.correction_history import correction_history, decode_diff
+from app.core.contract_variants import contract_variants
+from app.core.chat_stream import ChatReplyStream, COMPLETED
+from app.core.chat_context import ChatContext, chat_context
+from app.core.file_serving import (
+    conditional_file_response,
+    client_has_current,
+    not_modified_response,
+    streamed_download_response
+)
 
 # Import models for Chat and Message
 from app.models.chat import Chat
@@ -33,7 +66,7 @@ from app.models.message import Message
 from app.models.contract import Contract, ContractType
 
 # Import OpenAI client
-from app.core.openai_client import generate_chat_response
+from app.core.openai_client import generate_chat_response, stream_chat_response
 
 # Initialize APIRouter once
 router = APIRouter()
@@ -44,9 +77,31 @@ retriever_agent = RetrieverAgent()
 drafting_agent = DraftingAgent()
 correction_agent = CorrectionAgent()
 jurisdiction_agent = JurisdictionCustomizationAgent()
+contract_pipeline = ContractPipeline(
+    retriever_agent,
+    drafting_agent,
+    correction_agent,
+    jurisdiction_agent,
+    scheduler=stage_scheduler,
+    speculative=settings.SPECULATIVE_DRAFTING,
+    regenerate_sections=settings.DRAFT_VALIDATION_REGENERATE,
+    max_regenerated_sections=settings.DRAFT_VALIDATION_MAX_SECTIONS
+)
+
+# Section embeddings of contracts being discussed in chat
+contract_section_index = ContractSectionIndex(
+    retriever_agent.embed if settings.CHAT_EMBEDDING_BACKEND == "inlegalbert" else hashing_embedding,
+    top_k=settings.CHAT_CONTRACT_SECTIONS,
+    max_chunk_tokens=settings.CHAT_CONTRACT_CHUNK_TOKENS,
+    cache_size=settings.CHAT_EMBEDDING_CACHE_SIZE
+)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token")
 
+# Duplicate-submission handling for contract generation
+generation_flight = SingleFlight()
+idempotency_store = IdempotencyStore(ttl_seconds=settings.IDEMPOTENCY_TTL_SECONDS)
+
 # -----------------------------------
 # 1. Authentication Endpoints
 # -----------------------------------
@@ -114,133 +169,120 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
 async def generate_contract(
     request: Request,
     requirements: ContractRequirements,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    render_pdf: bool = False,
+    idempotency_key: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_user)
 ):
-    try:
-        logger.info(f"User '{current_user.username}' initiated contract generation.")
-        # Initialize state
-        state = {
-            "user_inputs": requirements.dict(),
-            "legal_references": [],
-            "contract_draft": "",
-            "corrected_draft": "",
-            "final_contract": "",
-            "error": None,
-            "completed": False
-        }
-
-        # Workflow logic (unchanged from your original code)
-        def collect_user_inputs(state):
-            # Print incoming state for debugging
-            print("Original User Input State:", state)
-
-            # Hardcode the `details` section
-            state["user_inputs"]["details"] = {
-   "prompt": """Please generate a legally binding contract. Include proper signature blocks as follows:
-
-1. For PARTY 1:
-  - Signature line
-  - Printed name
-  - Title/Position
-  - Date
-  - Company seal placement
-  - Beneficiary details 
-  - Witness signature and details
-
-2. For PARTY 2:
-  - Signature line
-  - Printed name
-  - Title/Position  
-  - Date
-  - Company seal placement
-  - Beneficiary details
-  - Witness signature and details
-
-3. Additional Requirements:
-  - Add notary section if required by jurisdiction
-  - Include all relevant legal citations and references
-  - Ensure compliance with local laws
-  - Add page numbers in 'Page X of Y' format
-  - Include version control
-  - Use proper legal margins and formatting
-
-Please maintain highest standards of legal accuracy and enforceability while generating the contract.""",
-
-   "signature_block": "Include standard legal signature blocks with proper spacing and formatting for all parties involved"
-}
-
-            # Print updated state for debugging
-            print("Updated User Input State with Hardcoded Details:", state)
-
-            return state
-
-        def retrieve_legal_references(state):
-            logger.debug(f"User inputs before legal reference search: {state.get('user_inputs')}")
-            if not state["user_inputs"]:
-                logger.error("User inputs are None or invalid.")
-            else:
-                logger.debug(f"User inputs keys: {state['user_inputs'].keys()}")
-            state["legal_references"] = retriever_agent.search_legal_reference(state["user_inputs"])
-            logger.debug(f"Legal references retrieved: {state['legal_references']}")
-            logger.debug(f"Legal reference search input: {state.get('user_inputs')}")
-            logger.debug(f"Contract draft type before correction: {type(state['contract_draft'])}")
-
-            return state
-            
-        def generate_initial_draft(state):
-            state["contract_draft"] = drafting_agent.create_initial_draft(
-                contract_type=state["user_inputs"]["contract_type"],
-                requirements=state["user_inputs"],
-                legal_refs=state["legal_references"]
-            )
-            logger.debug(f"Contract draft type before correction: {type(state['contract_draft'])}")
+    """
+    Generate a contract, coalescing duplicate submissions.
 
-            return state
+    Concurrent requests from the same user with identical requirements share
+    one pipeline run. When an ``Idempotency-Key`` header is sent, a completed
+    result is replayed for repeats of that key within the idempotency window;
+    a repeat arriving while the first request runs shares its run.
 
-        def correct_draft(state):
-            state["corrected_draft"] = correction_agent.correct_draft(state["contract_draft"])
-            return state
+    The PDF is rendered when first downloaded; pass ``render_pdf=true`` to
+    start rendering it in the background straight away.
+    """
+    fingerprint = requirements_fingerprint({
+        "requirements": requirements.model_dump(mode="json"),
+        "render_pdf": render_pdf
+    })
+
+    idempotency_scope = (current_user.id, idempotency_key)
+    if idempotency_key:
+        # Claimed before the run starts, so concurrent repeats cannot both run
+        stored = idempotency_store.reserve(idempotency_scope, fingerprint)
+        if stored is not None:
+            stored_fingerprint, stored_response = stored
+            if stored_fingerprint != fingerprint:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Idempotency-Key was already used with a different request."
+                )
+            if stored_response is not PENDING:
+                logger.info(f"Replaying stored result for idempotency key '{idempotency_key}' of user '{current_user.username}'.")
+                return stored_response
+            # Same request still running: joins its run below
+
+    def generate_in_session() -> ContractResponse:
+        # The run can outlive this request (and its session) when the client disconnects
+        session = SessionLocal()
+        try:
+            return _generate_contract(requirements, current_user, session)
+        finally:
+            session.close()
+
+    async def generate_and_queue_pdf() -> ContractResponse:
+        response = await run_in_threadpool(generate_in_session)
+        if response.completed:
+            response.pdf_file = _pdf_download_path(response.id)
+            if render_pdf:
+                response.pdf_status = _queue_pdf(response.final_contract)
+        return response
 
-        def customize_jurisdiction(state):
-            customized = jurisdiction_agent.customize_for_jurisdiction(
-                {'content': state["corrected_draft"], 'metadata': {}},
-                state["user_inputs"].get('jurisdiction', 'Default Jurisdiction'),
-                state["user_inputs"].get('additional_jurisdictions', []),
-                requirements={'translate': False}
+    try:
+        response = await generation_flight.do((current_user.id, fingerprint), generate_and_queue_pdf)
+    except BaseException:
+        if idempotency_key:
+            idempotency_store.release(idempotency_scope, fingerprint)
+        raise
+
+    if idempotency_key:
+        if response.completed:
+            idempotency_store.put(idempotency_scope, fingerprint, response)
+        else:
+            idempotency_store.release(idempotency_scope, fingerprint)
+    return response
+
+def _pdf_download_path(contract_id: int) -> str:
+    return f"api/v1/contracts/{contract_id}/pdf"
+
+def _queue_pdf(content: str) -> Optional[str]:
+    """
+    Make sure a PDF of ``content`` exists or is being rendered.
+
+    PDFs are stored by content hash, so an identical contract rendered
+    before is reused as-is. Otherwise rendering is queued on the process
+    pool and the text can be returned right away. Returns the PDF status,
+    or None in memory storage mode, where PDFs are rendered per download.
+    """
+    if settings.PDF_STORAGE_MODE == "memory":
+        return None
+    key = ui_agent.pdf_key(content)
+    if pdf_store.lookup(key):
+        return RenderJob.READY
+    try:
+        job = pdf_render_pool.submit(
+            key, render_pdf_file, content, pdf_store.path_for(key),
+            on_ready=lambda result: pdf_store.register(key)
+        )
+        return job.status
+    except Exception as e:
+        logger.error(f"Could not queue PDF rendering: {str(e)}")
+        return RenderJob.FAILED
+
+def _generate_contract(
+    requirements: ContractRequirements,
+    current_user: User,
+    db: Session
+) -> ContractResponse:
+    try:
+        logger.info(f"User '{current_user.username}' initiated contract generation.")
+        # Execute workflow; with variant jurisdictions, drafting runs once and
+        # only customization runs per jurisdiction
+        if requirements.variant_jurisdictions:
+            final_state = contract_pipeline.run_variants(
+                requirements.dict(), requirements.variant_jurisdictions, user_key=str(current_user.id)
             )
-            state["final_contract"] = customized['content'] if isinstance(customized, dict) else customized
-            return state
-
-        def should_continue(state):
-            return "continue" if not state.get("error") else END
-
-        # Workflow graph (unchanged)
-        workflow = Graph()
-        workflow.add_node("collect_inputs", collect_user_inputs)
-        workflow.add_node("retrieve_references", retrieve_legal_references)
-        workflow.add_node("generate_draft", generate_initial_draft)
-        workflow.add_node("correct_draft", correct_draft)
-        workflow.add_node("customize_jurisdiction", customize_jurisdiction)
-        workflow.set_entry_point("collect_inputs")
-        workflow.add_conditional_edges("collect_inputs", should_continue, {"continue": "retrieve_references", END: END})
-        workflow.add_conditional_edges("retrieve_references", should_continue, {"continue": "generate_draft", END: END})
-        workflow.add_conditional_edges("generate_draft", should_continue, {"continue": "correct_draft", END: END})
-        workflow.add_conditional_edges("correct_draft", should_continue, {"continue": "customize_jurisdiction", END: END})
-        workflow.add_conditional_edges("customize_jurisdiction", should_continue, {"continue": END, END: END})
-        compiled_workflow = workflow.compile()
-
-        # Execute workflow
-        final_state = compiled_workflow.invoke(state)
+        else:
+            final_state = contract_pipeline.run(requirements.dict(), user_key=str(current_user.id))
 
         if final_state.get("error"):
             logger.error(f"Error during contract generation for user '{current_user.username}': {final_state['error']}")
             return ContractResponse(error=final_state["error"], completed=False)
         
-        # Generate PDF
-        pdf_path = ui_agent.display_final_contract(final_state["final_contract"])
         final_state["completed"] = True
-        final_state["pdf_file"] = pdf_path
 
         # Save contract details to the database and retrieve its ID
         try:
@@ -254,6 +296,11 @@ Please maintain highest standards of legal accuracy and enforceability while gen
 
             db.add(new_contract)
             print("Hellow Details of the Contracxt ; ",new_contract.content)
+            variants = final_state.get("variants") or {}
+            if variants:
+                # Variants are stored as deltas on the contract's content
+                db.flush()
+                contract_variants.record(db, new_contract.id, new_contract.content, variants)
             db.commit()
             db.refresh(new_contract)
         except Exception as db_error:
@@ -266,15 +313,279 @@ Please maintain highest standards of legal accuracy and enforceability while gen
         # Return the response with the contract ID included
         return ContractResponse(
             final_contract=final_state["final_contract"],
-            pdf_file=final_state.get("pdf_file"),
             completed=final_state["completed"],
-            id=new_contract.id  # Add the contract ID here
+            id=new_contract.id,  # Add the contract ID here
+            validation=(final_state.get("validation") or {}).get("findings"),
+            variants=list(final_state.get("variants") or {}) or None,
+            localization=final_state.get("localization")
         )
 
     except Exception as e:
         db.rollback()  # Ensure rollback in case of unexpected errors
         logger.error(f"Unexpected error for user '{current_user.username}': {str(e)}")
         return ContractResponse(error=str(e), completed=False)
+
+@router.api_route("/contracts/{contract_id}/pdf", methods=["GET", "HEAD"])
+async def download_contract_pdf(
+    request: Request,
+    contract_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Download the PDF of a stored contract, rendering it on first request.
+
+    Only the contract's owner may download it. Rendered files are cached on
+    disk by the content hash of the contract text, so later downloads (and
+    any other contract with identical text) are served straight from the
+    cache. Updating a contract changes its text and therefore its cache
+    entry. The hash doubles as a strong ETag: revalidating clients get a
+    304 without the file being read, and Range requests are honoured.
+    """
+    contract = await _get_owned_contract(contract_id, current_user, db)
+    return await _serve_export(request, contract, "pdf")
+
+@router.api_route("/contracts/{contract_id}/export", methods=["GET", "HEAD"])
+async def export_contract(
+    request: Request,
+    contract_id: int,
+    format: str = "pdf",
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Download a stored contract as PDF, DOCX, HTML or Markdown (``md``).
+
+    Exports are rendered from the same parsed document model and cached
+    like PDFs: per contract text and format, validated by ETag, and streamed
+    from disk rather than buffered.
+    """
+    try:
+        get_exporter(format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    contract = await _get_owned_contract(contract_id, current_user, db)
+    return await _serve_export(request, contract, format)
+
+async def _get_owned_contract(contract_id: int, current_user: User, db: Session) -> Contract:
+    contract = await run_in_threadpool(
+        lambda: db.query(Contract).filter(Contract.id == contract_id, Contract.user_id == current_user.id).first()
+    )
+    if not contract:
+        raise HTTPException(status_code=404, detail="Contract not found.")
+    return contract
+
+async def _serve_export(request: Request, contract: Contract, fmt: str):
+    exporter = get_exporter(fmt)
+    key = ui_agent.export_key(contract.content, exporter.format)
+    etag = f'"{key}"'
+    download_name = f"contract_{contract.id}{exporter.suffix}"
+    if client_has_current(request, etag):
+        # Answer revalidation without rendering or reading the file
+        return not_modified_response(etag)
+
+    if settings.PDF_STORAGE_MODE == "memory":
+        return await _stream_export(exporter, contract, etag, download_name)
+
+    # Pinned until the response is sent, so retention cannot evict the file
+    # between it being registered (or looked up) and being streamed
+    pdf_store.pin(key)
+    try:
+        path = pdf_store.lookup(key)
+        if not path:
+            try:
+                job = await pdf_render_pool.ensure(
+                    key, render_export, exporter.format, contract.content, pdf_store.path_for(key, exporter.suffix),
+                    contract.id, contract.updated_at,
+                    on_ready=lambda result: pdf_store.register(key, exporter.suffix)
+                )
+            except RenderQueueFull:
+                raise _render_busy()
+            if job.status != RenderJob.READY:
+                raise HTTPException(status_code=500, detail=f"Could not render the contract as {exporter.format}.")
+            path = job.result["path"]
+        response = conditional_file_response(request, path, etag, exporter.media_type, download_name)
+    except BaseException:
+        pdf_store.unpin(key)
+        raise
+    response.background = BackgroundTask(pdf_store.unpin, key)
+    return response
+
+async def _stream_export(exporter, contract: Contract, etag: str, download_name: str):
+    """
+    Render in a worker without touching storage and stream the result.
+
+    Output larger than PDF_SPILL_THRESHOLD_BYTES is written to a temporary
+    file as it is rendered and comes back as that file instead of bytes.
+    Every render reports the output it buffered in memory; a sample also
+    reports its allocation peak.
+    """
+    trace_memory = random.random() < settings.PDF_MEMORY_SAMPLE_RATE
+    try:
+        result = await pdf_render_pool.render(
+            render_export_buffer, exporter.format, contract.content, settings.PDF_SPILL_THRESHOLD_BYTES, trace_memory,
+            contract.id, contract.updated_at
+        )
+    except RenderQueueFull:
+        raise _render_busy()
+    except Exception as e:
+        logger.error(f"In-memory {exporter.format} render failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Could not render the contract as {exporter.format}.")
+    return streamed_download_response(
+        etag,
+        exporter.media_type,
+        result["size"],
+        data=result["data"],
+        spill_path=result["spill_path"],
+        filename=download_name
+    )
+
+def _render_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Rendering is busy, please retry shortly.",
+        headers={"Retry-After": "5"}
+    )
+
+@router.get("/contracts/{contract_id}/pdf/status", response_model=PdfStatusResponse)
+def get_pdf_status(
+    contract_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Report whether the PDF for a generated contract is ready.
+    """
+    contract = db.query(Contract).filter(Contract.id == contract_id, Contract.user_id == current_user.id).first()
+    if not contract:
+        raise HTTPException(status_code=404, detail="Contract not found.")
+
+    key = ui_agent.pdf_key(contract.content)
+    if settings.PDF_STORAGE_MODE == "memory" or pdf_store.lookup(key):
+        # In memory mode every download renders, so the PDF is always available
+        return PdfStatusResponse(id=contract_id, pdf_status=RenderJob.READY, pdf_file=_pdf_download_path(contract_id))
+
+    job = pdf_render_pool.job(key)
+    if job is None:
+        raise HTTPException(status_code=404, detail="No PDF rendering found for this contract.")
+    return PdfStatusResponse(
+        id=contract_id,
+        pdf_status=job.status,
+        pdf_file=_pdf_download_path(contract_id) if job.status == RenderJob.READY else None,
+        error=job.error
+    )
+@router.post("/contracts/{contract_id}/feedback", response_model=FeedbackResponse)
+def apply_contract_feedback(
+    contract_id: int,
+    request: FeedbackRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Apply section-level corrections to a stored contract.
+
+    The updated text and a diff of each correction are saved in one
+    transaction; sections that cannot be found are reported back.
+    """
+    contract = db.query(Contract).filter(Contract.id == contract_id, Contract.user_id == current_user.id).first()
+    if not contract:
+        raise HTTPException(status_code=404, detail="Contract not found.")
+
+    feedback = [item.model_dump() for item in request.feedback]
+    updated, corrections = correction_agent.process_feedback({"content": contract.content}, feedback)
+    applied = {correction.section for correction in corrections}
+    unmatched = [item.section for item in request.feedback if item.section not in applied]
+
+    rows = []
+    if corrections:
+        try:
+            contract.content = updated["content"]
+            contract.updated_at = datetime.utcnow()
+            rows = correction_history.record(db, contract.id, current_user.id, corrections)
+            db.commit()
+        except Exception as db_error:
+            db.rollback()
+            logger.error(f"Database error while saving corrections: {str(db_error)}")
+            raise HTTPException(status_code=500, detail="Error saving corrections to database")
+        logger.info(f"Applied {len(corrections)} corrections to contract {contract_id} for user '{current_user.username}'.")
+
+    return FeedbackResponse(
+        id=contract.id,
+        final_contract=contract.content,
+        corrections=[_correction_entry(row) for row in rows],
+        unmatched_sections=unmatched
+    )
+
+@router.get("/contracts/{contract_id}/corrections", response_model=CorrectionPage)
+def list_contract_corrections(
+    contract_id: int,
+    limit: int = 20,
+    before: Optional[int] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Correction history of a contract, newest first.
+
+    Pass the returned ``next_before`` as ``before`` to get the next page.
+    """
+    contract = db.query(Contract.id).filter(Contract.id == contract_id, Contract.user_id == current_user.id).first()
+    if not contract:
+        raise HTTPException(status_code=404, detail="Contract not found.")
+    rows, next_before = correction_history.page(db, contract_id, limit=limit, before_id=before)
+    return CorrectionPage(items=[_correction_entry(row) for row in rows], next_before=next_before)
+
+@router.get("/contracts/{contract_id}/variants", response_model=List[ContractVariantSummary])
+def list_contract_variants(
+    contract_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Jurisdiction variants generated with a contract."""
+    contract = db.query(Contract.id).filter(Contract.id == contract_id, Contract.user_id == current_user.id).first()
+    if not contract:
+        raise HTTPException(status_code=404, detail="Contract not found.")
+    return [
+        ContractVariantSummary(jurisdiction=row.jurisdiction, delta_size=len(row.delta), created_at=row.created_at)
+        for row in contract_variants.list(db, contract_id)
+    ]
+
+@router.get("/contracts/{contract_id}/variants/{jurisdiction}", response_model=ContractVariantResponse)
+def get_contract_variant(
+    contract_id: int,
+    jurisdiction: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Full text of one jurisdiction variant. ``jurisdiction`` may be a name,
+    code or alias ("Karnataka", "IN-KA", "KA").
+
+    If the contract was edited after the variant was generated, the
+    current contract is customized for the jurisdiction instead.
+    """
+    contract = db.query(Contract).filter(Contract.id == contract_id, Contract.user_id == current_user.id).first()
+    if not contract:
+        raise HTTPException(status_code=404, detail="Contract not found.")
+    name = jurisdiction_agent.registry.canonical_name(jurisdiction)
+    row = contract_variants.get(db, contract_id, name)
+    if row is None:
+        raise HTTPException(status_code=404, detail="No variant for this jurisdiction.")
+    content = contract_variants.materialize(contract.content, row)
+    if content is None:
+        content = contract_pipeline.customize_text(contract.content, name, [])
+    return ContractVariantResponse(contract_id=contract_id, jurisdiction=name, content=content)
+
+def _correction_entry(row) -> CorrectionEntry:
+    return CorrectionEntry(
+        id=row.id,
+        correction_id=row.correction_id,
+        section=row.section,
+        reason=row.reason,
+        diff=decode_diff(row.diff, row.compressed),
+        created_at=row.created_at
+    )
+
 # -----------------------------------
 # 3. Chatbot Functionality
 # -----------------------------------
@@ -283,9 +594,12 @@ Please maintain highest standards of legal accuracy and enforceability while gen
 class ChatRequest(BaseModel):
     contract_id: int
     message: str
+    use_contract: bool = True  # send the contract sections relevant to the message
 
 class ChatResponse(BaseModel):
     response: str
+    contract_sections: Optional[List[str]] = None  # titles of the contract sections sent with the message
+    tokens_saved: Optional[int] = None  # prompt tokens saved compared with sending the whole contract
 
 class MessageSchema(BaseModel):
     sender: str
@@ -296,6 +610,87 @@ class ChatHistorySchema(BaseModel):
     chat_id: int
     messages: List[MessageSchema]
 
+def _get_chat(db: Session, user_id: int, contract_id: int) -> Chat:
+    """The user's chat about one of their contracts, created on first use."""
+    contract = db.query(Contract.id).filter(Contract.id == contract_id, Contract.user_id == user_id).first()
+    if not contract:
+        raise HTTPException(status_code=404, detail="Contract not found.")
+    chat = db.query(Chat).filter(Chat.user_id == user_id, Chat.contract_id == contract_id).first()
+    if not chat:
+        chat = Chat(user_id=user_id, contract_id=contract_id)
+        db.add(chat)
+        db.commit()
+        db.refresh(chat)
+    return chat
+
+def _ground_in_contract(db: Session, contract_id: int, question: str) -> Optional[ContractGrounding]:
+    """
+    Sections of the contract relevant to ``question``. Section embeddings
+    are cached per contract version, so only ``updated_at`` is read unless
+    the contract changed since it was last embedded.
+    """
+    try:
+        updated_at = db.query(Contract.updated_at).filter(Contract.id == contract_id).scalar()
+        grounding = contract_section_index.retrieve(
+            contract_id,
+            updated_at,
+            lambda: db.query(Contract.content).filter(Contract.id == contract_id).scalar() or "",
+            question
+        )
+    except Exception as e:
+        # Answer without the contract rather than failing the turn
+        logger.error(f"Could not retrieve sections of contract {contract_id}: {str(e)}")
+        return None
+    metrics.inc("chat_contract_tokens_sent_total", grounding.prompt_tokens)
+    metrics.inc("chat_contract_tokens_saved_total", grounding.tokens_saved)
+    return grounding
+
+def _start_chat_turn(
+    db: Session, chat: Chat, prompt: str, user_key: str, use_contract: bool = True
+) -> Tuple[ChatContext, Optional[ContractGrounding]]:
+    """
+    Bounded context (rolling summary and recent turns) of the conversation
+    before this turn and, with ``use_contract``, the contract sections
+    relevant to ``prompt``; the user's message is stored afterwards.
+    """
+    context = chat_context.load(db, chat, user_key=user_key)
+    grounding = _ground_in_contract(db, chat.contract_id, prompt) if use_contract and chat.contract_id else None
+    db.add(Message(chat_id=chat.id, sender="user", content=prompt))
+    db.commit()
+    return context, grounding
+
+def _start_session_chat_turn(
+    chat_id: int, prompt: str, user_key: str, use_contract: bool = True
+) -> Tuple[ChatContext, Optional[ContractGrounding]]:
+    """``_start_chat_turn`` for a WebSocket session, which holds no database session between turns."""
+    db = SessionLocal()
+    try:
+        return _start_chat_turn(db, db.get(Chat, chat_id), prompt, user_key, use_contract)
+    finally:
+        db.close()
+
+def _grounding_summary(grounding: Optional[ContractGrounding]) -> Dict:
+    if grounding is None:
+        return {"contract_sections": None, "tokens_saved": None}
+    return {
+        "contract_sections": [chunk.title for chunk in grounding.sections],
+        "tokens_saved": grounding.tokens_saved
+    }
+
+def _save_message(chat_id: int, sender: str, content: str) -> int:
+    """Store a message in its own session; streamed replies outlive the request's."""
+    db = SessionLocal()
+    try:
+        message = Message(chat_id=chat_id, sender=sender, content=content)
+        db.add(message)
+        db.commit()
+        return message.id
+    finally:
+        db.close()
+
+def _save_bot_message(chat_id: int, content: str) -> int:
+    return _save_message(chat_id, "bot", content)
+
 # 3.2. Chatbot Endpoint
 @router.post("/chat", response_model=ChatResponse)
 @limiter.limit("10/minute")  # Adjust rate limit as needed
@@ -309,42 +704,195 @@ def chat(
     Handle chat messages about a specific contract.
     """
     try:
-        # Fetch the contract
-        contract = db.query(Contract).filter(Contract.id == chat_request.contract_id, Contract.user_id == current_user.id).first()
-        if not contract:
-            raise HTTPException(status_code=404, detail="Contract not found.")
-        
-        # Fetch or create a chat session
-        chat = db.query(Chat).filter(Chat.user_id == current_user.id, Chat.contract_id == chat_request.contract_id).first()
-        if not chat:
-            chat = Chat(user_id=current_user.id, contract_id=chat_request.contract_id)
-            db.add(chat)
-            db.commit()
-            db.refresh(chat)
-        
-        # Fetch conversation history
-        conversation = db.query(Message).filter(Message.chat_id == chat.id).order_by(Message.timestamp).all()
-        conversation_history = [{"sender": msg.sender, "content": msg.content} for msg in conversation]
-        
-        # Save user message
-        user_message = Message(chat_id=chat.id, sender="user", content=chat_request.message)
-        db.add(user_message)
-        db.commit()
+        # Fetch or create the chat session and save the user message
+        chat = _get_chat(db, current_user.id, chat_request.contract_id)
+        context, grounding = _start_chat_turn(
+            db, chat, chat_request.message, str(current_user.id), chat_request.use_contract
+        )
         
         # Generate AI response
-        ai_response = generate_chat_response(chat_request.message, conversation_history)
+        ai_response = generate_chat_response(
+            chat_request.message,
+            context.history,
+            user_key=str(current_user.id),
+            summary=context.summary,
+            contract_excerpt=grounding.excerpt if grounding else None
+        )
         
         # Save AI response
         bot_message = Message(chat_id=chat.id, sender="bot", content=ai_response)
         db.add(bot_message)
         db.commit()
         
-        return ChatResponse(response=ai_response)
+        return ChatResponse(response=ai_response, **_grounding_summary(grounding))
     
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error during chat for user '{current_user.username}': {str(e)}")
         raise HTTPException(status_code=500, detail="An error occurred while processing your request.")
 
+def _sse_event(data: Dict, event: Optional[str] = None) -> str:
+    return (f"event: {event}\n" if event else "") + f"data: {json.dumps(data)}\n\n"
+
+@router.post("/chat/stream")
+@limiter.limit("10/minute")
+async def chat_stream(
+    request: Request,
+    chat_request: ChatRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Stream the reply to a chat message as server-sent events.
+
+    Each piece of text arrives as a ``data: {"token": ...}`` event while the
+    model generates it, followed by an ``event: done`` carrying the stored
+    message's id and the contract sections used (or ``event: error``). The reply is saved once, when the
+    stream ends; if the client disconnects first, the partial reply is saved.
+    """
+    user_key = str(current_user.id)
+
+    def start_turn():
+        chat = _get_chat(db, current_user.id, chat_request.contract_id)
+        return (chat, *_start_chat_turn(db, chat, chat_request.message, user_key, chat_request.use_contract))
+
+    try:
+        chat, context, grounding = await run_in_threadpool(start_turn)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error during chat for user '{current_user.username}': {str(e)}")
+        raise HTTPException(status_code=500, detail="An error occurred while processing your request.")
+
+    reply = ChatReplyStream(
+        chat.id,
+        generate=partial(
+            stream_chat_response,
+            chat_request.message,
+            context.history,
+            user_key=user_key,
+            summary=context.summary,
+            contract_excerpt=grounding.excerpt if grounding else None
+        ),
+        save=_save_bot_message
+    )
+
+    async def events():
+        try:
+            async for token in reply.tokens():
+                yield _sse_event({"token": token})
+        except Exception as e:
+            logger.error(f"Error streaming chat reply for user '{current_user.username}': {str(e)}")
+            yield _sse_event({"detail": "An error occurred while generating the response."}, "error")
+            return
+        yield _sse_event({"message_id": reply.message_id, **_grounding_summary(grounding)}, "done")
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Stores the partial reply if the client disconnected mid-stream
+        background=BackgroundTask(reply.finish)
+    )
+
+def _open_chat_session(token: str, contract_id: int) -> Tuple[int, float, int]:
+    """User id, token expiry and chat id for a WebSocket chat session."""
+    payload = security.decode_access_token(token)
+    username = payload.get("sub") if payload else None
+    if username is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    db = SessionLocal()
+    try:
+        user = db.query(User.id).filter(User.username == username).first()
+        if user is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+        chat = _get_chat(db, user.id, contract_id)
+        return user.id, float(payload.get("exp", 0)), chat.id
+    finally:
+        db.close()
+
+@router.websocket("/chat/ws/{contract_id}")
+async def chat_websocket(websocket: WebSocket, contract_id: int, token: Optional[str] = None):
+    """
+    Chat about a contract over one WebSocket connection.
+
+    The access token is checked once, when the connection opens (as the
+    ``token`` query parameter, or ``{"token": ...}`` as the first message),
+    and the user and chat are looked up then too; later messages only
+    check the token's expiry. Send ``{"message": ...}`` (with
+    ``"use_contract": false`` to leave the contract out); the reply arrives
+    as ``{"type": "token", "content": ...}`` messages followed by
+    ``{"type": "done", "message_id": ...}`` with the contract sections used. Each reply is stored when it
+    ends, or partially if the connection drops first.
+    """
+    await websocket.accept()
+    try:
+        if token is None:
+            token = (await websocket.receive_json()).get("token")
+        user_id, expires_at, chat_id = await run_in_threadpool(
+            _open_chat_session, token or "", contract_id
+        )
+    except HTTPException as e:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(e.detail))
+        return
+    except (WebSocketDisconnect, ValueError, AttributeError):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Expected an access token")
+        return
+
+    try:
+        while True:
+            try:
+                data = await websocket.receive_json()
+            except ValueError:
+                data = None
+            if expires_at and time.time() >= expires_at:
+                await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Token expired")
+                return
+            prompt = data.get("message") if isinstance(data, dict) else None
+            if not prompt:
+                await websocket.send_json({"type": "error", "detail": "Expected {\"message\": ...}"})
+                continue
+
+            try:
+                context, grounding = await run_in_threadpool(
+                    _start_session_chat_turn, chat_id, prompt, str(user_id), bool(data.get("use_contract", True))
+                )
+            except Exception as e:
+                # Report the failed turn and keep the connection for the next message
+                logger.error(f"Error during chat for user {user_id}: {str(e)}")
+                await websocket.send_json({"type": "error", "detail": "An error occurred while processing your request."})
+                continue
+            reply = ChatReplyStream(
+                chat_id,
+                generate=partial(
+                    stream_chat_response,
+                    prompt,
+                    context.history,
+                    user_key=str(user_id),
+                    summary=context.summary,
+                    contract_excerpt=grounding.excerpt if grounding else None
+                ),
+                save=_save_bot_message
+            )
+            try:
+                async for piece in reply.tokens():
+                    await websocket.send_json({"type": "token", "content": piece})
+            except WebSocketDisconnect:
+                raise
+            except Exception as e:
+                logger.error(f"Error streaming chat reply for user {user_id}: {str(e)}")
+                await websocket.send_json({"type": "error", "detail": "An error occurred while generating the response."})
+            finally:
+                # Stores the partial reply when the connection dropped mid-stream
+                await reply.finish()
+            if reply.status == COMPLETED:
+                await websocket.send_json(
+                    {"type": "done", "message_id": reply.message_id, **_grounding_summary(grounding)}
+                )
+    except WebSocketDisconnect:
+        logger.info(f"Chat WebSocket for contract {contract_id} closed by user {user_id}")
+
 # 3.3. Chat History Endpoint
 @router.get("/chat/history/{contract_id}", response_model=ChatHistorySchema)
 @limiter.limit("10/minute")  # Adjust rate limit as needed
@@ -3,3 +3,5 @@ from app.models.contract import Contract  # Import models here
 from app.models.chat import Chat  # Example: Import other models as needed
 from app.models.message import Message  # Example: Import other models as needed
 from app.models.user import User  # Example: Import other models as needed
+from app.models.correction import ContractCorrection
+from app.models.variant import ContractVariant
@@ -0,0 +1,113 @@
+# app/core/chat_context.py
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.metrics import metrics
+from app.core.openai_client import estimate_tokens, summarize_conversation
+from app.models.chat import Chat
+from app.models.message import Message
+
+
+@dataclass
+class ChatContext:
+    """What the model is shown of a conversation before the new message"""
+    summary: Optional[str]
+    history: List[Dict]
+    prompt_tokens: int
+
+
+class ChatContextManager:
+    """
+    Bounded conversation context: a rolling summary plus the last turns.
+
+    A chat's ``summary`` covers every message up to
+    ``summarized_message_id``; only messages after that cursor are read.
+    Once more than ``recent_turns + summary_batch_turns`` turns have
+    accumulated after it, all but the last ``recent_turns`` are folded into
+    the summary in one summarizer call and the cursor moves past them. The
+    prompt therefore holds the summary (at most ``summary_max_tokens``) and
+    at most ``recent_turns + summary_batch_turns`` turns, however long the
+    conversation gets, and summarizing happens once every
+    ``summary_batch_turns`` turns rather than on every turn.
+    """
+
+    def __init__(
+        self,
+        summarize: Optional[Callable[..., str]] = None,
+        recent_turns: int = 6,
+        summary_batch_turns: int = 4,
+        summary_max_tokens: int = 300
+    ):
+        self.summarize = summarize or summarize_conversation
+        self.recent_messages = 2 * recent_turns
+        self.fold_threshold = 2 * (recent_turns + summary_batch_turns)
+        self.summary_max_tokens = summary_max_tokens
+
+    def load(self, db: Session, chat: Chat, user_key: Optional[str] = None) -> ChatContext:
+        """Context for the next turn of ``chat``, folding older messages into its summary when due."""
+        cursor = chat.summarized_message_id
+        query = db.query(Message.id, Message.sender, Message.content).filter(Message.chat_id == chat.id)
+        if cursor is not None:
+            query = query.filter(Message.id > cursor)
+        rows = query.order_by(Message.id).all()
+        metrics.observe("chat_context_messages_read", len(rows))
+
+        if len(rows) > self.fold_threshold:
+            folded, rows = rows[:-self.recent_messages], rows[-self.recent_messages:]
+            self._fold(db, chat, cursor, folded, user_key)
+
+        history = [{"sender": row.sender, "content": row.content} for row in rows]
+        prompt_tokens = estimate_tokens(chat.summary or "") + sum(estimate_tokens(msg["content"]) for msg in history)
+        metrics.observe("chat_context_prompt_tokens", prompt_tokens)
+        return ChatContext(summary=chat.summary, history=history, prompt_tokens=prompt_tokens)
+
+    def _fold(self, db: Session, chat: Chat, cursor: Optional[int], folded: List, user_key: Optional[str]) -> None:
+        try:
+            summary = self.summarize(
+                chat.summary,
+                [{"sender": row.sender, "content": row.content} for row in folded],
+                user_key=user_key,
+                max_tokens=self.summary_max_tokens
+            )
+        except Exception as e:
+            # The folded messages are left out of this prompt; folding is retried next turn
+            logger.error(f"Could not summarize chat {chat.id}: {str(e)}")
+            metrics.inc("chat_summary_failures_total")
+            return
+
+        # Compare-and-set on the cursor: a concurrent turn may have folded already
+        current = Chat.summarized_message_id.is_(None) if cursor is None else Chat.summarized_message_id == cursor
+        updated = (
+            db.query(Chat)
+            .filter(Chat.id == chat.id, current)
+            .update(
+                {
+                    Chat.summary: summary,
+                    Chat.summarized_message_id: folded[-1].id,
+                    Chat.summary_updated_at: datetime.now(timezone.utc),
+                },
+                synchronize_session=False
+            )
+        )
+        db.commit()
+        if updated:
+            chat.summary = summary
+            chat.summarized_message_id = folded[-1].id
+            metrics.inc("chat_summaries_total")
+            metrics.inc("chat_messages_summarized_total", len(folded))
+        else:
+            db.refresh(chat)
+
+
+# Create a single instance to be imported by other modules
+chat_context = ChatContextManager(
+    recent_turns=settings.CHAT_CONTEXT_TURNS,
+    summary_batch_turns=settings.CHAT_SUMMARY_BATCH_TURNS,
+    summary_max_tokens=settings.CHAT_SUMMARY_MAX_TOKENS
+)
@@ -0,0 +1,94 @@
+# app/core/chat_stream.py
+
+import time
+from typing import AsyncIterator, Callable, Iterator, List, Optional
+
+import anyio
+from starlette.concurrency import run_in_threadpool
+
+from app.core.logger import logger
+from app.core.metrics import metrics
+
+# Outcomes of a streamed reply
+COMPLETED = "completed"
+DISCONNECTED = "disconnected"
+FAILED = "failed"
+
+
+class ChatReplyStream:
+    """
+    One bot reply, forwarded piece by piece as the model generates it.
+
+    Iterate ``tokens()`` to receive the text. The reply is stored as a
+    single bot Message by ``finish()``, through ``save(chat_id, text)``
+    (which returns the new message's id). ``tokens()`` finishes the reply
+    when the model is done; if the consumer stops early (the client
+    disconnected) the owner calls ``finish()`` instead, which stores the
+    text generated so far and closes the model request so it stops holding
+    an LLM scheduler slot. ``finish()`` only acts once; later calls wait
+    for the first to complete.
+
+    ``generate()`` returns the blocking iterator of text pieces; it and
+    ``save`` run in the thread pool, one call per token, so the event loop
+    is never blocked on the provider.
+    """
+
+    def __init__(
+        self,
+        chat_id: int,
+        generate: Callable[[], Iterator[str]],
+        save: Callable[[int, str], int]
+    ):
+        self.chat_id = chat_id
+        self.generate = generate
+        self.save = save
+        self.status: Optional[str] = None
+        self.message_id: Optional[int] = None
+        self.text = ""
+        self._pieces: Optional[Iterator[str]] = None
+        self._parts: List[str] = []
+        self._finished: Optional[anyio.Event] = None
+
+    async def tokens(self) -> AsyncIterator[str]:
+        self._pieces = pieces = self.generate()
+        started = time.monotonic()
+        try:
+            while self._finished is None:
+                # Not cancellable while the thread runs, so ``pieces`` is
+                # never still executing when ``finish`` closes it
+                piece = await run_in_threadpool(next, pieces, None)
+                if piece is None:
+                    self.status = COMPLETED
+                    break
+                if not self._parts:
+                    metrics.observe("chat_stream_first_token_seconds", time.monotonic() - started)
+                self._parts.append(piece)
+                yield piece
+        except Exception:
+            self.status = FAILED
+            raise
+        finally:
+            await self.finish()
+
+    async def finish(self) -> None:
+        """Close the model request and store the reply (or what there is of it)."""
+        if self._finished is not None:
+            await self._finished.wait()
+            return
+        self._finished = anyio.Event()
+        self.status = self.status or DISCONNECTED
+        # May run while the caller is being cancelled: shield it from the cancellation
+        with anyio.CancelScope(shield=True):
+            try:
+                if self._pieces is not None:
+                    await run_in_threadpool(self._pieces.close)
+                self.text = "".join(self._parts)
+                if self.text:
+                    self.message_id = await run_in_threadpool(self.save, self.chat_id, self.text)
+            except Exception as e:
+                logger.error(f"Could not store streamed chat reply for chat {self.chat_id}: {str(e)}")
+            finally:
+                self._finished.set()
+        metrics.inc("chat_stream_replies_total", labels={"status": self.status})
+        if self.status != COMPLETED:
+            logger.info(f"Chat {self.chat_id} reply {self.status} after {len(self.text)} characters")
@@ -0,0 +1,138 @@
+# app/core/coalescing.py
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from app.core.logger import logger
+
+
+def requirements_fingerprint(requirements: Dict[str, Any]) -> str:
+    """
+    Hash a requirements payload in canonical form.
+
+    Keys are sorted and non-JSON values (dates, decimals, enums) are
+    stringified, so two payloads that differ only in key order or
+    formatting map to the same fingerprint.
+    """
+    canonical = json.dumps(
+        requirements,
+        sort_keys=True,
+        separators=(",", ":"),
+        default=lambda value: getattr(value, "value", str(value)),
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key onto one in-flight execution.
+
+    The first caller for a key starts the work; every caller that arrives
+    while it is still running awaits the same task and receives the same
+    result (or exception). Once the work finishes the key is released.
+
+    The work runs as a task of its own, so cancelling any caller (including
+    the one that started it) only stops that caller waiting; the others
+    still get the result. Work whose callers have all gone away runs to
+    completion and its result is dropped.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is not None:
+            logger.info(f"Coalescing request onto in-flight execution for key {key}")
+        else:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._release(key, done))
+        return await asyncio.shield(task)
+
+    def _release(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved when nobody was left waiting
+            task.exception()
+
+    def in_flight(self) -> int:
+        return len(self._inflight)
+
+
+# Result of an idempotency key whose first request is still running
+PENDING = object()
+
+
+class IdempotencyStore:
+    """
+    Remember completed results per idempotency key for a fixed window.
+
+    Each entry records the fingerprint of the request that produced it so a
+    key reused with a different payload can be rejected instead of replayed.
+    A key is claimed with ``reserve`` before its request runs, so of two
+    concurrent requests with the same key only one holds it; the entry
+    stays ``PENDING`` until ``put`` stores the result or ``release`` frees
+    the key.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, Tuple[float, str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Tuple[str, Any]]:
+        with self._lock:
+            return self._get(key)
+
+    def reserve(self, key: Hashable, fingerprint: str) -> Optional[Tuple[str, Any]]:
+        """
+        Claim ``key`` for a request with ``fingerprint``. Returns None if the
+        key was free (and is now held), otherwise the existing fingerprint
+        and result, which is ``PENDING`` while the holder is still running.
+        """
+        with self._lock:
+            entry = self._get(key)
+            if entry is None:
+                self._set(key, fingerprint, PENDING)
+            return entry
+
+    def put(self, key: Hashable, fingerprint: str, result: Any) -> None:
+        with self._lock:
+            self._set(key, fingerprint, result)
+
+    def release(self, key: Hashable, fingerprint: str) -> None:
+        """Free ``key`` if it is still held, unfinished, for ``fingerprint``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] == fingerprint and entry[2] is PENDING:
+                del self._entries[key]
+
+    def _get(self, key: Hashable) -> Optional[Tuple[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, fingerprint, result = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        return fingerprint, result
+
+    def _set(self, key: Hashable, fingerprint: str, result: Any) -> None:
+        if key not in self._entries and len(self._entries) >= self.max_entries:
+            self._evict_expired()
+            if len(self._entries) >= self.max_entries:
+                # Drop the oldest insertion (dicts keep insertion order)
+                self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, fingerprint, result)
+
+    def _evict_expired(self) -> None:
+        now = time.monotonic()
+        for key in [k for k, (expires_at, _, _) in self._entries.items() if expires_at < now]:
+            del self._entries[key]
@@ -12,5 +12,55 @@ class Settings:
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
     OPENAI_MODEL: str = "gpt-3.5-turbo"  # You can use "gpt-4" if you have access
+    IDEMPOTENCY_TTL_SECONDS: int = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", "600"))
+    CPU_EXECUTOR_WORKERS: int = int(os.getenv("CPU_EXECUTOR_WORKERS", str(os.cpu_count() or 2)))
+    IO_EXECUTOR_WORKERS: int = int(os.getenv("IO_EXECUTOR_WORKERS", "32"))
+    LLM_MAX_IN_FLIGHT: int = int(os.getenv("LLM_MAX_IN_FLIGHT", "8"))
+    LLM_INTERACTIVE_SHARE: int = int(os.getenv("LLM_INTERACTIVE_SHARE", "4"))
+    PDF_RENDER_WORKERS: int = int(os.getenv("PDF_RENDER_WORKERS", "2"))
+    PDF_RENDER_MAX_PENDING: int = int(os.getenv("PDF_RENDER_MAX_PENDING", "32"))
+    PDF_RENDER_TIMEOUT_SECONDS: float = float(os.getenv("PDF_RENDER_TIMEOUT_SECONDS", "60"))
+    PDF_STORAGE_DIR: str = os.getenv("PDF_STORAGE_DIR", "generated_contracts")
+    PDF_STORAGE_BUDGET_BYTES: int = int(os.getenv("PDF_STORAGE_BUDGET_BYTES", str(1024 * 1024 * 1024)))
+    PDF_MAX_AGE_DAYS: float = float(os.getenv("PDF_MAX_AGE_DAYS", "30"))
+    # Optional TTF fonts for contract PDFs; the built-in Times is used otherwise
+    PDF_FONT_PATH: str = os.getenv("PDF_FONT_PATH", "")
+    PDF_BOLD_FONT_PATH: str = os.getenv("PDF_BOLD_FONT_PATH", "")
+    # "disk" keeps rendered files in PDF_STORAGE_DIR; "memory" renders per download and streams from memory
+    PDF_STORAGE_MODE: str = os.getenv("PDF_STORAGE_MODE", "disk").lower()
+    PDF_SPILL_THRESHOLD_BYTES: int = int(os.getenv("PDF_SPILL_THRESHOLD_BYTES", str(16 * 1024 * 1024)))
+    # Fraction of in-memory renders traced with tracemalloc (tracing slows a render several times)
+    PDF_MEMORY_SAMPLE_RATE: float = float(os.getenv("PDF_MEMORY_SAMPLE_RATE", "0.05"))
+    CORRECTION_HISTORY_BUFFER_SIZE: int = int(os.getenv("CORRECTION_HISTORY_BUFFER_SIZE", "256"))
+    CORRECTION_DIFF_COMPRESSION: bool = os.getenv("CORRECTION_DIFF_COMPRESSION", "true").lower() == "true"
+    CORRECTION_DIFF_COMPRESS_MIN_BYTES: int = int(os.getenv("CORRECTION_DIFF_COMPRESS_MIN_BYTES", "512"))
+    CORRECTION_HISTORY_MAX_PAGE_SIZE: int = int(os.getenv("CORRECTION_HISTORY_MAX_PAGE_SIZE", "100"))
+    # Off by default: a general word list cannot know every party role and Indian legal or tax term
+    SPELLCHECK_ENABLED: bool = os.getenv("SPELLCHECK_ENABLED", "false").lower() == "true"
+    # 2 catches more typos but makes the in-memory index several times larger
+    SPELLCHECK_MAX_EDIT_DISTANCE: int = int(os.getenv("SPELLCHECK_MAX_EDIT_DISTANCE", "1"))
+    # Rewrite sections with defects found by draft validation (one LLM call per section)
+    DRAFT_VALIDATION_REGENERATE: bool = os.getenv("DRAFT_VALIDATION_REGENERATE", "false").lower() == "true"
+    DRAFT_VALIDATION_MAX_SECTIONS: int = int(os.getenv("DRAFT_VALIDATION_MAX_SECTIONS", "3"))
+    # "openai" translates through the LLM; "stub" tags segments locally, for tests
+    TRANSLATION_BACKEND: str = os.getenv("TRANSLATION_BACKEND", "openai").lower()
+    TRANSLATION_MEMORY_PATH: str = os.getenv("TRANSLATION_MEMORY_PATH", "translation_memory.sqlite3")
+    # Only exact memory matches are reused; fuzzy ones at or above HINT guide the translator
+    TRANSLATION_FUZZY_HINT: float = float(os.getenv("TRANSLATION_FUZZY_HINT", "0.75"))
+    TRANSLATION_BATCH_SIZE: int = int(os.getenv("TRANSLATION_BATCH_SIZE", "40"))
+    # Chat prompts hold the last CHAT_CONTEXT_TURNS turns verbatim plus a rolling summary of older ones,
+    # which is updated every CHAT_SUMMARY_BATCH_TURNS turns
+    CHAT_CONTEXT_TURNS: int = int(os.getenv("CHAT_CONTEXT_TURNS", "6"))
+    CHAT_SUMMARY_BATCH_TURNS: int = int(os.getenv("CHAT_SUMMARY_BATCH_TURNS", "4"))
+    CHAT_SUMMARY_MAX_TOKENS: int = int(os.getenv("CHAT_SUMMARY_MAX_TOKENS", "300"))
+    # Contract sections sent with each chat question; "inlegalbert" embeds them with the retriever's
+    # model, "hashing" with a local word-hashing embedder
+    CHAT_CONTRACT_SECTIONS: int = int(os.getenv("CHAT_CONTRACT_SECTIONS", "4"))
+    CHAT_CONTRACT_CHUNK_TOKENS: int = int(os.getenv("CHAT_CONTRACT_CHUNK_TOKENS", "400"))
+    CHAT_EMBEDDING_BACKEND: str = os.getenv("CHAT_EMBEDDING_BACKEND", "inlegalbert").lower()
+    CHAT_EMBEDDING_CACHE_SIZE: int = int(os.getenv("CHAT_EMBEDDING_CACHE_SIZE", "256"))
+    # Bearer token required to read /metrics; the endpoint is disabled while unset
+    METRICS_TOKEN: str = os.getenv("METRICS_TOKEN", "")
+    SPECULATIVE_DRAFTING: bool = os.getenv("SPECULATIVE_DRAFTING", "false").lower() == "true"
 
 settings = Settings()
@@ -0,0 +1,101 @@
+# app/core/contract_variants.py
+
+import hashlib
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.metrics import metrics
+from app.models.variant import ContractVariant
+
+
+def checksum(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def make_delta(base: str, variant: str) -> Tuple[int, int, str]:
+    """
+    ``variant`` as (prefix length, suffix length, middle) against ``base``.
+
+    Jurisdiction variants share the drafted body and differ in the clauses
+    appended to it, so the shared prefix and suffix cover nearly all of
+    the text and the middle holds just the jurisdiction-specific part.
+    """
+    limit = min(len(base), len(variant))
+    prefix = 0
+    # Compare in blocks first; str equality on slices runs at C speed
+    block = 4096
+    while prefix + block <= limit and base[prefix:prefix + block] == variant[prefix:prefix + block]:
+        prefix += block
+    while prefix < limit and base[prefix] == variant[prefix]:
+        prefix += 1
+    suffix = 0
+    limit -= prefix
+    base_end, variant_end = len(base), len(variant)
+    while (suffix + block <= limit
+           and base[base_end - suffix - block:base_end - suffix] == variant[variant_end - suffix - block:variant_end - suffix]):
+        suffix += block
+    while suffix < limit and base[base_end - 1 - suffix] == variant[variant_end - 1 - suffix]:
+        suffix += 1
+    return prefix, suffix, variant[prefix:len(variant) - suffix]
+
+
+def apply_delta(base: str, prefix: int, suffix: int, middle: str) -> str:
+    return base[:prefix] + middle + (base[len(base) - suffix:] if suffix else "")
+
+
+class ContractVariantStore:
+    """
+    Per-jurisdiction variants of a contract, stored as deltas.
+
+    The contract's content is the base; each variant row holds only the
+    text that differs from it, plus a checksum of the base it was computed
+    against. If the contract is edited afterwards the delta no longer
+    applies, and ``materialize`` returns None so the caller can customize
+    the current content again.
+    """
+
+    def record(self, db: Session, contract_id: int, base: str, variants: Dict[str, str]) -> List[ContractVariant]:
+        """Add rows for ``variants`` (jurisdiction -> text). The caller commits."""
+        base_checksum = checksum(base)
+        rows = []
+        for jurisdiction, text in variants.items():
+            prefix, suffix, middle = make_delta(base, text)
+            row = ContractVariant(
+                contract_id=contract_id,
+                jurisdiction=jurisdiction[:100],
+                prefix_length=prefix,
+                suffix_length=suffix,
+                delta=middle,
+                base_checksum=base_checksum,
+            )
+            db.add(row)
+            rows.append(row)
+            metrics.inc("contract_variant_stored_bytes_total", len(middle.encode("utf-8")))
+            metrics.inc("contract_variant_full_text_bytes_total", len(text.encode("utf-8")))
+        return rows
+
+    def list(self, db: Session, contract_id: int) -> List[ContractVariant]:
+        return (
+            db.query(ContractVariant)
+            .filter(ContractVariant.contract_id == contract_id)
+            .order_by(ContractVariant.id)
+            .all()
+        )
+
+    def get(self, db: Session, contract_id: int, jurisdiction: str) -> Optional[ContractVariant]:
+        return (
+            db.query(ContractVariant)
+            .filter(ContractVariant.contract_id == contract_id, ContractVariant.jurisdiction == jurisdiction)
+            .first()
+        )
+
+    def materialize(self, base: str, row: ContractVariant) -> Optional[str]:
+        """Full text of the variant, or None if ``base`` changed since it was stored."""
+        if row.base_checksum != checksum(base):
+            return None
+        return apply_delta(base, row.prefix_length, row.suffix_length, row.delta)
+
+
+# Create a single instance to be imported by other modules
+contract_variants = ContractVariantStore()
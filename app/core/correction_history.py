@@ -0,0 +1,138 @@
+# app/core/correction_history.py
+
+import difflib
+import threading
+import zlib
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.models.correction import ContractCorrection
+
+
+def _diff_lines(text: str) -> List[str]:
+    lines = text.splitlines(keepends=True)
+    if lines and not lines[-1].endswith("\n"):
+        # Section bodies are stored stripped, so a missing final newline is not a change
+        lines[-1] += "\n"
+    return lines
+
+
+def encode_diff(original: str, corrected: str, compress: bool, min_compress_bytes: int) -> Tuple[bytes, bool]:
+    """
+    Unified diff from ``original`` to ``corrected``, as stored bytes.
+
+    The diff is zlib-compressed when ``compress`` is set, it is at least
+    ``min_compress_bytes`` long and compression makes it smaller. Returns
+    the bytes and whether they are compressed.
+    """
+    diff = "".join(difflib.unified_diff(
+        _diff_lines(original),
+        _diff_lines(corrected),
+        fromfile="original",
+        tofile="corrected",
+    ))
+    raw = diff.encode("utf-8")
+    if compress and len(raw) >= min_compress_bytes:
+        packed = zlib.compress(raw, 6)
+        if len(packed) < len(raw):
+            return packed, True
+    return raw, False
+
+
+def decode_diff(data: bytes, compressed: bool) -> str:
+    return (zlib.decompress(data) if compressed else data).decode("utf-8")
+
+
+class CorrectionHistory:
+    """
+    Correction history of contracts, kept in the database.
+
+    Each correction is stored as a unified diff rather than two full copies
+    of the section, optionally compressed. Pages are read newest first with
+    a keyset cursor, so deep pages cost the same as the first.
+
+    The last ``buffer_size`` corrections recorded by this process are also
+    kept in a ring buffer for cheap in-process access; the database remains
+    the source of truth.
+    """
+
+    def __init__(self, buffer_size: int, compress: bool, min_compress_bytes: int, max_page_size: int):
+        self.compress = compress
+        self.min_compress_bytes = min_compress_bytes
+        self.max_page_size = max_page_size
+        self._recent: Deque[Dict] = deque(maxlen=max(buffer_size, 0))
+        self._lock = threading.Lock()
+
+    def record(self, db: Session, contract_id: int, user_id: Optional[int], corrections: Iterable) -> List[ContractCorrection]:
+        """
+        Add rows for ``corrections`` (CorrectionAgent Correction objects) to
+        the session. The caller commits, together with the contract update.
+        """
+        rows = []
+        for correction in corrections:
+            diff, compressed = encode_diff(
+                correction.original_text, correction.corrected_text, self.compress, self.min_compress_bytes
+            )
+            row = ContractCorrection(
+                contract_id=contract_id,
+                user_id=user_id,
+                correction_id=correction.correction_id,
+                section=correction.section[:255],
+                reason=correction.reason,
+                diff=diff,
+                compressed=compressed,
+            )
+            db.add(row)
+            rows.append(row)
+
+            full_size = len(correction.original_text.encode("utf-8")) + len(correction.corrected_text.encode("utf-8"))
+            metrics.inc("correction_history_stored_bytes_total", len(diff))
+            metrics.inc("correction_history_full_text_bytes_total", full_size)
+            with self._lock:
+                self._recent.append({
+                    "contract_id": contract_id,
+                    "correction_id": correction.correction_id,
+                    "section": correction.section,
+                    "reason": correction.reason,
+                    "timestamp": correction.timestamp,
+                })
+        return rows
+
+    def page(
+        self,
+        db: Session,
+        contract_id: int,
+        limit: int = 20,
+        before_id: Optional[int] = None
+    ) -> Tuple[List[ContractCorrection], Optional[int]]:
+        """
+        Corrections of a contract, newest first. Returns the rows and the
+        cursor for the next page (None on the last page).
+        """
+        limit = max(1, min(limit, self.max_page_size))
+        query = db.query(ContractCorrection).filter(ContractCorrection.contract_id == contract_id)
+        if before_id is not None:
+            query = query.filter(ContractCorrection.id < before_id)
+        rows = query.order_by(ContractCorrection.id.desc()).limit(limit + 1).all()
+        next_cursor = rows[limit - 1].id if len(rows) > limit else None
+        return rows[:limit], next_cursor
+
+    def recent(self, contract_id: Optional[int] = None, limit: Optional[int] = None) -> List[Dict]:
+        """Corrections recorded by this process, newest first."""
+        with self._lock:
+            entries = [entry for entry in reversed(self._recent)
+                       if contract_id is None or entry["contract_id"] == contract_id]
+        return entries[:limit] if limit is not None else entries
+
+
+# Create a single instance to be imported by other modules
+correction_history = CorrectionHistory(
+    buffer_size=settings.CORRECTION_HISTORY_BUFFER_SIZE,
+    compress=settings.CORRECTION_DIFF_COMPRESSION,
+    min_compress_bytes=settings.CORRECTION_DIFF_COMPRESS_MIN_BYTES,
+    max_page_size=settings.CORRECTION_HISTORY_MAX_PAGE_SIZE,
+)
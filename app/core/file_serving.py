@@ -0,0 +1,189 @@
+# app/core/file_serving.py
+
+import os
+from typing import Dict, Iterator, Optional, Tuple
+
+import anyio
+from starlette.requests import Request
+from starlette.background import BackgroundTask
+from starlette.responses import FileResponse, Response, StreamingResponse
+
+
+DEFAULT_CACHE_CONTROL = "private, no-cache"
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def client_has_current(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match already names ``etag``."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [value.strip() for value in header.split(",")]
+    # Weak comparison is allowed for If-None-Match
+    return etag in candidates or f"W/{etag}" in candidates
+
+
+def not_modified_response(etag: str, cache_control: str = DEFAULT_CACHE_CONTROL) -> Response:
+    return Response(status_code=304, headers={"etag": etag, "cache-control": cache_control})
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single ``bytes=`` range into inclusive (start, end).
+
+    Returns None when the range cannot be satisfied. Raises ValueError for
+    headers we do not handle (other units, multiple ranges), in which case
+    the whole file is served.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        raise ValueError("Unsupported range")
+    start_text, _, end_text = spec.strip().partition("-")
+    if not start_text:
+        # Suffix range: the last N bytes
+        length = int(end_text)
+        if length <= 0:
+            return None
+        return max(size - length, 0), size - 1
+    start = int(start_text)
+    end = int(end_text) if end_text else size - 1
+    if start >= size or end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+class FileRangeResponse(Response):
+    """Stream one byte range of a file as a 206 Partial Content response."""
+
+    chunk_size = STREAM_CHUNK_SIZE
+
+    def __init__(self, path: str, start: int, end: int, size: int, headers: Dict[str, str], media_type: str):
+        headers = dict(headers)
+        headers["content-range"] = f"bytes {start}-{end}/{size}"
+        headers["content-length"] = str(end - start + 1)
+        super().__init__(status_code=206, headers=headers, media_type=media_type)
+        self.path = path
+        self.start = start
+        self.end = end
+
+    async def __call__(self, scope, receive, send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if scope.get("method") == "HEAD":
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        else:
+            await self._send_range(send)
+        if self.background is not None:
+            await self.background()
+
+    async def _send_range(self, send) -> None:
+        remaining = self.end - self.start + 1
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await file.seek(self.start)
+            while remaining > 0:
+                chunk = await file.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+        if remaining > 0:
+            # File shrank underneath us; close the body
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+def conditional_file_response(
+    request: Request,
+    path: str,
+    etag: str,
+    media_type: str,
+    filename: Optional[str] = None,
+    cache_control: str = DEFAULT_CACHE_CONTROL,
+) -> Response:
+    """
+    Serve ``path`` honouring If-None-Match, Range and If-Range.
+
+    ``etag`` must be a quoted strong validator that changes whenever the
+    file contents change; with the default ``private, no-cache`` policy
+    browsers keep the file but revalidate, getting a 304 when unchanged.
+    Whole-file responses go through Starlette's FileResponse, which hands
+    the path to the server (zero-copy) when it supports the ASGI pathsend
+    extension.
+    """
+    if client_has_current(request, etag):
+        return not_modified_response(etag, cache_control)
+    headers = {"etag": etag, "cache-control": cache_control, "accept-ranges": "bytes"}
+
+    stat_result = os.stat(path)
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (if_range is None or if_range.strip() == etag):
+        try:
+            byte_range = _parse_range(range_header, stat_result.st_size)
+        except ValueError:
+            byte_range = (0, stat_result.st_size - 1)
+        if byte_range is None:
+            headers["content-range"] = f"bytes */{stat_result.st_size}"
+            return Response(status_code=416, headers=headers)
+        if byte_range != (0, stat_result.st_size - 1):
+            if filename:
+                headers["content-disposition"] = f'attachment; filename="{filename}"'
+            return FileRangeResponse(path, *byte_range, stat_result.st_size, headers, media_type)
+
+    return FileResponse(
+        path,
+        media_type=media_type,
+        filename=filename,
+        headers=headers,
+        stat_result=stat_result,
+    )
+
+
+def _iter_bytes(data: bytes) -> Iterator[bytes]:
+    for start in range(0, len(data), STREAM_CHUNK_SIZE):
+        yield data[start:start + STREAM_CHUNK_SIZE]
+
+
+def _iter_file(path: str) -> Iterator[bytes]:
+    with open(path, "rb") as file:
+        while True:
+            chunk = file.read(STREAM_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def streamed_download_response(
+    etag: str,
+    media_type: str,
+    size: int,
+    data: Optional[bytes] = None,
+    spill_path: Optional[str] = None,
+    filename: Optional[str] = None,
+    cache_control: str = DEFAULT_CACHE_CONTROL,
+) -> Response:
+    """
+    Stream a rendered document held in memory (``data``) or in a temporary
+    spill file (``spill_path``), in chunks.
+
+    The spill file is deleted once the response has been sent. Range
+    requests are not supported for documents that are not stored.
+    """
+    headers = {"etag": etag, "cache-control": cache_control, "content-length": str(size)}
+    if filename:
+        headers["content-disposition"] = f'attachment; filename="{filename}"'
+    if spill_path is not None:
+        return StreamingResponse(
+            _iter_file(spill_path),
+            media_type=media_type,
+            headers=headers,
+            background=BackgroundTask(_remove_quietly, spill_path),
+        )
+    return StreamingResponse(_iter_bytes(data or b""), media_type=media_type, headers=headers)
@@ -0,0 +1,263 @@
+# app/core/llm_scheduler.py
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, Optional
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.metrics import metrics
+
+
+class LLMPriority(IntEnum):
+    """Priority class of an LLM call; lower values are served first."""
+    INTERACTIVE = 0  # chat replies a user is waiting on
+    BATCH = 1        # contract drafting
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Recognise provider 429s across openai client versions."""
+    status_code = getattr(error, "status_code", None) or getattr(error, "http_status", None)
+    return status_code == 429 or type(error).__name__ == "RateLimitError"
+
+
+class LLMCallCancelled(Exception):
+    """Raised instead of (or part way through) an LLM call whose result is no longer wanted."""
+
+
+class _Ticket:
+    __slots__ = ("user_key", "priority", "enqueued_at", "granted")
+
+    def __init__(self, user_key: str, priority: LLMPriority):
+        self.user_key = user_key
+        self.priority = priority
+        self.enqueued_at = time.monotonic()
+        self.granted = False
+
+
+class _PriorityQueue:
+    """Per-user FIFOs served in weighted round-robin order."""
+
+    def __init__(self):
+        self.users: Dict[str, Deque[_Ticket]] = {}
+        self.ring: Deque[str] = deque()
+        self.credits: Dict[str, float] = {}
+
+    def push(self, ticket: _Ticket) -> None:
+        queue = self.users.get(ticket.user_key)
+        if queue is None:
+            queue = self.users[ticket.user_key] = deque()
+            self.ring.append(ticket.user_key)
+            self.credits[ticket.user_key] = 0.0
+        queue.append(ticket)
+
+    def pop(self, weights: Dict[str, float]) -> _Ticket:
+        while True:
+            user_key = self.ring[0]
+            if self.credits[user_key] < 1:
+                # Out of turns: top up and move to the back of the ring
+                self.credits[user_key] += weights.get(user_key, 1.0)
+                if self.credits[user_key] < 1:
+                    self.ring.rotate(-1)
+                    continue
+            queue = self.users[user_key]
+            ticket = queue.popleft()
+            self.credits[user_key] -= 1
+            if not queue:
+                del self.users[user_key]
+                del self.credits[user_key]
+                self.ring.popleft()
+            elif self.credits[user_key] < 1:
+                self.ring.rotate(-1)
+            return ticket
+
+    def __len__(self) -> int:
+        return sum(len(queue) for queue in self.users.values())
+
+
+class FairLLMScheduler:
+    """
+    Admission control in front of every LLM call.
+
+    Waiting calls are grouped by priority class and, within a class, served
+    in weighted round-robin order across users, so one user submitting many
+    drafts cannot monopolise the provider quota. Interactive calls are
+    preferred over batch calls ``interactive_share`` to one while both are
+    waiting, which keeps batch work from starving entirely.
+
+    The number of calls in flight is capped by an AIMD window: each success
+    grows it by ``1/window`` up to ``max_in_flight``; a 429 from the
+    provider halves it (at most once per ``backoff_interval`` seconds).
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int,
+        interactive_share: int = 4,
+        min_in_flight: int = 1,
+        backoff_interval: float = 1.0,
+    ):
+        self.max_in_flight = max_in_flight
+        self.min_in_flight = min_in_flight
+        self.interactive_share = interactive_share
+        self.backoff_interval = backoff_interval
+        self.user_weights: Dict[str, float] = {}
+        self._cond = threading.Condition()
+        self._window = float(max_in_flight)
+        self._in_flight = 0
+        self._interactive_streak = 0
+        self._last_backoff = 0.0
+        self._queues = {priority: _PriorityQueue() for priority in LLMPriority}
+        self._publish()
+
+    def set_weight(self, user_key: str, weight: float) -> None:
+        """Give ``user_key`` ``weight`` turns per round (default 1)."""
+        if weight <= 0:
+            raise ValueError("LLM scheduling weight must be positive")
+        with self._cond:
+            self.user_weights[user_key] = weight
+
+    @contextmanager
+    def slot(self, user_key: Optional[str], priority: LLMPriority = LLMPriority.BATCH):
+        """Block until a call for ``user_key`` may proceed, then hold the slot."""
+        ticket = _Ticket(user_key or "anonymous", priority)
+        with self._cond:
+            self._queues[priority].push(ticket)
+            self._dispatch()
+            while not ticket.granted:
+                self._cond.wait()
+        wait = time.monotonic() - ticket.enqueued_at
+        # Labelled by priority only: user ids do not belong in exported metrics
+        metrics.observe("llm_queue_wait_seconds", wait, {"priority": priority.name.lower()})
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._in_flight -= 1
+                self._dispatch()
+
+    def call(
+        self,
+        user_key: Optional[str],
+        priority: LLMPriority,
+        fn: Callable[..., Any],
+        *args,
+        cancel: Optional[threading.Event] = None,
+        **kwargs
+    ) -> Any:
+        """
+        Run ``fn`` inside a slot and feed the outcome into the AIMD window.
+
+        If ``cancel`` is set by the time the slot is granted, ``fn`` is not
+        called and ``LLMCallCancelled`` is raised.
+        """
+        with self.slot(user_key, priority):
+            if cancel is not None and cancel.is_set():
+                raise LLMCallCancelled()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                if is_rate_limit_error(e):
+                    self._on_rate_limited()
+                raise
+            self._on_success()
+            return result
+
+    def stream(
+        self,
+        user_key: Optional[str],
+        priority: LLMPriority,
+        fn: Callable[..., Iterable[Any]],
+        *args,
+        cancel: Optional[threading.Event] = None,
+        **kwargs
+    ) -> Iterator[Any]:
+        """
+        Like ``call`` for a streaming ``fn``: yields its chunks, holding the
+        slot until the stream is exhausted or the generator is closed (e.g.
+        because the client disconnected). Setting ``cancel`` closes the
+        provider's stream at the next chunk and raises ``LLMCallCancelled``.
+        """
+        with self.slot(user_key, priority):
+            if cancel is not None and cancel.is_set():
+                raise LLMCallCancelled()
+            chunks = None
+            try:
+                chunks = fn(*args, **kwargs)
+                for chunk in chunks:
+                    if cancel is not None and cancel.is_set():
+                        raise LLMCallCancelled()
+                    yield chunk
+            except Exception as e:
+                if is_rate_limit_error(e):
+                    self._on_rate_limited()
+                raise
+            finally:
+                # Stop reading the provider's response when abandoned early
+                close = getattr(chunks, "close", None)
+                if close is not None:
+                    close()
+            self._on_success()
+
+    def _on_success(self) -> None:
+        with self._cond:
+            self._window = min(self.max_in_flight, self._window + 1.0 / self._window)
+            self._dispatch()
+
+    def _on_rate_limited(self) -> None:
+        with self._cond:
+            now = time.monotonic()
+            if now - self._last_backoff < self.backoff_interval:
+                return
+            self._last_backoff = now
+            self._window = max(self.min_in_flight, self._window / 2)
+            metrics.inc("llm_rate_limited_total")
+            logger.warning(f"LLM provider returned 429; concurrency window reduced to {self._window:.1f}")
+            self._publish()
+
+    def _next_priority(self) -> Optional[LLMPriority]:
+        interactive = len(self._queues[LLMPriority.INTERACTIVE]) > 0
+        batch = len(self._queues[LLMPriority.BATCH]) > 0
+        if interactive and batch:
+            if self._interactive_streak >= self.interactive_share:
+                self._interactive_streak = 0
+                return LLMPriority.BATCH
+            self._interactive_streak += 1
+            return LLMPriority.INTERACTIVE
+        if interactive:
+            return LLMPriority.INTERACTIVE
+        if batch:
+            self._interactive_streak = 0
+            return LLMPriority.BATCH
+        return None
+
+    def _dispatch(self) -> None:
+        # Called with self._cond held
+        granted = False
+        while self._in_flight < int(self._window):
+            priority = self._next_priority()
+            if priority is None:
+                break
+            ticket = self._queues[priority].pop(self.user_weights)
+            ticket.granted = True
+            self._in_flight += 1
+            granted = True
+        if granted:
+            self._cond.notify_all()
+        self._publish()
+
+    def _publish(self) -> None:
+        metrics.set_gauge("llm_concurrency_window", self._window)
+        metrics.set_gauge("llm_in_flight", self._in_flight)
+        for priority, queue in self._queues.items():
+            metrics.set_gauge("llm_queue_depth", len(queue), {"priority": priority.name.lower()})
+
+
+# Create a single instance to be imported by other modules
+llm_scheduler = FairLLMScheduler(
+    max_in_flight=settings.LLM_MAX_IN_FLIGHT,
+    interactive_share=settings.LLM_INTERACTIVE_SHARE,
+)
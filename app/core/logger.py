@@ -3,8 +3,9 @@ import sys
 import os
 
 # Create logs directory if it doesn't exist
-if not os.path.exists('logs'):
-    os.makedirs('logs')
+LOG_DIR = os.getenv("LOG_DIR", "logs")
+if not os.path.exists(LOG_DIR):
+    os.makedirs(LOG_DIR)
 
 # Create a custom logger
 logger = logging.getLogger("themis_logger")
@@ -12,7 +13,7 @@ logger.setLevel(logging.INFO)
 
 # Define handlers
 c_handler = logging.StreamHandler(sys.stdout)
-f_handler = logging.FileHandler('logs/themis.log')
+f_handler = logging.FileHandler(os.path.join(LOG_DIR, 'themis.log'))
 c_handler.setLevel(logging.INFO)
 f_handler.setLevel(logging.INFO)
 
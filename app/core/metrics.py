@@ -0,0 +1,83 @@
+# app/core/metrics.py
+
+import threading
+from typing import Dict, Optional, Tuple
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Optional[Dict[str, str]]) -> LabelKey:
+    return tuple(sorted((labels or {}).items()))
+
+
+class MetricsRegistry:
+    """
+    Minimal in-process metrics registry.
+
+    Supports counters, gauges and summaries (count/sum/min/max) with
+    optional labels. Everything is guarded by one lock so it can be updated
+    from request threads and executor workers alike.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._summaries: Dict[str, Dict[LabelKey, Dict[str, float]]] = {}
+
+    def inc(self, name: str, amount: float = 1.0, labels: Optional[Dict[str, str]] = None) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + amount
+
+    def set_gauge(self, name: str, value: float, labels: Optional[Dict[str, str]] = None) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._gauges.setdefault(name, {})[key] = value
+
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, str]] = None) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._summaries.setdefault(name, {})
+            summary = series.get(key)
+            if summary is None:
+                series[key] = {"count": 1, "sum": value, "min": value, "max": value}
+            else:
+                summary["count"] += 1
+                summary["sum"] += value
+                summary["min"] = min(summary["min"], value)
+                summary["max"] = max(summary["max"], value)
+
+    def get_counter(self, name: str, labels: Optional[Dict[str, str]] = None) -> float:
+        with self._lock:
+            return self._counters.get(name, {}).get(_label_key(labels), 0.0)
+
+    def snapshot(self) -> Dict:
+        """Return a JSON-serializable copy of all metrics."""
+        def render(series):
+            return [
+                {"labels": dict(key), "value": value}
+                for key, value in series.items()
+            ]
+
+        with self._lock:
+            return {
+                "counters": {name: render(series) for name, series in self._counters.items()},
+                "gauges": {name: render(series) for name, series in self._gauges.items()},
+                "summaries": {
+                    name: [
+                        {
+                            "labels": dict(key),
+                            **summary,
+                            "avg": summary["sum"] / summary["count"],
+                        }
+                        for key, summary in series.items()
+                    ]
+                    for name, series in self._summaries.items()
+                },
+            }
+
+
+# Create a single instance to be imported by other modules
+metrics = MetricsRegistry()
@@ -1,28 +1,110 @@
+from typing import Iterator
+
 import openai
 from app.core.config import settings
+from app.core.llm_scheduler import llm_scheduler, LLMPriority
 
 openai.api_key = settings.OPENAI_API_KEY
 
-def generate_chat_response(prompt: str, conversation_history: list) -> str:
+SYSTEM_PROMPT = "You are a helpful legal assistant specialized in contract law."
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for English text (about four characters per token)."""
+    return (len(text) + 3) // 4
+
+def _chat_messages(prompt: str, conversation_history: list, summary: str = None, contract_excerpt: str = None) -> list:
+    """
+    Chat API messages for ``prompt`` following ``conversation_history``,
+    preceded by ``summary`` of the conversation before that history and by
+    ``contract_excerpt``, the sections of the contract relevant to ``prompt``.
+    """
+    messages = [{"role": "system", "content": SYSTEM_PROMPT}]
+    if contract_excerpt:
+        messages.append({
+            "role": "system",
+            "content": f"Relevant sections of the contract under discussion:\n\n{contract_excerpt}"
+        })
+    if summary:
+        messages.append({"role": "system", "content": f"Summary of the earlier conversation:\n{summary}"})
+    for msg in conversation_history:
+        role = "user" if msg["sender"] == "user" else "assistant"
+        messages.append({"role": role, "content": msg["content"]})
+    messages.append({"role": "user", "content": prompt})
+    return messages
+
+def generate_chat_response(
+    prompt: str, conversation_history: list, user_key: str = None, summary: str = None, contract_excerpt: str = None
+) -> str:
     """
     Generate a response from OpenAI's GPT model based on the prompt and conversation history.
+    The call is queued as interactive work for ``user_key`` in the LLM scheduler.
     """
     try:
-        # Prepare messages for Chat API
-        messages = [
-            {"role": "system", "content": "You are a helpful legal assistant specialized in contract law."}
-        ]
-        for msg in conversation_history:
-            role = "user" if msg["sender"] == "user" else "assistant"
-            messages.append({"role": role, "content": msg["content"]})
-        messages.append({"role": "user", "content": prompt})
-
-        response = openai.ChatCompletion.create(
+        response = llm_scheduler.call(
+            user_key,
+            LLMPriority.INTERACTIVE,
+            openai.ChatCompletion.create,
             model=settings.OPENAI_MODEL,
-            messages=messages,
+            messages=_chat_messages(prompt, conversation_history, summary, contract_excerpt),
             max_tokens=500,
             temperature=0.7,
         )
         return response.choices[0].message['content'].strip()
     except Exception as e:
         return f"Error generating response: {str(e)}"
+
+def stream_chat_response(
+    prompt: str, conversation_history: list, user_key: str = None, summary: str = None, contract_excerpt: str = None
+) -> Iterator[str]:
+    """
+    Like ``generate_chat_response``, but yields the response text piece by
+    piece as the model generates it. Errors are raised rather than returned
+    as text. Closing the generator ends the request and frees its LLM
+    scheduler slot.
+    """
+    chunks = llm_scheduler.stream(
+        user_key,
+        LLMPriority.INTERACTIVE,
+        openai.ChatCompletion.create,
+        model=settings.OPENAI_MODEL,
+        messages=_chat_messages(prompt, conversation_history, summary, contract_excerpt),
+        max_tokens=500,
+        temperature=0.7,
+        stream=True,
+    )
+    try:
+        for chunk in chunks:
+            delta = chunk.choices[0].delta
+            content = delta.get("content") if isinstance(delta, dict) else getattr(delta, "content", None)
+            if content:
+                yield content
+    finally:
+        chunks.close()
+
+def summarize_conversation(previous_summary: str, messages: list, user_key: str = None, max_tokens: int = 300) -> str:
+    """
+    Fold ``messages`` into ``previous_summary`` and return the new summary.
+    Errors are raised; the caller keeps the previous summary.
+    """
+    transcript = "\n".join(
+        f"{'User' if msg['sender'] == 'user' else 'Assistant'}: {msg['content']}" for msg in messages
+    )
+    prompt = (
+        "Update the summary of a conversation between a user and a legal assistant about a contract. "
+        "Keep the facts, decisions, clause references, open questions and user preferences needed to "
+        f"continue the conversation, in at most {max_tokens * 3 // 4} words.\n\n"
+        f"Current summary:\n{previous_summary or '(none)'}\n\nNew messages:\n{transcript}"
+    )
+    response = llm_scheduler.call(
+        user_key,
+        LLMPriority.INTERACTIVE,
+        openai.ChatCompletion.create,
+        model=settings.OPENAI_MODEL,
+        messages=[
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ],
+        max_tokens=max_tokens,
+        temperature=0.2,
+    )
+    return response.choices[0].message['content'].strip()
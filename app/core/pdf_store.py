@@ -0,0 +1,182 @@
+# app/core/pdf_store.py
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.metrics import metrics
+
+
+class PdfStore:
+    """
+    Content-addressed storage for rendered contracts.
+
+    A document is stored under the SHA-256 of its render settings and text,
+    as ``<root>/<first two hex chars>/<hash><suffix>``, so identical contracts
+    are rendered and stored once and concurrent renders never overwrite
+    each other's files. PDFs and the other export formats share the store
+    and its budget; each format has its own render settings and therefore
+    its own keys.
+
+    Retention: files unused for longest are evicted first whenever the store
+    exceeds ``budget_bytes``, and files older than ``max_age_seconds`` are
+    removed regardless of use. Files pinned with ``pin`` (being rendered
+    for, or served to, a waiting client) are never evicted until unpinned.
+    Bookkeeping is kept in memory and rebuilt from the directory at
+    start-up.
+    """
+
+    SUFFIX = ".pdf"
+
+    def __init__(self, root: str, budget_bytes: int, max_age_seconds: float):
+        self.root = root
+        self.budget_bytes = budget_bytes
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        # key -> (size in bytes, created at, suffix); ordered from least to most recently used
+        self._index: "OrderedDict[str, Tuple[int, float, str]]" = OrderedDict()
+        # key -> number of requests still to serve it
+        self._pins: Dict[str, int] = {}
+        self._total_bytes = 0
+        self._evicted = 0
+        os.makedirs(self.root, exist_ok=True)
+        self._scan()
+
+    @staticmethod
+    def key_for(content: str, render_settings: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(render_settings.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(content.encode("utf-8"))
+        return digest.hexdigest()
+
+    def path_for(self, key: str, suffix: str = SUFFIX) -> str:
+        return os.path.join(self.root, key[:2], key + suffix)
+
+    def lookup(self, key: str) -> Optional[str]:
+        """Return the stored path for ``key`` and mark it as recently used."""
+        with self._lock:
+            if key not in self._index:
+                metrics.inc("pdf_store_lookups_total", labels={"result": "miss"})
+                return None
+            self._index.move_to_end(key)
+            suffix = self._index[key][2]
+        path = self.path_for(key, suffix)
+        if not os.path.exists(path):
+            # Removed behind our back; forget it
+            with self._lock:
+                self._forget(key)
+            metrics.inc("pdf_store_lookups_total", labels={"result": "miss"})
+            return None
+        metrics.inc("pdf_store_lookups_total", labels={"result": "hit"})
+        return path
+
+    def register(self, key: str, suffix: str = SUFFIX) -> None:
+        """Record a file newly written at ``path_for(key, suffix)`` and apply retention."""
+        path = self.path_for(key, suffix)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            logger.warning(f"Rendered file for {key} is missing; not registering it")
+            return
+        with self._lock:
+            self._forget(key)
+            self._index[key] = (stat.st_size, stat.st_mtime, suffix)
+            self._total_bytes += stat.st_size
+        self.enforce_retention()
+
+    def pin(self, key: str) -> None:
+        """Keep ``key`` from being evicted until a matching ``unpin``."""
+        with self._lock:
+            self._pins[key] = self._pins.get(key, 0) + 1
+
+    def unpin(self, key: str) -> None:
+        with self._lock:
+            count = self._pins.get(key, 0) - 1
+            if count > 0:
+                self._pins[key] = count
+            else:
+                self._pins.pop(key, None)
+
+    def enforce_retention(self) -> int:
+        """Evict expired and least recently used unpinned files; return how many were removed."""
+        now = time.time()
+        victims = []
+        with self._lock:
+            for key, (_, created_at, suffix) in self._index.items():
+                if now - created_at > self.max_age_seconds and key not in self._pins:
+                    victims.append((key, suffix))
+            for key, _ in victims:
+                self._forget(key)
+            # Least recently used first
+            for key in list(self._index):
+                if self._total_bytes <= self.budget_bytes:
+                    break
+                if key in self._pins:
+                    continue
+                victims.append((key, self._index[key][2]))
+                self._forget(key)
+            self._evicted += len(victims)
+            self._publish()
+
+        for key, suffix in victims:
+            try:
+                os.remove(self.path_for(key, suffix))
+            except FileNotFoundError:
+                pass
+        if victims:
+            logger.info(f"PDF store evicted {len(victims)} files")
+        return len(victims)
+
+    def usage(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "files": len(self._index),
+                "bytes": self._total_bytes,
+                "budget_bytes": self.budget_bytes,
+                "evicted": self._evicted,
+            }
+
+    def _forget(self, key: str) -> None:
+        # Called with self._lock held
+        entry = self._index.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry[0]
+
+    def _publish(self) -> None:
+        # Called with self._lock held
+        metrics.set_gauge("pdf_store_bytes", self._total_bytes)
+        metrics.set_gauge("pdf_store_files", len(self._index))
+        metrics.set_gauge("pdf_store_budget_bytes", self.budget_bytes)
+
+    def _scan(self) -> None:
+        entries = []
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                key, dot, extension = filename.partition(".")
+                # Skip temporary files (<key><suffix>.<pid>.<thread>.tmp) and
+                # anything not laid out by path_for
+                if not dot or "." in extension or extension == "tmp":
+                    continue
+                if len(key) != 64 or os.path.basename(dirpath) != key[:2]:
+                    continue
+                stat = os.stat(os.path.join(dirpath, filename))
+                # Access time approximates recency where the filesystem tracks it
+                entries.append((stat.st_atime, key, stat.st_size, stat.st_mtime, dot + extension))
+        for _, key, size, created_at, suffix in sorted(entries):
+            self._index[key] = (size, created_at, suffix)
+            self._total_bytes += size
+        self._publish()
+
+
+# Create a single instance to be imported by other modules
+pdf_store = PdfStore(
+    root=settings.PDF_STORAGE_DIR,
+    budget_bytes=settings.PDF_STORAGE_BUDGET_BYTES,
+    max_age_seconds=settings.PDF_MAX_AGE_DAYS * 86400,
+)
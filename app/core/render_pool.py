@@ -0,0 +1,193 @@
+# app/core/render_pool.py
+
+import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.metrics import metrics
+
+
+class RenderQueueFull(Exception):
+    """Raised when the render pool already holds its maximum backlog."""
+
+
+class RenderJob:
+    """Status of one background render."""
+    __slots__ = ("status", "result", "error", "task")
+
+    PENDING = "pending"
+    READY = "ready"
+    FAILED = "failed"
+
+    def __init__(self):
+        self.status = self.PENDING
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.task: Optional[asyncio.Task] = None
+
+
+class RenderPool:
+    """
+    Process pool for document rendering with an async API.
+
+    Rendering (reportlab layout) is CPU-bound and holds the GIL, so it runs
+    in worker processes instead of request threads. At most ``max_pending``
+    renders may be queued or running; further submissions raise
+    :class:`RenderQueueFull`. Each render is given ``timeout`` seconds; a
+    render that overruns is reported as failed, but its worker process
+    still finishes the document, so its slot stays taken until then and
+    ``max_pending`` bounds the work the workers actually hold.
+
+    Render functions must be importable top-level callables returning a
+    dict with ``seconds`` and, for paginated output, ``pages`` so time per
+    page can be recorded. An optional ``format`` labels the timings.
+    """
+
+    def __init__(self, workers: int, max_pending: int, timeout: float, max_jobs: int = 10000):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.max_jobs = max_jobs
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._jobs: "OrderedDict[Hashable, RenderJob]" = OrderedDict()
+        self._tasks = set()
+
+    async def render(self, fn: Callable[..., Dict], *args) -> Dict:
+        """Render in a worker process and return the worker's result."""
+        self._acquire()
+        return await self._run(fn, *args)
+
+    def submit(
+        self,
+        job_id: Hashable,
+        fn: Callable[..., Dict],
+        *args,
+        on_ready: Optional[Callable[[Dict], None]] = None
+    ) -> RenderJob:
+        """
+        Start a render in the background and track it under ``job_id``.
+
+        Must be called from the event loop. Raises :class:`RenderQueueFull`
+        straight away when there is no room; otherwise the returned job is
+        updated in place when the render finishes, after ``on_ready`` has
+        been called with the worker's result in a worker thread. A job still pending under the
+        same id is returned as-is instead of rendering twice.
+        """
+        existing = self.job(job_id)
+        if existing is not None and existing.status == RenderJob.PENDING:
+            return existing
+        self._acquire()
+        job = RenderJob()
+        with self._lock:
+            self._jobs[job_id] = job
+            self._jobs.move_to_end(job_id)
+            while len(self._jobs) > self.max_jobs:
+                self._jobs.popitem(last=False)
+
+        async def run():
+            try:
+                result = await self._run(fn, *args)
+                if on_ready is not None:
+                    # Callbacks touch the filesystem, so they run off the event loop
+                    await run_in_threadpool(on_ready, result)
+                job.result = result
+                job.status = RenderJob.READY
+            except asyncio.TimeoutError:
+                job.error = f"Rendering took longer than {self.timeout}s"
+                job.status = RenderJob.FAILED
+            except Exception as e:
+                job.error = str(e)
+                job.status = RenderJob.FAILED
+            if job.status == RenderJob.FAILED:
+                logger.error(f"Background render {job_id} failed: {job.error}")
+
+        task = job.task = asyncio.get_running_loop().create_task(run())
+        # Keep a reference so the task is not garbage collected mid-flight
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    async def ensure(
+        self,
+        job_id: Hashable,
+        fn: Callable[..., Dict],
+        *args,
+        on_ready: Optional[Callable[[Dict], None]] = None
+    ) -> RenderJob:
+        """Like :meth:`submit`, but wait for the render to finish."""
+        job = self.submit(job_id, fn, *args, on_ready=on_ready)
+        # Shield so one impatient caller cannot cancel a render others share
+        await asyncio.shield(job.task)
+        return job
+
+    def _acquire(self) -> None:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                metrics.inc("pdf_render_rejected_total")
+                raise RenderQueueFull(f"Render queue is full ({self.max_pending} pending)")
+            self._pending += 1
+            metrics.set_gauge("pdf_render_pending", self._pending)
+
+    def _release(self, *_) -> None:
+        with self._lock:
+            self._pending -= 1
+            metrics.set_gauge("pdf_render_pending", self._pending)
+
+    async def _run(self, fn: Callable[..., Dict], *args) -> Dict:
+        # Releases the slot taken by _acquire once the worker is done with
+        # the render, which may be after the caller has given up on it
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        try:
+            # A render still queued is cancelled on timeout; a running one cannot be
+            result = await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            metrics.inc("pdf_render_timeouts_total")
+            raise
+
+        labels = {"format": result.get("format", "pdf")}
+        metrics.observe("pdf_render_seconds", result["seconds"], labels=labels)
+        if result.get("pages"):
+            metrics.observe("pdf_render_seconds_per_page", result["seconds"] / result["pages"], labels=labels)
+        if result.get("size") is not None:
+            metrics.observe("pdf_render_output_bytes", result["size"], labels=labels)
+        if result.get("buffered_bytes") is not None:
+            metrics.observe("pdf_render_buffered_bytes", result["buffered_bytes"], labels=labels)
+        if result.get("peak_memory_bytes") is not None:
+            metrics.observe("pdf_render_peak_memory_bytes", result["peak_memory_bytes"], labels=labels)
+        return result
+
+    def job(self, job_id: Hashable) -> Optional[RenderJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Created lazily so importing this module does not fork workers
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+
+# Create a single instance to be imported by other modules
+pdf_render_pool = RenderPool(
+    workers=settings.PDF_RENDER_WORKERS,
+    max_pending=settings.PDF_RENDER_MAX_PENDING,
+    timeout=settings.PDF_RENDER_TIMEOUT_SECONDS,
+)
@@ -0,0 +1,116 @@
+# app/core/scheduler.py
+
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from enum import Enum
+from typing import Any, Callable, Dict
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+
+class StageClass(str, Enum):
+    """Kind of work a pipeline stage performs."""
+    CPU = "cpu"        # model inference and text processing
+    IO = "io"          # network-bound calls such as the LLM
+
+
+class StageScheduler:
+    """
+    Dispatch pipeline stages to executors sized per class of work.
+
+    Each stage class gets its own bounded pool, so a burst of one kind of
+    work (e.g. slow LLM calls) queues behind its own workers instead of
+    occupying the threads another kind (e.g. BERT inference) needs.
+    Saturation per executor is published as ``stage_executor_saturation``
+    (busy plus queued tasks over worker count).
+
+    Stages must not submit nested work to their own executor and wait on
+    it, as that can deadlock a saturated pool.
+    """
+
+    def __init__(self, pool_sizes: Dict[StageClass, int]):
+        self._lock = threading.Lock()
+        self._executors: Dict[StageClass, ThreadPoolExecutor] = {}
+        self._workers: Dict[StageClass, int] = {}
+        self._active: Dict[StageClass, int] = {}
+        self._queued: Dict[StageClass, int] = {}
+        for stage_class, size in pool_sizes.items():
+            self._executors[stage_class] = ThreadPoolExecutor(
+                max_workers=size,
+                thread_name_prefix=f"themis-{stage_class.value}"
+            )
+            self._workers[stage_class] = size
+            self._active[stage_class] = 0
+            self._queued[stage_class] = 0
+            self._publish(stage_class)
+
+    def submit(self, stage_class: StageClass, fn: Callable, *args, **kwargs) -> Future:
+        """Queue ``fn`` on the executor for ``stage_class``."""
+        stage_class = StageClass(stage_class)
+        executor = self._executors[stage_class]
+        # Carry context variables (request ids, etc.) into the worker thread
+        ctx = contextvars.copy_context()
+
+        def task():
+            with self._lock:
+                self._queued[stage_class] -= 1
+                self._active[stage_class] += 1
+                self._publish(stage_class)
+            try:
+                return ctx.run(fn, *args, **kwargs)
+            finally:
+                with self._lock:
+                    self._active[stage_class] -= 1
+                    self._publish(stage_class)
+
+        with self._lock:
+            self._queued[stage_class] += 1
+            self._publish(stage_class)
+        return executor.submit(task)
+
+    def run(self, stage_class: StageClass, fn: Callable, *args, **kwargs) -> Any:
+        """Run ``fn`` on its stage executor and block until it finishes."""
+        return self.submit(stage_class, fn, *args, **kwargs).result()
+
+    def wrap(self, stage_class: StageClass, fn: Callable) -> Callable:
+        """Return a callable that runs ``fn`` through :meth:`run`."""
+        def staged(*args, **kwargs):
+            return self.run(stage_class, fn, *args, **kwargs)
+        staged.__name__ = getattr(fn, "__name__", "staged")
+        return staged
+
+    def saturation(self) -> Dict[str, Dict[str, float]]:
+        """Current load per executor."""
+        with self._lock:
+            return {
+                stage_class.value: {
+                    "workers": self._workers[stage_class],
+                    "active": self._active[stage_class],
+                    "queued": self._queued[stage_class],
+                    "saturation": self._saturation(stage_class),
+                }
+                for stage_class in self._executors
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        for executor in self._executors.values():
+            executor.shutdown(wait=wait)
+
+    def _saturation(self, stage_class: StageClass) -> float:
+        busy = self._active[stage_class] + self._queued[stage_class]
+        return busy / self._workers[stage_class]
+
+    def _publish(self, stage_class: StageClass) -> None:
+        # Called with self._lock held
+        labels = {"executor": stage_class.value}
+        metrics.set_gauge("stage_executor_saturation", self._saturation(stage_class), labels)
+        metrics.set_gauge("stage_executor_queued", self._queued[stage_class], labels)
+        metrics.set_gauge("stage_executor_active", self._active[stage_class], labels)
+
+
+stage_scheduler = StageScheduler({
+    StageClass.CPU: settings.CPU_EXECUTOR_WORKERS,
+    StageClass.IO: settings.IO_EXECUTOR_WORKERS,
+})
@@ -0,0 +1,212 @@
+# app/core/translation_memory.py
+
+import difflib
+import os
+import re
+import sqlite3
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+
+# Numbers, amounts, dates and clause references are carried over verbatim,
+# so segments differing only in them share one memory entry
+_PLACEABLE = re.compile(r"\d[\d,./:-]*\d|\d")
+_PLACEHOLDER = "⟦{}⟧"
+_PLACEHOLDER_PATTERN = re.compile(r"⟦(\d+)⟧")
+_WORD = re.compile(r"\w{3,}")
+
+EXACT = "exact"
+FUZZY = "fuzzy"
+
+
+def normalize_segment(segment: str) -> Tuple[str, List[str]]:
+    """
+    Memory key for ``segment`` and the placeable values taken out of it.
+
+    Whitespace is collapsed and each number is replaced by a numbered
+    placeholder: "Pay 5,000 by 1 May" -> ("Pay ⟦0⟧ by ⟦1⟧ May", ["5,000", "1"]).
+    """
+    values: List[str] = []
+
+    def placeholder(match: "re.Match") -> str:
+        values.append(match.group())
+        return _PLACEHOLDER.format(len(values) - 1)
+
+    return _PLACEABLE.sub(placeholder, " ".join(segment.split())), values
+
+
+def fill_placeholders(template: str, values: List[str]) -> Optional[str]:
+    """``template`` with its placeholders replaced by ``values``, or None if they do not fit."""
+    try:
+        return _PLACEHOLDER_PATTERN.sub(lambda match: values[int(match.group(1))], template)
+    except IndexError:
+        return None
+
+
+def to_template(translation: str, values: List[str]) -> Optional[str]:
+    """
+    Turn a translation back into a template by replacing the source's
+    placeable values with placeholders. Returns None if a value does not
+    appear verbatim (e.g. the translator converted the digits), in which
+    case the translation is only reusable for the exact same values.
+    """
+    template = translation
+    position = 0
+    for index, value in enumerate(values):
+        found = template.find(value, position)
+        if found < 0:
+            return None
+        placeholder = _PLACEHOLDER.format(index)
+        template = template[:found] + placeholder + template[found + len(value):]
+        position = found + len(placeholder)
+    return template
+
+
+@dataclass
+class MemoryMatch:
+    """A stored translation for a segment"""
+    translation: str
+    kind: str  # EXACT or FUZZY
+    score: float
+    source: str
+
+
+class TranslationMemory:
+    """
+    Persistent segment-level translation memory.
+
+    Translations are stored in SQLite keyed by (normalized source segment,
+    target language); see ``normalize_segment``. Exact lookups are a
+    primary-key read. Fuzzy lookups use an in-memory inverted index of
+    source words per language, built on first use: candidates sharing the
+    most words are scored with difflib and the best one is returned if it
+    reaches ``min_score``.
+    """
+
+    # Words in more entries than this are too common to narrow the candidates
+    MAX_POSTINGS = 2000
+    FUZZY_CANDIDATES = 8
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS segments ("
+            " source TEXT NOT NULL,"
+            " language TEXT NOT NULL,"
+            " translation TEXT NOT NULL,"
+            " backend TEXT NOT NULL,"
+            " created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,"
+            " PRIMARY KEY (source, language))"
+        )
+        self._db.commit()
+        # language -> (sources, translations, word -> entry ids)
+        self._fuzzy: Dict[str, Tuple[List[str], List[str], Dict[str, List[int]]]] = {}
+
+    def lookup(self, segment: str, language: str, min_score: Optional[float] = None) -> Optional[MemoryMatch]:
+        """
+        Stored translation of ``segment``: an exact match on the normalized
+        segment, else (when ``min_score`` is given) the closest fuzzy match.
+        """
+        key, values = normalize_segment(segment)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT translation FROM segments WHERE source = ? AND language = ?", (key, language)
+            ).fetchone()
+        if row is not None:
+            translation = fill_placeholders(row[0], values)
+            if translation is not None:
+                metrics.inc("translation_memory_lookups_total", labels={"result": EXACT})
+                return MemoryMatch(translation, EXACT, 1.0, key)
+
+        if min_score is not None:
+            match = self._fuzzy_lookup(key, values, language, min_score)
+            if match is not None:
+                metrics.inc("translation_memory_lookups_total", labels={"result": FUZZY})
+                return match
+
+        metrics.inc("translation_memory_lookups_total", labels={"result": "miss"})
+        return None
+
+    def _fuzzy_lookup(self, key: str, values: List[str], language: str, min_score: float) -> Optional[MemoryMatch]:
+        with self._lock:
+            sources, translations, postings = self._fuzzy_index(language)
+            overlap: Counter = Counter()
+            for word in set(_WORD.findall(key.lower())):
+                entries = postings.get(word)
+                if entries and len(entries) <= self.MAX_POSTINGS:
+                    overlap.update(entries)
+            candidates = [(sources[i], translations[i]) for i, _ in overlap.most_common(self.FUZZY_CANDIDATES)]
+
+        best: Optional[MemoryMatch] = None
+        for source, template in candidates:
+            matcher = difflib.SequenceMatcher(None, key, source, autojunk=False)
+            if matcher.real_quick_ratio() < min_score or matcher.quick_ratio() < min_score:
+                continue
+            score = matcher.ratio()
+            if score >= min_score and (best is None or score > best.score):
+                translation = fill_placeholders(template, values)
+                if translation is not None:
+                    best = MemoryMatch(translation, FUZZY, score, source)
+        return best
+
+    def _fuzzy_index(self, language: str) -> Tuple[List[str], List[str], Dict[str, List[int]]]:
+        """Fuzzy index for ``language``; the caller holds the lock."""
+        index = self._fuzzy.get(language)
+        if index is None:
+            index = ([], [], {})
+            for source, translation in self._db.execute(
+                "SELECT source, translation FROM segments WHERE language = ?", (language,)
+            ):
+                self._index_entry(index, source, translation)
+            self._fuzzy[language] = index
+        return index
+
+    @staticmethod
+    def _index_entry(index, source: str, translation: str) -> None:
+        sources, translations, postings = index
+        entry = len(sources)
+        sources.append(source)
+        translations.append(translation)
+        for word in set(_WORD.findall(source.lower())):
+            postings.setdefault(word, []).append(entry)
+
+    def store(self, segment: str, language: str, translation: str, backend: str) -> None:
+        """Remember ``translation`` of ``segment`` for later requests."""
+        key, values = normalize_segment(segment)
+        template = to_template(translation, values) if values else translation
+        if template is None:
+            # Digits were not kept verbatim: reusable only for these exact values
+            key, template = " ".join(segment.split()), translation
+        with self._lock:
+            existing = self._db.execute(
+                "SELECT 1 FROM segments WHERE source = ? AND language = ?", (key, language)
+            ).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO segments (source, language, translation, backend) VALUES (?, ?, ?, ?)",
+                (key, language, template, backend)
+            )
+            self._db.commit()
+            if existing is None and language in self._fuzzy:
+                self._index_entry(self._fuzzy[language], key, template)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM segments").fetchone()[0]
+
+
+@lru_cache(maxsize=1)
+def get_translation_memory() -> TranslationMemory:
+    """The process-wide translation memory, opened on first use."""
+    return TranslationMemory(settings.TRANSLATION_MEMORY_PATH)
@@ -1,15 +1,18 @@
 # app/main.py
 
-from fastapi import FastAPI
+import hmac
+
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from app.api.routes import router as api_router
 from app.middleware import LoggingMiddleware
+from app.core.config import settings
 from app.core.rate_limit import limiter
+from app.core.metrics import metrics
+from app.core.render_pool import pdf_render_pool
 from slowapi.errors import RateLimitExceeded
 from starlette.responses import JSONResponse
 from starlette.requests import Request
-from pathlib import Path
 
 app = FastAPI(
     title="Themis Contract Generation API",
@@ -46,20 +49,12 @@ def rate_limit_handler(request: Request, exc):
         content={"detail": "Rate limit exceeded."}
     )
 
-# Define the path to the 'generated_contracts' directory
-BASE_DIR = Path(__file__).resolve().parent
-GENERATED_CONTRACTS_DIR = BASE_DIR.parent / "generated_contracts"
-
-# Ensure the 'generated_contracts' directory exists
-if not GENERATED_CONTRACTS_DIR.exists():
-    GENERATED_CONTRACTS_DIR.mkdir(parents=True, exist_ok=True)
+@app.on_event("shutdown")
+def shutdown_render_pool():
+    pdf_render_pool.shutdown()
 
-# Mount the 'generated_contracts' directory to serve static files
-app.mount(
-    "/generated_contracts",
-    StaticFiles(directory=str(GENERATED_CONTRACTS_DIR)),
-    name="generated_contracts"
-)
+# Generated contracts are served only through the authenticated
+# /api/v1/contracts/{id}/pdf route, never as static files
 
 app.include_router(api_router, prefix="/api/v1")
 
@@ -72,3 +67,13 @@ def read_root():
 @app.get("/health")
 def health_check():
     return {"status": "ok"}
+
+# Metrics endpoint, for scrapers holding METRICS_TOKEN
+@app.get("/metrics")
+def read_metrics(request: Request):
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    supplied = request.headers.get("authorization", "")
+    if not hmac.compare_digest(supplied.encode("utf-8"), f"Bearer {settings.METRICS_TOKEN}".encode("utf-8")):
+        raise HTTPException(status_code=401, detail="Invalid metrics token", headers={"WWW-Authenticate": "Bearer"})
+    return metrics.snapshot()
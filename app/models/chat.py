@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -10,6 +10,10 @@ class Chat(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     contract_id = Column(Integer, ForeignKey("contracts.id"), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Rolling summary of the messages up to and including summarized_message_id
+    summary = Column(Text, nullable=True)
+    summarized_message_id = Column(Integer, nullable=True)
+    summary_updated_at = Column(DateTime(timezone=True), nullable=True)
 
     user = relationship("User", back_populates="chats")
     contract = relationship("Contract", back_populates="chats")
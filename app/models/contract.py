@@ -14,4 +14,6 @@ class Contract(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
-    chats = relationship("Chat", back_populates="contract", cascade="all, delete-orphan")
\ No newline at end of file
+    chats = relationship("Chat", back_populates="contract", cascade="all, delete-orphan")
+    corrections = relationship("ContractCorrection", back_populates="contract", cascade="all, delete-orphan")
+    variants = relationship("ContractVariant", back_populates="contract", cascade="all, delete-orphan")
\ No newline at end of file
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, String, Text, LargeBinary, Boolean, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class ContractCorrection(Base):
+    __tablename__ = "contract_corrections"
+
+    id = Column(Integer, primary_key=True, index=True)
+    contract_id = Column(Integer, ForeignKey("contracts.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    correction_id = Column(String(36), nullable=False)  # UUID assigned by CorrectionAgent
+    section = Column(String(255), nullable=False)
+    reason = Column(Text, nullable=False)
+    diff = Column(LargeBinary, nullable=False)  # Unified diff, zlib-compressed when `compressed`
+    compressed = Column(Boolean, nullable=False, default=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    contract = relationship("Contract", back_populates="corrections")
+
+    # Newest-first pages per contract
+    __table_args__ = (Index("ix_contract_corrections_contract_id_id", "contract_id", "id"),)
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field, EmailStr, validator, constr
 from typing import Dict, List, Optional
-from datetime import date
+from datetime import date, datetime
 from enum import Enum
 from decimal import Decimal
 from pydantic import BaseModel, Field, EmailStr, field_validator
@@ -75,6 +75,8 @@ class ContractRequirements(BaseModel):
     party2: str = Field(..., min_length=1, description="Second party name")
     jurisdiction: str = Field(..., min_length=1, description="Primary jurisdiction")
     additional_jurisdictions: Optional[List[str]] = Field(default=[], description="Additional applicable jurisdictions")
+    variant_jurisdictions: Optional[List[str]] = Field(default=[], description="Jurisdictions to generate a separate contract variant for, from the same draft")
+    target_language: Optional[str] = Field(None, description="Language code to translate the contract into, e.g. 'hi', or 'auto' for the jurisdiction's regional language")
     details: Optional[Dict] = {} 
     additional_info: Optional[str] = Field(None, description="Any additional information")
 
@@ -92,11 +94,74 @@ class ContractRequirements(BaseModel):
             ContractType.LEASE: LeaseDetails,
             ContractType.NDA: NDADetails
         }
+class ValidationFinding(BaseModel):
+    code: str = Field(..., description="numbering, undefined_term, dangling_reference, party_mismatch or party_missing")
+    severity: str = Field(..., description="error or warning")
+    message: str
+    section: Optional[str] = Field(None, description="Heading or number of the affected section")
+    line: Optional[int] = Field(None, description="Line of the contract text, from 1")
+
+class LocalizationStats(BaseModel):
+    language: str = Field(..., description="Language the contract was translated into")
+    segments: int = Field(0, description="Distinct text segments in the contract")
+    exact_matches: int = Field(0, description="Segments found in the translation memory")
+    fuzzy_matches: int = Field(0, description="Translated segments given a similar stored segment as a hint")
+    translated: int = Field(0, description="Segments sent to the translator")
+    hit_rate: float = Field(0.0, description="Fraction of segments served from the translation memory")
+    error: Optional[str] = Field(None, description="Why translation failed; the contract is then in English")
+
 class ContractResponse(BaseModel):
     final_contract: Optional[str] = Field(None, description="Final contract text")
-    pdf_file: Optional[str] = Field(None, description="Path to generated PDF file")
+    pdf_file: Optional[str] = Field(None, description="Download path of the contract PDF")
     completed: bool = Field(default=False, description="Contract generation status")
     error: Optional[str] = Field(None, description="Error message if generation failed")
+    pdf_status: Optional[str] = Field(None, description="PDF rendering status when eager rendering was requested")
+    id: Optional[int] = Field(None, description="ID of the stored contract")
+    validation: Optional[List[ValidationFinding]] = Field(None, description="Structural defects found in the generated draft")
+    variants: Optional[List[str]] = Field(None, description="Jurisdictions with a stored contract variant")
+    localization: Optional[LocalizationStats] = Field(None, description="Translation memory use when the contract was translated")
+
+class ContractVariantSummary(BaseModel):
+    jurisdiction: str
+    delta_size: int = Field(..., description="Characters stored for the variant beyond the base contract")
+    created_at: Optional[datetime] = None
+
+class ContractVariantResponse(BaseModel):
+    contract_id: int
+    jurisdiction: str
+    content: str = Field(..., description="Full text of the variant")
+
+class PdfStatusResponse(BaseModel):
+    id: int = Field(..., description="ID of the stored contract")
+    pdf_status: str = Field(..., description="PDF rendering status: pending, ready or failed")
+    pdf_file: Optional[str] = Field(None, description="Download path of the PDF once ready")
+    error: Optional[str] = Field(None, description="Error message if rendering failed")
+
+class FeedbackItem(BaseModel):
+    section: str = Field(..., min_length=1, description="Section number or heading, e.g. '2.1' or 'Payment Terms'")
+    suggested_change: str = Field(..., min_length=1, description="New text for the section")
+    reason: str = Field(..., min_length=1, description="Why the change is needed")
+
+class FeedbackRequest(BaseModel):
+    feedback: List[FeedbackItem] = Field(..., min_length=1, description="Corrections to apply")
+
+class CorrectionEntry(BaseModel):
+    id: Optional[int] = Field(None, description="ID of the stored correction")
+    correction_id: str = Field(..., description="Correction identifier")
+    section: str = Field(..., description="Section the correction applies to")
+    reason: str = Field(..., description="Reason given for the correction")
+    diff: str = Field(..., description="Unified diff from the original to the corrected section")
+    created_at: Optional[datetime] = Field(None, description="When the correction was stored")
+
+class CorrectionPage(BaseModel):
+    items: List[CorrectionEntry] = Field(default=[], description="Corrections, newest first")
+    next_before: Optional[int] = Field(None, description="Pass as `before` to fetch the next page")
+
+class FeedbackResponse(BaseModel):
+    id: int = Field(..., description="ID of the stored contract")
+    final_contract: str = Field(..., description="Contract text after the corrections")
+    corrections: List[CorrectionEntry] = Field(default=[], description="Corrections applied")
+    unmatched_sections: List[str] = Field(default=[], description="Sections that could not be found")
 
 class User(BaseModel):
     username: Annotated[str, StringConstraints(min_length=3, max_length=50)]
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, String, Text, UniqueConstraint
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class ContractVariant(Base):
+    __tablename__ = "contract_variants"
+
+    id = Column(Integer, primary_key=True, index=True)
+    contract_id = Column(Integer, ForeignKey("contracts.id"), nullable=False)
+    jurisdiction = Column(String(100), nullable=False)  # Registered jurisdiction name
+    # The variant is base[:prefix_length] + delta + base[-suffix_length:]
+    prefix_length = Column(Integer, nullable=False)
+    suffix_length = Column(Integer, nullable=False)
+    delta = Column(Text, nullable=False)
+    base_checksum = Column(String(64), nullable=False)  # SHA-256 of the base content the delta applies to
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    contract = relationship("Contract", back_populates="variants")
+
+    __table_args__ = (UniqueConstraint("contract_id", "jurisdiction", name="uq_contract_variants_contract_id_jurisdiction"),)
@@ -0,0 +1,457 @@
+# app/pipeline.py
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from langgraph.graph import Graph, END
+
+from app.agents.contract_document import ContractDocument
+from app.agents.contract_validator import ContractValidator
+from app.core.logger import logger
+from app.core.metrics import metrics
+from app.core.scheduler import StageClass, StageScheduler
+
+# Drafting instructions injected into every request's details
+DETAILS_PROMPT = {
+   "prompt": """Please generate a legally binding contract. Include proper signature blocks as follows:
+
+1. For PARTY 1:
+  - Signature line
+  - Printed name
+  - Title/Position
+  - Date
+  - Company seal placement
+  - Beneficiary details
+  - Witness signature and details
+
+2. For PARTY 2:
+  - Signature line
+  - Printed name
+  - Title/Position
+  - Date
+  - Company seal placement
+  - Beneficiary details
+  - Witness signature and details
+
+3. Additional Requirements:
+  - Add notary section if required by jurisdiction
+  - Include all relevant legal citations and references
+  - Ensure compliance with local laws
+  - Add page numbers in 'Page X of Y' format
+  - Include version control
+  - Use proper legal margins and formatting
+
+Please maintain highest standards of legal accuracy and enforceability while generating the contract.""",
+
+   "signature_block": "Include standard legal signature blocks with proper spacing and formatting for all parties involved"
+}
+
+
+class ContractPipeline:
+    """
+    Contract generation workflow: inputs -> references -> draft -> corrections
+    -> validation -> jurisdiction customization.
+
+    The graph is compiled once and shared by all requests; everything a
+    request produces lives in its state dict, never on the agents. Each stage is
+    tagged with the kind of work it does and, when a scheduler is given,
+    runs on that stage class's executor instead of the calling thread.
+
+    With ``speculative=True`` retrieval and drafting overlap: drafting starts
+    straight away with the references last retrieved for the same contract
+    type and jurisdiction while fresh retrieval runs alongside it. The
+    speculative draft is kept if the fresh top-k references match the cached
+    ones and cancelled (redrafting with the fresh references) otherwise, so
+    a miss never changes the result. Cancelling is best effort: a
+    speculative call still waiting for a scheduler slot never reaches the
+    provider, but one already generating is only cut short, and the tokens
+    generated until then are spent.
+
+    ``run_variants`` generates one contract per jurisdiction: retrieval,
+    drafting, correction and validation run once, and only jurisdiction
+    customization runs per jurisdiction, concurrently.
+
+    With ``target_language`` in the inputs, customization also translates
+    the contract through the translation memory; the memory statistics are
+    stored in ``state["localization"]``.
+
+    Validation checks the corrected draft's structure and stores the
+    findings in ``state["validation"]``. With ``regenerate_sections`` set,
+    up to ``max_regenerated_sections`` sections with fixable defects are
+    rewritten one by one instead of redrafting the whole contract.
+    """
+
+    # Kind of work performed by each workflow node
+    STAGE_CLASSES = {
+        "retrieve_references": StageClass.CPU,      # InLegalBERT inference
+        "generate_draft": StageClass.IO,            # LLM call
+        "correct_draft": StageClass.CPU,            # text processing
+        "validate_draft": StageClass.IO,            # text checks, LLM call when regenerating
+    }
+
+    def __init__(
+        self,
+        retriever_agent,
+        drafting_agent,
+        correction_agent,
+        jurisdiction_agent,
+        scheduler: Optional[StageScheduler] = None,
+        speculative: bool = False,
+        reference_cache_size: int = 256,
+        validator: Optional[ContractValidator] = None,
+        regenerate_sections: bool = False,
+        max_regenerated_sections: int = 3
+    ):
+        self.retriever_agent = retriever_agent
+        self.drafting_agent = drafting_agent
+        self.correction_agent = correction_agent
+        self.jurisdiction_agent = jurisdiction_agent
+        self.scheduler = scheduler
+        self.speculative = speculative
+        self.validator = validator or ContractValidator()
+        self.regenerate_sections = regenerate_sections
+        self.max_regenerated_sections = max_regenerated_sections
+        # Last retrieved references per (contract type, jurisdiction)
+        self._reference_cache: "OrderedDict[Tuple[str, str], List[Dict]]" = OrderedDict()
+        self._reference_cache_size = reference_cache_size
+        self._reference_cache_lock = threading.Lock()
+        self._speculation_lock = threading.Lock()
+        self._speculation_counts = {"hit": 0, "miss": 0}
+        self.compiled_workflow = self._build_workflow()
+        # Everything up to jurisdiction customization, for variant fan-out
+        self.base_workflow = self._build_workflow(customize=False)
+
+    def run(self, user_inputs: Dict, user_key: Optional[str] = None) -> Dict:
+        """Execute the workflow for one request and return the final state."""
+        return self.compiled_workflow.invoke(self._initial_state(user_inputs, user_key))
+
+    def run_variants(self, user_inputs: Dict, jurisdictions: List[str], user_key: Optional[str] = None) -> Dict:
+        """
+        Execute the workflow once and customize the draft for each of
+        ``jurisdictions`` as well as the primary one.
+
+        ``final_contract`` is the primary jurisdiction's contract as with
+        ``run``; ``variants`` maps each other jurisdiction (by registered
+        name, duplicates and the primary dropped) to its contract.
+        """
+        state = self.base_workflow.invoke(self._initial_state(user_inputs, user_key))
+        if state.get("error"):
+            return state
+
+        registry = self.jurisdiction_agent.registry
+        primary = user_inputs.get('jurisdiction', 'Default Jurisdiction')
+        primary_name = registry.canonical_name(primary)
+        targets: Dict[str, str] = {}
+        for jurisdiction in jurisdictions:
+            name = registry.canonical_name(jurisdiction)
+            if name != primary_name:
+                targets.setdefault(name, jurisdiction)
+
+        local_pool = None
+        if self.scheduler is not None:
+            submit = self.scheduler.submit
+        else:
+            local_pool = ThreadPoolExecutor(max_workers=min(len(targets), 8) or 1)
+            submit = lambda stage_class, fn, *args, **kwargs: local_pool.submit(fn, *args, **kwargs)
+
+        started = time.monotonic()
+        base = state["corrected_draft"]
+        target_language = user_inputs.get('target_language')
+        # Translation waits on the LLM; plain customization is text processing
+        stage_class = StageClass.IO if target_language else StageClass.CPU
+        try:
+            futures = {
+                name: submit(stage_class, self.customize_text, base, jurisdiction, [], target_language, user_key)
+                for name, jurisdiction in targets.items()
+            }
+            customized = self.customize_contract(
+                base, primary, user_inputs.get('additional_jurisdictions', []), target_language, user_key
+            )
+            state["final_contract"] = customized['content']
+            state["localization"] = customized['metadata'].get('localization')
+            state["variants"] = {name: future.result() for name, future in futures.items()}
+        finally:
+            if local_pool is not None:
+                local_pool.shutdown(wait=False)
+        metrics.observe("contract_variant_fanout_seconds", time.monotonic() - started)
+        metrics.inc("contract_variants_generated_total", len(targets))
+        return state
+
+    @staticmethod
+    def _initial_state(user_inputs: Dict, user_key: Optional[str]) -> Dict:
+        return {
+            "user_inputs": user_inputs,
+            "user_key": user_key,
+            "legal_references": [],
+            "references_used": [],
+            "contract_draft": "",
+            "corrected_draft": "",
+            "validation": None,
+            "final_contract": "",
+            "localization": None,
+            "error": None,
+            "completed": False,
+            "variants": {}
+        }
+
+    def _build_workflow(self, customize: bool = True):
+        workflow = Graph()
+        workflow.add_node("collect_inputs", self.collect_user_inputs)
+        workflow.add_node("correct_draft", self._staged("correct_draft", self.correct_draft))
+        workflow.add_node("validate_draft", self._staged("validate_draft", self.validate_draft))
+        if customize:
+            # Picks its stage class per request, so runs unstaged
+            workflow.add_node("customize_jurisdiction", self.customize_jurisdiction)
+        workflow.set_entry_point("collect_inputs")
+        if self.speculative:
+            # Dispatches its own retrieval and drafting work, so runs unstaged
+            workflow.add_node("speculative_draft", self.speculative_draft)
+            workflow.add_conditional_edges("collect_inputs", self.should_continue, {"continue": "speculative_draft", END: END})
+            workflow.add_conditional_edges("speculative_draft", self.should_continue, {"continue": "correct_draft", END: END})
+        else:
+            workflow.add_node("retrieve_references", self._staged("retrieve_references", self.retrieve_legal_references))
+            workflow.add_node("generate_draft", self._staged("generate_draft", self.generate_initial_draft))
+            workflow.add_conditional_edges("collect_inputs", self.should_continue, {"continue": "retrieve_references", END: END})
+            workflow.add_conditional_edges("retrieve_references", self.should_continue, {"continue": "generate_draft", END: END})
+            workflow.add_conditional_edges("generate_draft", self.should_continue, {"continue": "correct_draft", END: END})
+        workflow.add_conditional_edges("correct_draft", self.should_continue, {"continue": "validate_draft", END: END})
+        if customize:
+            workflow.add_conditional_edges("validate_draft", self.should_continue, {"continue": "customize_jurisdiction", END: END})
+            workflow.add_conditional_edges("customize_jurisdiction", self.should_continue, {"continue": END, END: END})
+        else:
+            workflow.add_conditional_edges("validate_draft", self.should_continue, {"continue": END, END: END})
+        return workflow.compile()
+
+    def _staged(self, node: str, fn):
+        if self.scheduler is None:
+            return fn
+        return self.scheduler.wrap(self.STAGE_CLASSES[node], fn)
+
+    def collect_user_inputs(self, state):
+        logger.debug(f"Original user input state: {state}")
+        # Hardcode the `details` section
+        state["user_inputs"]["details"] = dict(DETAILS_PROMPT)
+        return state
+
+    def retrieve_legal_references(self, state):
+        logger.debug(f"User inputs before legal reference search: {state.get('user_inputs')}")
+        if not state["user_inputs"]:
+            logger.error("User inputs are None or invalid.")
+        else:
+            logger.debug(f"User inputs keys: {state['user_inputs'].keys()}")
+        state["legal_references"] = self.retriever_agent.search_legal_reference(state["user_inputs"])
+        logger.debug(f"Legal references retrieved: {state['legal_references']}")
+        return state
+
+    def generate_initial_draft(self, state):
+        draft = self.drafting_agent.create_draft(
+            contract_type=state["user_inputs"]["contract_type"],
+            requirements=state["user_inputs"],
+            legal_refs=state["legal_references"],
+            user_key=state.get("user_key")
+        )
+        state["contract_draft"] = draft.content
+        state["references_used"] = draft.references_used
+        logger.debug(f"Contract draft type before correction: {type(state['contract_draft'])}")
+        return state
+
+    def speculative_draft(self, state):
+        user_inputs = state["user_inputs"]
+        cache_key = self._reference_cache_key(user_inputs)
+        cached_refs = self._get_cached_references(cache_key)
+
+        local_pool = None
+        if self.scheduler is not None:
+            submit = self.scheduler.submit
+        else:
+            local_pool = ThreadPoolExecutor(max_workers=2)
+            submit = lambda stage_class, fn, *args, **kwargs: local_pool.submit(fn, *args, **kwargs)
+
+        def draft_with(refs, cancel=None):
+            return self.drafting_agent.create_draft(
+                contract_type=user_inputs["contract_type"],
+                requirements=user_inputs,
+                legal_refs=refs,
+                user_key=state.get("user_key"),
+                cancel=cancel
+            )
+
+        cancel_speculation = threading.Event()
+
+        try:
+            retrieval_started = time.monotonic()
+            fresh_future = submit(StageClass.CPU, self.retriever_agent.search_legal_reference, user_inputs)
+            speculative_future = None
+            if cached_refs is not None:
+                speculative_future = submit(StageClass.IO, draft_with, cached_refs, cancel_speculation)
+
+            fresh_refs = fresh_future.result()
+            retrieval_seconds = time.monotonic() - retrieval_started
+            self._put_cached_references(cache_key, fresh_refs)
+            state["legal_references"] = fresh_refs
+
+            if speculative_future is not None and self._same_top_k(cached_refs, fresh_refs):
+                draft = speculative_future.result()
+                self._record_speculation("hit", retrieval_seconds)
+            else:
+                if speculative_future is not None:
+                    # Unstarted: never runs. Generating: its stream is closed at the next chunk
+                    cancel_speculation.set()
+                    speculative_future.cancel()
+                    self._record_speculation("miss", 0.0)
+                draft = submit(StageClass.IO, draft_with, fresh_refs).result()
+        finally:
+            if local_pool is not None:
+                local_pool.shutdown(wait=False)
+
+        state["contract_draft"] = draft.content
+        state["references_used"] = draft.references_used
+        return state
+
+    def speculation_stats(self) -> Dict[str, float]:
+        """Hit/miss counts and hit rate of speculative drafting so far."""
+        with self._speculation_lock:
+            hits, misses = self._speculation_counts["hit"], self._speculation_counts["miss"]
+        total = hits + misses
+        return {"hits": hits, "misses": misses, "hit_rate": hits / total if total else 0.0}
+
+    def _record_speculation(self, outcome: str, latency_saved: float) -> None:
+        with self._speculation_lock:
+            self._speculation_counts[outcome] += 1
+            hits, misses = self._speculation_counts["hit"], self._speculation_counts["miss"]
+        metrics.inc("speculative_draft_total", labels={"outcome": outcome})
+        metrics.set_gauge("speculative_draft_hit_rate", hits / (hits + misses))
+        if outcome == "hit":
+            # Drafting started this much earlier than it would have sequentially.
+            # Misses save nothing: the cancelled call's tokens may already be spent
+            metrics.observe("speculative_draft_latency_saved_seconds", latency_saved)
+
+    @staticmethod
+    def _reference_cache_key(user_inputs: Dict) -> Tuple[str, str]:
+        contract_type = user_inputs.get("contract_type")
+        contract_type = getattr(contract_type, "value", contract_type)
+        jurisdiction = (user_inputs.get("jurisdiction") or "").strip().lower()
+        return str(contract_type), jurisdiction
+
+    @staticmethod
+    def _same_top_k(cached_refs: List[Dict], fresh_refs: List[Dict]) -> bool:
+        # The drafting prompt only sees source and content, in order
+        def identity(refs):
+            return [(ref.get("source"), ref.get("content")) for ref in refs]
+        return identity(cached_refs) == identity(fresh_refs)
+
+    def _get_cached_references(self, key: Tuple[str, str]) -> Optional[List[Dict]]:
+        with self._reference_cache_lock:
+            refs = self._reference_cache.get(key)
+            if refs is not None:
+                self._reference_cache.move_to_end(key)
+            return refs
+
+    def _put_cached_references(self, key: Tuple[str, str], refs: List[Dict]) -> None:
+        with self._reference_cache_lock:
+            self._reference_cache[key] = refs
+            self._reference_cache.move_to_end(key)
+            while len(self._reference_cache) > self._reference_cache_size:
+                self._reference_cache.popitem(last=False)
+
+    def correct_draft(self, state):
+        state["corrected_draft"] = self.correction_agent.correct_draft(state["contract_draft"])
+        return state
+
+    def validate_draft(self, state):
+        user_inputs = state["user_inputs"]
+        parties = (user_inputs.get("party1"), user_inputs.get("party2"))
+        reference_count = len(state["legal_references"])
+        text = state["corrected_draft"]
+        report = self.validator.validate(text, parties=parties, reference_count=reference_count)
+
+        if self.regenerate_sections and report.sections_to_regenerate():
+            document = ContractDocument(text)
+            regenerate = report.sections_to_regenerate()
+            for index in list(regenerate):
+                # A rewritten section includes its sub-sections, so theirs are fixed with it
+                ancestor = document.sections[index].parent
+                while ancestor is not None and ancestor not in regenerate:
+                    ancestor = document.sections[ancestor].parent
+                if ancestor is not None:
+                    regenerate[ancestor].extend(regenerate.pop(index))
+            targets = list(regenerate.items())[:self.max_regenerated_sections]
+            for index, findings in targets:
+                try:
+                    body = self.drafting_agent.regenerate_section(
+                        document.section_text(index),
+                        [finding.message for finding in findings],
+                        user_inputs,
+                        reference_count,
+                        user_key=state.get("user_key")
+                    )
+                except Exception as e:
+                    # Keep the section as drafted; the findings stay in the report
+                    logger.error(f"Section regeneration failed: {str(e)}")
+                    continue
+                document.replace_section(index, body)
+                metrics.inc("contract_sections_regenerated_total")
+            if document.edits:
+                text = document.text
+                state["corrected_draft"] = text
+                report = self.validator.validate(text, parties=parties, reference_count=reference_count)
+
+        if report.findings:
+            logger.info(f"Draft validation: {len(report.errors)} errors, {len(report.findings)} findings")
+        state["validation"] = report.to_dict()
+        return state
+
+    def customize_jurisdiction(self, state):
+        customize = self.customize_contract
+        if self.scheduler is not None:
+            # Translation waits on the LLM; plain customization is text processing
+            translating = bool(state["user_inputs"].get('target_language'))
+            customize = self.scheduler.wrap(StageClass.IO if translating else StageClass.CPU, customize)
+        customized = customize(
+            state["corrected_draft"],
+            state["user_inputs"].get('jurisdiction', 'Default Jurisdiction'),
+            state["user_inputs"].get('additional_jurisdictions', []),
+            state["user_inputs"].get('target_language'),
+            state.get("user_key")
+        )
+        state["final_contract"] = customized['content']
+        state["localization"] = customized['metadata'].get('localization')
+        return state
+
+    def customize_contract(
+        self,
+        text: str,
+        jurisdiction: str,
+        additional_jurisdictions: List[str],
+        target_language: Optional[str] = None,
+        user_key: Optional[str] = None
+    ) -> Dict:
+        """Customized contract dict (content and metadata); translated when ``target_language`` is set."""
+        contract = {'content': text, 'metadata': {}}
+        customized = self.jurisdiction_agent.customize_for_jurisdiction(
+            contract,
+            jurisdiction,
+            additional_jurisdictions,
+            requirements={
+                'translate': bool(target_language),
+                'target_language': target_language,
+                'user_key': user_key
+            }
+        )
+        return customized if isinstance(customized, dict) else {'content': customized, 'metadata': {}}
+
+    def customize_text(
+        self,
+        text: str,
+        jurisdiction: str,
+        additional_jurisdictions: List[str],
+        target_language: Optional[str] = None,
+        user_key: Optional[str] = None
+    ) -> str:
+        return self.customize_contract(text, jurisdiction, additional_jurisdictions, target_language, user_key)['content']
+
+    def should_continue(self, state):
+        return "continue" if not state.get("error") else END
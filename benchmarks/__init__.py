@@ -0,0 +1 @@
+"""Benchmarks of performance-sensitive code; run each from the repository root with `python -m benchmarks.<name>`."""
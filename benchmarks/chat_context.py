@@ -0,0 +1,43 @@
+"""Prompt size benchmark for ``app.core.chat_context``: run with `python -m benchmarks.chat_context`."""
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.chat_context import ChatContextManager
+from app.core.database import Base
+from app.core.openai_client import estimate_tokens
+from app.models.chat import Chat
+from app.models.message import Message
+
+
+def main():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Chat.__table__, Message.__table__])
+    calls = []
+
+    def summarize(previous, messages, user_key=None, max_tokens=300):
+        calls.append(len(messages))
+        words = ((previous or "") + " " + " ".join(msg["content"] for msg in messages)).split()
+        return " ".join(words[-(max_tokens * 3 // 4):])
+
+    manager = ChatContextManager(summarize, recent_turns=6, summary_batch_turns=4, summary_max_tokens=300)
+    db = sessionmaker(bind=engine)()
+    # A chat created directly, without its user and contract rows
+    db.execute(Chat.__table__.insert().values(id=1, user_id=1))
+    chat = db.get(Chat, 1)
+    question = "What does clause 7 say about termination notice and how does it interact with clause 12? " * 2
+    answer = "Clause 7 requires thirty days written notice; clause 12 adds a cure period of fifteen days. " * 6
+    for turn in range(1, 201):
+        context = manager.load(db, chat)
+        full_history = (turn - 1) * (estimate_tokens(question) + estimate_tokens(answer))
+        if turn in (1, 10, 11, 50, 200):
+            print(f"turn {turn:>3}: {len(context.history):>2} messages + summary, {context.prompt_tokens:>5} prompt tokens "
+                  f"(full history: {full_history:>6})")
+        db.add_all([Message(chat_id=1, sender="user", content=question), Message(chat_id=1, sender="bot", content=answer)])
+        db.commit()
+    print(f"{len(calls)} summarizer calls for 200 turns, {sum(calls)} messages folded")
+    assert context.prompt_tokens < 3000
+
+
+if __name__ == "__main__":
+    main()
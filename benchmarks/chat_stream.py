@@ -0,0 +1,52 @@
+"""Disconnect check for ``app.core.chat_stream``: run with `python -m benchmarks.chat_stream`."""
+
+import asyncio
+import time
+
+from app.core.chat_stream import DISCONNECTED, ChatReplyStream
+
+saved = {}
+
+
+def generate(prompt="can I terminate?"):
+    for word in f"Clause 4 allows termination on thirty days notice. You asked: {prompt}".split():
+        time.sleep(0.01)
+        yield word + " "
+
+
+def save(chat_id, text):
+    saved[chat_id] = text
+    return len(saved)
+
+
+async def run():
+    complete = ChatReplyStream(1, generate, save)
+    async for _ in complete.tokens():
+        pass
+    print(f"complete: {complete.status}, message {complete.message_id}: {saved[1]!r}")
+
+    # A client that goes away after three tokens
+    partial = ChatReplyStream(2, generate, save)
+
+    async def consume():
+        received = 0
+        async for _ in partial.tokens():
+            received += 1
+            if received == 3:
+                await asyncio.sleep(10)
+
+    task = asyncio.create_task(consume())
+    await asyncio.sleep(0.2)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    await partial.finish()
+    print(f"cancelled: {partial.status}, message {partial.message_id}: {saved[2]!r}")
+    assert partial.status == DISCONNECTED and saved[2] == "Clause 4 allows "
+
+
+def main():
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
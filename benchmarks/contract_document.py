@@ -0,0 +1,43 @@
+"""Edit benchmark for ``app.agents.contract_document``: run with `python -m benchmarks.contract_document`."""
+
+import time
+
+from app.agents.contract_document import ContractDocument
+
+
+def main():
+    sections = 5000
+    text = "MASTER SERVICES AGREEMENT\n\n" + "".join(
+        f"{n}. CLAUSE {n}\n\n{n}.1 The Supplier shall perform obligation {n} with due care and skill.\n\n"
+        for n in range(1, sections + 1)
+    )
+
+    started = time.perf_counter()
+    document = ContractDocument(text)
+    index_seconds = time.perf_counter() - started
+
+    edits = 1000
+    started = time.perf_counter()
+    for n in range(1, edits + 1):
+        document.replace_section(document.find(f"{n * 5}.1"), f"The Supplier shall perform revised obligation {n}.")
+    edit_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    result = document.text
+    assemble_seconds = time.perf_counter() - started
+
+    # The same edits made by rebuilding the string each time
+    naive = text
+    started = time.perf_counter()
+    for n in range(1, edits + 1):
+        old = f"{n * 5}.1 The Supplier shall perform obligation {n * 5} with due care and skill."
+        naive = naive.replace(old, f"{n * 5}.1 The Supplier shall perform revised obligation {n}.", 1)
+    naive_seconds = time.perf_counter() - started
+
+    assert result == naive
+    print(f"{len(text) / 1024:.0f} KiB, {len(document.sections)} sections indexed in {index_seconds * 1000:.1f} ms")
+    print(f"{edits} section edits: {edit_seconds * 1000:.1f} ms (+{assemble_seconds * 1000:.1f} ms to assemble), "
+          f"string rebuilding: {naive_seconds * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Throughput benchmark for ``app.agents.contract_layout``: run with `python -m benchmarks.contract_layout`."""
+
+import io
+import time
+
+from app.agents.contract_layout import build_pdf, parse_contract
+
+
+def main():
+    section = (
+        "{n}. OBLIGATIONS OF THE PARTIES\n\n"
+        "{n}.1 The Service Provider shall perform the Services with due care & skill, "
+        "in accordance with the <Schedule> and applicable law. [Ref 1]\n"
+        "{n}.2 The Client shall pay all undisputed invoices within thirty (30) days.\n\n"
+        "- deliver monthly reports\n- maintain insurance\n\n"
+        "The parties agree that time is of the essence for all payment obligations "
+        "and that any delay shall attract interest at the statutory rate. " * 3 + "\n\n"
+    )
+    contract = "SERVICE AGREEMENT\n\n" + "".join(section.format(n=n) for n in range(1, 121)) + (
+        "IN WITNESS WHEREOF\n\nSignature: ____________________\nPrinted name: A. Sharma\nDate: ________\n"
+    )
+
+    started = time.perf_counter()
+    blocks = parse_contract(contract)
+    parse_seconds = time.perf_counter() - started
+
+    rounds = 5
+    pages = 0
+    started = time.perf_counter()
+    for _ in range(rounds):
+        pages = build_pdf(blocks, io.BytesIO())
+    build_seconds = time.perf_counter() - started
+
+    print(f"Parsed {len(contract) / 1024:.0f} KiB into {len(blocks)} blocks in {parse_seconds * 1000:.1f} ms")
+    print(f"Rendered {pages} pages x {rounds}: {pages * rounds / build_seconds:.1f} pages/second")
+
+
+if __name__ == "__main__":
+    main()
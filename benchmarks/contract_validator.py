@@ -0,0 +1,40 @@
+"""Latency benchmark for ``app.agents.contract_validator``: run with `python -m benchmarks.contract_validator`."""
+
+import time
+
+from app.agents.contract_validator import ContractValidator
+
+
+def main():
+    clause = (
+        "{n}.{m} The Employer shall pay the Employee the Salary on the last working day of each month, "
+        "subject to the Income Tax Act and the Confidential Data policy. [Ref {ref}]\n\n"
+    )
+    parts = [
+        "EMPLOYMENT AGREEMENT\n\n",
+        "This Agreement is made between Acme Private Limited (the \"Employer\") and Ravi Sharma "
+        "(the \"Employee\"), together the \"Parties\"; the monthly pay is the \"Salary\".\n\n",
+    ]
+    for n in range(1, 41):
+        parts.append(f"{n}. SECTION HEADING {n}\n\n")
+        parts.extend(clause.format(n=n, m=m, ref=1 + (n + m) % 3) for m in range(1, 6))
+    # Seeded defects: a skipped number, a dangling reference and a wrong party name
+    parts.append("42. GENERAL PROVISIONS\n\nNotices go to the Employer at its office. [Ref 9]\n\n")
+    parts.append("Name: Acme Holdings Ltd\nName: Ravi Sharma\n")
+    text = "".join(parts)
+
+    validator = ContractValidator()
+    report = validator.validate(text, parties=("Acme Private Limited", "Ravi Sharma"), reference_count=3)
+    for finding in report.findings:
+        print(f"line {finding.line}: [{finding.severity}] {finding.code}: {finding.message}")
+
+    runs = 200
+    started = time.perf_counter()
+    for _ in range(runs):
+        validator.validate(text, parties=("Acme Private Limited", "Ravi Sharma"), reference_count=3)
+    per_run = (time.perf_counter() - started) / runs
+    print(f"{len(text.split())} words ({len(text) / 1024:.0f} KiB, about 20 pages): {per_run * 1000:.2f} ms per validation")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Throughput benchmark for ``app.agents.correction_rules``: run with `python -m benchmarks.correction_rules`."""
+
+import time
+
+from app.agents.correction_rules import standard_rule_engine
+
+
+def main():
+    def legacy_corrections(content: str) -> str:
+        # The rules CorrectionAgent applied before this engine
+        content = ' '.join(content.split())
+        return '. '.join(s.capitalize() for s in content.split('. '))
+
+    paragraph = (
+        "1.2  The Service Provider shall deliver the Services described in Schedule A to the Client "
+        "in a professional manner and in accordance with applicable law, as agreed.. payment "
+        "is due within thirty (30) days of the invoice date, e.g. the date shown on the invoice. "
+        "Each party shall bear its own costs and expenses incurred in connection with this "
+        "Agreement , unless otherwise agreed in writing.   \r\n"
+        "  - monthly reports,,\n\n\n\n"
+    )
+    for megabytes in (1, 4, 8):
+        text = paragraph * (megabytes * 1024 * 1024 // len(paragraph))
+
+        started = time.perf_counter()
+        corrected, hits = standard_rule_engine.apply(text)
+        engine_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        legacy_corrections(text)
+        legacy_seconds = time.perf_counter() - started
+
+        size = len(text) / (1024 * 1024)
+        print(
+            f"{size:.1f} MiB: rule engine {size / engine_seconds:.1f} MiB/s, "
+            f"legacy {size / legacy_seconds:.1f} MiB/s, lines kept {corrected.count(chr(10))}"
+        )
+    print("Hits per rule (last run):", dict(hits))
+    print(repr(standard_rule_engine.apply(paragraph)[0]))
+
+
+if __name__ == "__main__":
+    main()
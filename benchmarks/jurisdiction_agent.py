@@ -0,0 +1,54 @@
+"""Per-stage allocation benchmark for ``app.agents.jurisdiction_agent``: run with `python -m benchmarks.jurisdiction_agent`."""
+
+import time
+import tracemalloc
+
+from app.agents.jurisdiction_agent import JurisdictionCustomizationAgent
+
+
+def main():
+    agent = JurisdictionCustomizationAgent()
+    draft = "".join(
+        f"{n}. CLAUSE {n}\n\nThe Supplier shall perform obligation {n} with due care and skill.\n\n"
+        for n in range(1, 60001)
+    ).rstrip()
+    print(f"Draft: {len(draft) / 2**20:.1f} MiB")
+
+    def measure(label, fn):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        result = fn()
+        seconds = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1] - before
+        print(f"  {label:<28} peak {peak / 2**20:6.2f} MiB  {seconds * 1000:6.2f} ms")
+        return result
+
+    tracemalloc.start()
+    print("Builder:")
+    contract = {'content': draft, 'metadata': {}}
+    builder = measure("builder", lambda: agent._builder_for(contract))
+    measure("legal terms", lambda: agent._adapt_legal_terms(contract, "Maharashtra", ["Karnataka"], builder))
+    measure("regulatory compliance", lambda: agent._ensure_regulatory_compliance(contract, "Maharashtra", builder))
+    measure("multiple jurisdictions", lambda: agent._handle_multiple_jurisdictions(
+        contract, "Maharashtra", ["Karnataka"], builder))
+    built = measure("build", builder.build)
+
+    # The previous approach: each stage appended to the content string, and
+    # string output appended the compliance statement again
+    print("String appends:")
+    legacy = {'content': draft}
+
+    def append(text):
+        legacy['content'] += text
+
+    measure("legal terms", lambda: append("\n\nGoverning Law: This contract shall be governed by the laws of Maharashtra."))
+    measure("regulatory compliance", lambda: append("\n\nThis contract complies with the regulations of Maharashtra."))
+    measure("multiple jurisdictions", lambda: append("\n\nMulti-jurisdictional Application: ..."))
+    measure("compliance statement again", lambda: append("\n\nThis contract complies with the regulations of Maharashtra."))
+    tracemalloc.stop()
+    assert built.count("complies with the regulations") == 1
+
+
+if __name__ == "__main__":
+    main()
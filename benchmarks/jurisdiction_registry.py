@@ -0,0 +1,36 @@
+"""Lookup benchmark for ``app.agents.jurisdiction_registry``: run with `python -m benchmarks.jurisdiction_registry`."""
+
+import json
+import time
+
+from app.agents.jurisdiction_registry import JURISDICTIONS_FILE, JurisdictionRegistry, get_jurisdiction_registry
+
+
+def main():
+    registry = get_jurisdiction_registry()
+    for name in ("MH", "state of maharashtra", "Bombay", "Pune, Maharashtra, India", "IN-KA", "India", "Atlantis"):
+        jurisdiction = registry.get(name)
+        if jurisdiction:
+            print(f"{name!r} -> {jurisdiction.code} {jurisdiction.name}, languages {jurisdiction.languages}, "
+                  f"{len(jurisdiction.requirements)} requirements "
+                  f"(stamp duty: {jurisdiction.requirements_for('regulatory')[0].reference})")
+        else:
+            print(f"{name!r} -> unknown")
+
+    # Lookup time with the real registry and with one 500 times larger
+    base = json.load(open(JURISDICTIONS_FILE, encoding="utf-8"))["jurisdictions"]
+    synthetic = list(base)
+    for n in range(len(base) * 500):
+        synthetic.append({"code": f"XX-{n}", "name": f"Region {n}", "parent": "IN",
+                          "aliases": [f"R{n}"], "requirements": []})
+    names = ["MH", "Karnataka", "new delhi", "IN-TN", "Pune, Maharashtra"] * 20000
+    for label, subject in (("real", registry), ("500x", JurisdictionRegistry(synthetic))):
+        started = time.perf_counter()
+        for name in names:
+            subject.get(name)
+        seconds = time.perf_counter() - started
+        print(f"{label} registry ({len(subject)} jurisdictions): {seconds / len(names) * 1e6:.2f} us per lookup")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Translation memory benchmark for ``app.agents.localization``: run with `python -m benchmarks.localization`."""
+
+import os
+import tempfile
+import time
+
+from app.agents.localization import Localizer
+from app.agents.translators import StubTranslator
+from app.core.translation_memory import TranslationMemory
+
+
+def main():
+    def contract(n: int) -> str:
+        return "\n\n".join([
+            f"EMPLOYMENT AGREEMENT NO. {n}",
+            f"1. POSITION AND DUTIES\n\nThe Employee shall serve as Engineer {n % 7} and perform duties assigned by the Employer. "
+            f"The Employee shall devote full working time to the {'business' if n % 2 else 'businesses'} of the Employer.",
+            f"2. COMPENSATION\n\nThe Employer shall pay a monthly salary of INR {50000 + n * 1000:,} on the 1st of each month. "
+            "Salary is subject to deduction of tax at source under the Income Tax Act, 1961.",
+            "3. CONFIDENTIALITY\n\nThe Employee shall not disclose Confidential Information to any third party. "
+            f"This obligation survives termination for {2 + n % 3} years.",
+            "4. TERMINATION\n\nEither party may terminate this Agreement by giving thirty days written notice. "
+            "The Employer may terminate the Employee for cause without notice.",
+            f"5. GOVERNING LAW\n\nThis Agreement is governed by the laws of India and the courts at {['Mumbai', 'Pune', 'Bengaluru'][n % 3]} "
+            "shall have exclusive jurisdiction.",
+        ])
+
+    with tempfile.TemporaryDirectory() as directory:
+        backend = StubTranslator()
+        localizer = Localizer(backend=backend, memory=TranslationMemory(os.path.join(directory, "tm.sqlite3")),
+                              fuzzy_hint=0.75, batch_size=40)
+        for n in range(1, 51):
+            started = time.perf_counter()
+            text, stats = localizer.localize(contract(n), "hi")
+            seconds = time.perf_counter() - started
+            if n in (1, 2, 3, 10, 50):
+                print(f"contract {n:>2}: {stats.segments} segments, hit rate {stats.hit_rate:.0%} "
+                      f"({stats.exact_matches} exact), "
+                      f"{stats.translated} translated ({stats.fuzzy_matches} with a fuzzy hint), {seconds * 1000:.1f} ms")
+        print(f"Backend: {backend.calls} calls, {backend.segments} segments for 50 contracts "
+              f"({len(localizer.memory)} memory entries)")
+        assert "INR 100,000" in text and text.count("[hi]") == stats.segments
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Throughput benchmark for ``app.agents.spell_checker``: run with `python -m benchmarks.spell_checker`."""
+
+import random
+import time
+import tracemalloc
+
+from app.agents.spell_checker import get_spell_checker
+
+
+def main():
+    tracemalloc.start()
+    started = time.perf_counter()
+    checker = get_spell_checker()
+    load_seconds = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"Loaded {len(checker)} words in {load_seconds:.2f}s, peak {peak / 2**20:.0f} MiB")
+
+    sentence = (
+        "The Lessee shall indemnify the Lessor against all claims arising from any breach "
+        "of the covenants herein, notwithstanding the termination of this agreement, and "
+        "shall pay the monthly rent of rupees fifty thousand on or before the fifth day. "
+    )
+    typos = {
+        "indemnify": "indemnfy", "against": "agaisnt", "claims": "claimss", "covenants": "covenents",
+        "notwithstanding": "notwithstandng", "termination": "terminaton", "agreement": "agrement",
+        "monthly": "monhtly", "thousand": "thousnad", "before": "befroe",
+    }
+    rng = random.Random(7)
+    paragraphs = []
+    for _ in range(20000):
+        words = sentence.split(" ")
+        for i, word in enumerate(words):
+            if word in typos and rng.random() < 0.05:
+                words[i] = typos[word]
+        paragraphs.append(" ".join(words))
+    text = "\n\n".join(paragraphs)
+    word_count = len(text.split())
+
+    started = time.perf_counter()
+    corrected, corrections = checker.correct(text)
+    seconds = time.perf_counter() - started
+    remaining = sum(corrected.count(typo) for typo in typos.values())
+    print(f"{word_count} words ({len(text) / 2**20:.1f} MiB) in {seconds:.2f}s: "
+          f"{word_count / seconds:,.0f} words/second, {len(corrections)} corrections, {remaining} typos left")
+    print(sorted(set(corrections)))
+
+
+if __name__ == "__main__":
+    main()
@@ -91,6 +91,24 @@ export default function GenerateContract() {
     }
   };
 
+  // The PDF is rendered on first download and requires the bearer token
+  const handleDownloadPdf = async () => {
+    try {
+      const response = await fetch(pdfLink, {
+        headers: { Authorization: `Bearer ${getToken()}` },
+      });
+      if (!response.ok) {
+        throw new Error(`Download failed with status ${response.status}`);
+      }
+      const blob = await response.blob();
+      window.open(URL.createObjectURL(blob), "_blank", "noopener,noreferrer");
+    } catch (error) {
+      setError(true);
+      setMessage("An error occurred while downloading the PDF.");
+      console.error("PDF Download Error:", error);
+    }
+  };
+
   return (
     <div className="container mx-auto p-8 bg-gray-50 shadow-lg rounded-lg">
       <h2 className="text-2xl font-bold text-gray-700 mb-6 text-center">
@@ -273,14 +291,13 @@ export default function GenerateContract() {
 
       {pdfLink && (
         <p className="mt-4 text-center">
-          <a
-            href={pdfLink}
-            target="_blank"
-            rel="noopener noreferrer"
+          <button
+            type="button"
+            onClick={handleDownloadPdf}
             className="text-blue-600 hover:underline"
           >
             Download PDF
-          </a>
+          </button>
         </p>
       )}
 
@@ -0,0 +1,12 @@
+import os
+import tempfile
+
+# Settings are read when app modules are imported: point them at local,
+# throwaway resources before any test module imports the app
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("TRANSLATION_BACKEND", "stub")
+os.environ.setdefault("CHAT_EMBEDDING_BACKEND", "hashing")
+# Log and keep the translation memory in a throwaway directory rather than the repository
+_scratch = tempfile.mkdtemp(prefix="themis-test-")
+os.environ.setdefault("LOG_DIR", os.path.join(_scratch, "logs"))
+os.environ.setdefault("TRANSLATION_MEMORY_PATH", os.path.join(_scratch, "translation_memory.sqlite3"))
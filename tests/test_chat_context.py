@@ -0,0 +1,96 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.chat_context import ChatContextManager
+from app.core.database import Base
+from app.models.chat import Chat
+from app.models.message import Message
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Chat.__table__, Message.__table__])
+    session = sessionmaker(bind=engine)()
+    # A chat created directly, without its user and contract rows
+    session.execute(Chat.__table__.insert().values(id=1, user_id=1))
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def add_turns(db, count, start=1):
+    for turn in range(start, start + count):
+        db.add_all([
+            Message(chat_id=1, sender="user", content=f"question {turn}"),
+            Message(chat_id=1, sender="bot", content=f"answer {turn}"),
+        ])
+    db.commit()
+
+
+class Summarizer:
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+
+    def __call__(self, previous, messages, user_key=None, max_tokens=300):
+        self.calls.append((previous, [message["content"] for message in messages], user_key))
+        if self.fail:
+            raise RuntimeError("summarizer unavailable")
+        return f"{previous or ''}|{len(messages)} messages".lstrip("|")
+
+
+def test_short_chats_are_sent_whole(db):
+    summarizer = Summarizer()
+    manager = ChatContextManager(summarizer, recent_turns=2, summary_batch_turns=2)
+    add_turns(db, 4)
+    context = manager.load(db, db.get(Chat, 1))
+    assert context.summary is None
+    assert [message["content"] for message in context.history][:2] == ["question 1", "answer 1"]
+    assert len(context.history) == 8
+    assert summarizer.calls == []
+
+
+def test_older_turns_are_folded_into_the_summary(db):
+    summarizer = Summarizer()
+    manager = ChatContextManager(summarizer, recent_turns=2, summary_batch_turns=2)
+    add_turns(db, 5)
+    chat = db.get(Chat, 1)
+    context = manager.load(db, chat, user_key="u1")
+
+    assert summarizer.calls == [(None, ["question 1", "answer 1", "question 2", "answer 2", "question 3", "answer 3"], "u1")]
+    assert context.summary == "6 messages"
+    assert [message["content"] for message in context.history] == ["question 4", "answer 4", "question 5", "answer 5"]
+    assert chat.summarized_message_id == 6
+
+    # The cursor moved, so the next turns only read what came after it
+    add_turns(db, 4, start=6)
+    context = manager.load(db, chat)
+    assert context.summary == "6 messages|8 messages"
+    assert summarizer.calls[-1][0] == "6 messages"
+    assert [message["content"] for message in context.history][0] == "question 8"
+
+
+def test_failed_summary_keeps_the_cursor(db):
+    manager = ChatContextManager(Summarizer(fail=True), recent_turns=2, summary_batch_turns=2)
+    add_turns(db, 5)
+    chat = db.get(Chat, 1)
+    context = manager.load(db, chat)
+    assert chat.summarized_message_id is None and chat.summary is None
+    assert len(context.history) == 4
+
+
+def test_concurrent_fold_is_not_overwritten(db):
+    class ConcurrentSummarizer(Summarizer):
+        def __call__(self, previous, messages, user_key=None, max_tokens=300):
+            # Another turn folds and commits first
+            db.execute(Chat.__table__.update().values(summary="other turn", summarized_message_id=4))
+            db.commit()
+            return super().__call__(previous, messages, user_key, max_tokens)
+
+    manager = ChatContextManager(ConcurrentSummarizer(), recent_turns=2, summary_batch_turns=2)
+    add_turns(db, 5)
+    chat = db.get(Chat, 1)
+    manager.load(db, chat)
+    assert (chat.summary, chat.summarized_message_id) == ("other turn", 4)
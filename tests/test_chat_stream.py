@@ -0,0 +1,97 @@
+import asyncio
+import time
+
+import pytest
+
+from app.core.chat_stream import COMPLETED, DISCONNECTED, FAILED, ChatReplyStream
+
+
+class Reply:
+    """A model reply that records whether it was closed"""
+
+    def __init__(self, words, delay=0.0, fail_after=None):
+        self.words = words
+        self.delay = delay
+        self.fail_after = fail_after
+        self.closed = False
+        self.saved = []
+
+    def generate(self):
+        try:
+            for i, word in enumerate(self.words):
+                if i == self.fail_after:
+                    raise RuntimeError("provider error")
+                time.sleep(self.delay)
+                yield word
+        finally:
+            self.closed = True
+
+    def save(self, chat_id, text):
+        self.saved.append((chat_id, text))
+        return len(self.saved)
+
+
+def test_complete_reply_is_stored_once():
+    reply = Reply(["Clause ", "4 ", "applies."])
+    stream = ChatReplyStream(7, reply.generate, reply.save)
+
+    async def run():
+        pieces = [piece async for piece in stream.tokens()]
+        await stream.finish()
+        return pieces
+
+    assert asyncio.run(run()) == ["Clause ", "4 ", "applies."]
+    assert stream.status == COMPLETED
+    assert (stream.message_id, stream.text) == (1, "Clause 4 applies.")
+    assert reply.saved == [(7, "Clause 4 applies.")]
+
+
+def test_disconnect_stores_the_partial_reply_and_closes_the_model_request():
+    reply = Reply([f"word{i} " for i in range(100)], delay=0.005)
+    stream = ChatReplyStream(3, reply.generate, reply.save)
+
+    async def run():
+        async def consume():
+            received = 0
+            async for _ in stream.tokens():
+                received += 1
+                if received == 2:
+                    await asyncio.sleep(10)
+
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.2)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await stream.finish()
+
+    asyncio.run(run())
+    assert stream.status == DISCONNECTED
+    assert reply.saved == [(3, "word0 word1 ")]
+    assert reply.closed
+
+
+def test_failed_reply_keeps_what_was_generated():
+    reply = Reply(["The ", "term ", "is"], fail_after=2)
+    stream = ChatReplyStream(5, reply.generate, reply.save)
+
+    async def run():
+        async for _ in stream.tokens():
+            pass
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(run())
+    assert stream.status == FAILED
+    assert reply.saved == [(5, "The term ")]
+
+
+def test_empty_reply_is_not_stored():
+    reply = Reply([])
+    stream = ChatReplyStream(1, reply.generate, reply.save)
+
+    async def run():
+        async for _ in stream.tokens():
+            pass
+
+    asyncio.run(run())
+    assert stream.status == COMPLETED
+    assert stream.message_id is None and reply.saved == []
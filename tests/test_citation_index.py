@@ -0,0 +1,33 @@
+from app.agents.citation_index import index_citations
+from app.agents.contract_document import ContractDocument
+
+DRAFT = """This agreement follows the Contract Act [Ref 2].
+
+1. SCOPE
+
+1.1 The Supplier shall comply with the law [Ref 1] and the standards [ref. 3].
+
+[References used: Ref 1, Ref 3]
+
+2. FEES
+
+The Client shall pay the fees [Ref 1] subject to tax [Ref 7].
+"""
+
+
+def test_citations_map_to_the_sections_citing_them():
+    assert index_citations(DRAFT, reference_count=3) == {
+        2: ["Preamble"],
+        1: ["1.1", "2. FEES"],
+        3: ["1.1"],
+    }
+
+
+def test_out_of_range_numbers_are_ignored_only_with_a_reference_count():
+    assert 7 not in index_citations(DRAFT, reference_count=3)
+    assert index_citations(DRAFT)[7] == ["2. FEES"]
+    assert index_citations("Nothing here [Ref 0].") == {}
+
+
+def test_a_prebuilt_document_gives_the_same_index():
+    assert index_citations(DRAFT, 3, ContractDocument(DRAFT)) == index_citations(DRAFT, 3)
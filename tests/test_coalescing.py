@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from app.core.coalescing import PENDING, IdempotencyStore, SingleFlight, requirements_fingerprint
+
+
+def test_fingerprint_ignores_key_order():
+    assert requirements_fingerprint({"a": 1, "b": [2, 3]}) == requirements_fingerprint({"b": [2, 3], "a": 1})
+    assert requirements_fingerprint({"a": 1}) != requirements_fingerprint({"a": 2})
+
+
+def test_concurrent_callers_share_one_execution():
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "contract"
+
+    async def main():
+        flight = SingleFlight()
+        results = await asyncio.gather(*(flight.do("key", work) for _ in range(5)))
+        return results, flight.in_flight()
+
+    results, in_flight = asyncio.run(main())
+    assert results == ["contract"] * 5
+    assert len(calls) == 1
+    assert in_flight == 0
+
+
+def test_cancelling_the_leader_does_not_cancel_followers():
+    async def work():
+        await asyncio.sleep(0.05)
+        return "contract"
+
+    async def main():
+        flight = SingleFlight()
+        leader = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(main()) == "contract"
+
+
+def test_errors_reach_every_caller_and_release_the_key():
+    async def work():
+        await asyncio.sleep(0.01)
+        raise ValueError("drafting failed")
+
+    async def main():
+        flight = SingleFlight()
+        results = await asyncio.gather(flight.do("key", work), flight.do("key", work), return_exceptions=True)
+        return results, flight.in_flight()
+
+    results, in_flight = asyncio.run(main())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert in_flight == 0
+
+
+def test_idempotency_key_is_reserved_by_the_first_request():
+    store = IdempotencyStore(ttl_seconds=60)
+    assert store.reserve("key", "fingerprint-a") is None
+    # A concurrent repeat sees the reservation instead of running too
+    assert store.reserve("key", "fingerprint-a") == ("fingerprint-a", PENDING)
+    assert store.reserve("key", "fingerprint-b") == ("fingerprint-a", PENDING)
+    store.put("key", "fingerprint-a", "response")
+    assert store.reserve("key", "fingerprint-a") == ("fingerprint-a", "response")
+
+
+def test_released_key_can_be_reserved_again():
+    store = IdempotencyStore(ttl_seconds=60)
+    store.reserve("key", "fingerprint-a")
+    store.release("key", "fingerprint-b")
+    assert store.get("key") == ("fingerprint-a", PENDING)
+    store.release("key", "fingerprint-a")
+    assert store.reserve("key", "fingerprint-b") is None
+
+
+def test_completed_results_are_not_released():
+    store = IdempotencyStore(ttl_seconds=60)
+    store.reserve("key", "fingerprint-a")
+    store.put("key", "fingerprint-a", "response")
+    store.release("key", "fingerprint-a")
+    assert store.get("key") == ("fingerprint-a", "response")
@@ -0,0 +1,80 @@
+from app.agents.contract_document import ContractDocument
+from app.agents.correction_agent import CorrectionAgent
+
+CONTRACT = """This agreement is made on 1 April 2024.
+
+1. DEFINITIONS
+
+1.1 "Services" means the services in Schedule A.
+
+2. PAYMENT TERMS
+
+The Client shall pay as follows.
+
+2.1 Fees are due within thirty days.
+2.2 Late payments attract interest.
+
+3. TERM
+
+3.1 This agreement lasts one year.
+"""
+
+
+def test_sections_and_parent_links():
+    document = ContractDocument(CONTRACT)
+    assert [section.key for section in document.sections] == [
+        ContractDocument.PREAMBLE, "1", "1.1", "2", "2.1", "2.2", "3", "3.1"
+    ]
+    payment = document.find("2")
+    assert document.children(payment) == [document.find("2.1"), document.find("2.2")]
+    assert document.sections[document.find("2.1")].parent == payment
+    assert document.sections[payment].parent is None
+    assert document.children(0) == []
+
+
+def test_section_covers_its_sub_sections():
+    document = ContractDocument(CONTRACT)
+    payment = document.find("Payment Terms")
+    assert document.find("2") == document.find("Section 2") == payment
+    text = document.section_text(payment)
+    assert "2.1 Fees are due" in text and "2.2 Late payments" in text
+    assert "3. TERM" not in text
+    assert document.own_text(payment).strip() == "2. PAYMENT TERMS\n\nThe Client shall pay as follows."
+    assert document.section_body(document.find("2.2")) == "Late payments attract interest."
+    assert document.section_text(0) == "This agreement is made on 1 April 2024.\n\n"
+
+
+def test_replacing_a_section_replaces_its_sub_sections():
+    document = ContractDocument(CONTRACT)
+    document.replace_section(document.find("2"), "The Client shall pay on signature.")
+    assert document.text == CONTRACT.replace(
+        "The Client shall pay as follows.\n\n2.1 Fees are due within thirty days.\n2.2 Late payments attract interest.",
+        "The Client shall pay on signature."
+    )
+    assert document.find("2.1") is None
+    assert document.section_body(document.find("3.1")) == "This agreement lasts one year."
+
+
+def test_replacing_a_sub_section_keeps_its_siblings():
+    document = ContractDocument(CONTRACT)
+    document.replace_section(document.find("2.1"), "Fees are due within ten days.")
+    document.replace_section(document.find("1.1"), '"Services" means the services in Schedule B.')
+    assert document.text == CONTRACT.replace("thirty days", "ten days").replace("Schedule A", "Schedule B")
+    assert document.offset(document.find("3")) == document.text.index("3. TERM")
+
+
+def test_markdown_headings_take_the_level_of_their_number():
+    document = ContractDocument("## 1. Scope\n\n1.1 The Supplier shall deliver.\n\n## 2. Fees\n\n2.1 The Client shall pay.\n")
+    scope = document.find("Scope")
+    assert "1.1 The Supplier shall deliver." in document.section_text(scope)
+    assert "Fees" not in document.section_text(scope)
+
+
+def test_feedback_on_a_section_covers_its_clauses():
+    contract = {"content": CONTRACT}
+    updated, corrections = CorrectionAgent().process_feedback(contract, [
+        {"section": "Payment Terms", "suggested_change": "The Client shall pay in advance.", "reason": "Cash flow"},
+    ])
+    assert "2.1" in corrections[0].original_text and "2.2" in corrections[0].original_text
+    assert "2.1 Fees" not in updated["content"]
+    assert "2. PAYMENT TERMS\n\nThe Client shall pay in advance.\n\n3. TERM" in updated["content"]
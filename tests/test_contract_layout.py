@@ -0,0 +1,73 @@
+import io
+
+from app.agents.contract_layout import (
+    CLAUSE, HEADING, LIST_ITEM, PARAGRAPH, SIGNATURE, TITLE, _flowables, build_pdf, clause_number, heading_text,
+    parse_contract,
+)
+
+CONTRACT = """SERVICE AGREEMENT
+
+1. SCOPE OF SERVICES
+
+1.1 The Service Provider shall perform the Services.
+1.1.1 Reports are delivered monthly.
+
+- maintain insurance
+- keep records
+
+The parties agree that time is of the essence.
+Any delay attracts interest.
+
+IN WITNESS WHEREOF
+
+Signature: ____________________
+Printed name: A. Sharma
+"""
+
+
+def test_blocks_follow_the_contract_structure():
+    blocks = parse_contract(CONTRACT)
+    assert [block.kind for block in blocks] == [
+        TITLE, HEADING, CLAUSE, CLAUSE, LIST_ITEM, LIST_ITEM, PARAGRAPH, SIGNATURE, SIGNATURE
+    ]
+    assert blocks[0].text == "SERVICE AGREEMENT"
+    assert [block.level for block in blocks if block.kind == CLAUSE] == [1, 2]
+    assert blocks[6].text == "The parties agree that time is of the essence. Any delay attracts interest."
+    assert blocks[-1].text == "Signature: ____________________\nPrinted name: A. Sharma"
+
+
+def test_headings_and_clause_numbers():
+    assert heading_text("## Payment Terms") == "Payment Terms"
+    assert heading_text("2. PAYMENT TERMS") == "2. PAYMENT TERMS"
+    assert heading_text("The Client shall pay.") is None
+    assert clause_number("2.1 The Client shall pay.") == "2.1"
+    assert clause_number("2. PAYMENT TERMS") is None
+
+
+def test_pdf_is_built_with_markup_escaped():
+    output = io.BytesIO()
+    pages = build_pdf(parse_contract(CONTRACT + "\n<Schedule> & **annexure**\n"), output)
+    assert pages == 1
+    assert output.getvalue().startswith(b"%PDF")
+
+
+def test_clauses_mentioning_signatures_stay_clauses():
+    blocks = parse_contract(
+        "1.1 This Agreement takes effect on signature by both parties.\n"
+        "2. WITNESS PROVISIONS\n"
+        "2.1 Each witness shall sign in ink.\n"
+        "The signature page follows.\n"
+        "\n"
+        "Witness 1\n"
+        "Name: Anil Mehta\n"
+    )
+    assert [block.kind for block in blocks] == [CLAUSE, HEADING, CLAUSE, PARAGRAPH, SIGNATURE]
+    assert blocks[1].text == "2. WITNESS PROVISIONS"
+    assert blocks[-1].text == "Witness 1\nName: Anil Mehta"
+
+
+def test_nested_clauses_share_one_style_per_level():
+    story = _flowables(parse_contract("1.1.1 First.\n1.1.2 Second.\n1.1.1.1 Deeper.\n"))
+    assert story[0].style is story[1].style
+    assert story[0].style.leftIndent == 12
+    assert story[2].style.leftIndent == 24
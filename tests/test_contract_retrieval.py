@@ -0,0 +1,80 @@
+from app.agents.contract_retrieval import ContractSectionIndex, chunk_contract, hashing_embedding
+
+CONTRACT = """SERVICE AGREEMENT
+
+This Agreement is made between Acme Ltd and Beta LLP.
+
+1. PAYMENT TERMS
+
+1.1 The Client shall pay each invoice within thirty days.
+1.2 Late payments bear interest at 18% per annum.
+
+2. TERMINATION
+
+Either party may terminate this Agreement on sixty days written notice.
+
+3. CONFIDENTIALITY
+
+Each party shall keep the other's Confidential Information secret for five years.
+
+4. DISPUTE RESOLUTION
+
+Disputes are referred to arbitration in Mumbai.
+"""
+
+
+def test_chunks_are_titled_with_their_headings():
+    chunks = chunk_contract(CONTRACT)
+    assert [chunk.title for chunk in chunks] == [
+        "SERVICE AGREEMENT",
+        "1. PAYMENT TERMS / 1.1 The Client shall pay each invoice within thirty days.",
+        "1. PAYMENT TERMS / 1.2 Late payments bear interest at 18% per annum.",
+        "2. TERMINATION",
+        "3. CONFIDENTIALITY",
+        "4. DISPUTE RESOLUTION",
+    ]
+    # A parent's chunk holds only its own text, not its clauses'
+    assert chunks[0].text == "SERVICE AGREEMENT\n\nThis Agreement is made between Acme Ltd and Beta LLP."
+
+
+def test_long_sections_are_split_at_paragraphs():
+    content = "1. SCOPE\n\n" + "\n\n".join(f"Paragraph {n} describes the services in some detail." for n in range(20))
+    chunks = chunk_contract(content, max_chunk_tokens=40)
+    assert len(chunks) > 1
+    assert all(chunk.title == "1. SCOPE" for chunk in chunks)
+    assert all(chunk.tokens <= 40 for chunk in chunks[1:])
+
+
+def test_most_relevant_sections_are_returned_in_contract_order():
+    index = ContractSectionIndex(hashing_embedding, top_k=2)
+    grounding = index.retrieve(1, "v1", lambda: CONTRACT, "Where are disputes referred to arbitration? How much notice to terminate?")
+    assert [chunk.title for chunk in grounding.sections] == ["2. TERMINATION", "4. DISPUTE RESOLUTION"]
+    assert grounding.tokens_saved == grounding.contract_tokens - grounding.prompt_tokens > 0
+    assert grounding.excerpt.startswith("[2. TERMINATION]\n2. TERMINATION")
+
+
+def test_small_contracts_are_sent_whole():
+    index = ContractSectionIndex(hashing_embedding, top_k=10)
+    grounding = index.retrieve(1, "v1", lambda: CONTRACT, "anything")
+    assert len(grounding.sections) == len(chunk_contract(CONTRACT))
+
+
+def test_contract_is_embedded_once_per_version():
+    loads = []
+
+    def load():
+        loads.append(1)
+        return CONTRACT
+
+    index = ContractSectionIndex(hashing_embedding, top_k=2, cache_size=1)
+    index.retrieve(1, "v1", load, "notice")
+    index.retrieve(1, "v1", load, "arbitration")
+    assert len(loads) == 1
+    index.retrieve(1, "v2", load, "notice")
+    assert len(loads) == 2
+    index.retrieve(2, "v1", load, "notice")
+    index.retrieve(1, "v2", load, "notice")  # evicted by contract 2
+    assert len(loads) == 4
+    index.invalidate(1)
+    index.retrieve(1, "v2", load, "notice")
+    assert len(loads) == 5
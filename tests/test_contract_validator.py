@@ -0,0 +1,126 @@
+import pytest
+
+from app.agents.contract_validator import (
+    DANGLING_REFERENCE, ERROR, NUMBERING, PARTY_MISMATCH, PARTY_MISSING, UNDEFINED_TERM, WARNING, ContractValidator
+)
+
+PARTIES = ("Acme Private Limited", "Ravi Sharma")
+
+
+def contract(opening, body="", signature="Name: Acme Private Limited\nName: Ravi Sharma\n"):
+    return (
+        "EMPLOYMENT AGREEMENT\n\n"
+        f"{opening}\n\n"
+        "1. DEFINITIONS\n\n1.1 \"Salary\" means the monthly pay.\n\n"
+        f"2. DUTIES\n\n2.1 The Employee shall work diligently. {body}\n\n"
+        f"{signature}"
+    )
+
+
+def codes(text, **kwargs):
+    report = ContractValidator().validate(text, parties=PARTIES, **kwargs)
+    return [finding.code for finding in report.findings]
+
+
+def test_clean_contract_has_no_findings():
+    text = contract('This Agreement is made between Acme Private Limited (the "Employer") and Ravi Sharma (the "Employee").')
+    assert codes(text) == []
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        "Disputes between the Employer and any customer go to arbitration.",
+        "Working hours are between 9 am and 6 pm.",
+        "Any conflict between this clause and Schedule A is resolved in favour of this clause.",
+    ],
+)
+def test_between_in_the_body_is_not_a_party_clause(body):
+    text = contract('This Agreement is made between Acme Private Limited (the "Employer") and Ravi Sharma.', body)
+    assert PARTY_MISMATCH not in codes(text)
+
+
+@pytest.mark.parametrize(
+    "opening",
+    [
+        'This Agreement is made between the Employer and the Employee, being Acme Private Limited '
+        '(the "Employer") and Ravi Sharma (the "Employee").',
+        "This Agreement is made between Acme Pvt. Ltd. and Ravi Sharma.",
+        "This Agreement is made between Acme Pvt Ltd and Mr. Ravi Sharma.",
+        'Acme Private Limited (the "Employer") records the terms agreed between itself and the Employee, Ravi Sharma.',
+        "This Agreement is made between Ravi Sharma and Acme Pvt. Ltd.",
+        "This Agreement is made between the First Party and the Second Party, Acme Private Limited and Ravi Sharma.",
+    ],
+)
+def test_roles_pronouns_and_short_company_suffixes_are_accepted(opening):
+    assert PARTY_MISMATCH not in codes(contract(opening))
+
+
+def test_wrong_party_names_are_reported():
+    text = contract(
+        "This Agreement is made between Beta Industries Ltd and Ravi Sharma.",
+        signature="Name: Acme Holdings Ltd\nName: Ravi Sharma\n",
+    )
+    report = ContractValidator().validate(text, parties=PARTIES)
+    mismatches = [finding for finding in report.findings if finding.code == PARTY_MISMATCH]
+    lines = text.splitlines()
+    assert [finding.line for finding in mismatches] == [
+        lines.index("This Agreement is made between Beta Industries Ltd and Ravi Sharma.") + 1,
+        lines.index("Name: Acme Holdings Ltd") + 1,
+    ]
+    assert "Acme Holdings Ltd" in mismatches[1].message
+
+
+def test_signatories_and_witnesses_are_not_parties():
+    text = contract(
+        "This Agreement is made between Acme Private Limited and Ravi Sharma.",
+        signature=(
+            "For Acme Private Limited\nName: Rajesh Kumar\nTitle: Director\n\n"
+            "Ravi Sharma\nName: Ravi Sharma\n\n"
+            "Witness 1\nName: Anil Mehta\n"
+        ),
+    )
+    assert codes(text) == []
+
+
+def test_signature_headers_and_unknown_signatories_are_checked():
+    text = contract(
+        "This Agreement is made between Acme Private Limited and Ravi Sharma.",
+        signature="For Beta Industries Ltd\nName: Rajesh Kumar\n\nName: Suresh Iyer\n",
+    )
+    report = ContractValidator().validate(text, parties=PARTIES)
+    mismatches = [(finding.severity, finding.line) for finding in report.findings if finding.code == PARTY_MISMATCH]
+    lines = text.splitlines()
+    assert mismatches == [
+        (ERROR, lines.index("For Beta Industries Ltd") + 1),
+        (WARNING, lines.index("Name: Suresh Iyer") + 1),
+    ]
+
+
+def test_missing_party_is_reported():
+    text = contract("This Agreement is made between Acme Private Limited and Ravi Sharma.")
+    report = ContractValidator().validate(text, parties=("Acme Private Limited", "Priya Nair"))
+    assert PARTY_MISSING in [finding.code for finding in report.findings]
+
+
+def test_parties_are_found_under_their_long_or_short_company_names():
+    text = contract(
+        "This Agreement is made between Acme Private Limited and Mr. Ravi Sharma.",
+        signature="For Acme Private Limited\nName: Rajesh Kumar\n",
+    )
+    report = ContractValidator().validate(text, parties=("Acme Pvt. Ltd.", "Ravi Sharma"))
+    assert PARTY_MISSING not in [finding.code for finding in report.findings]
+    report = ContractValidator().validate(text, parties=("Acme Pvt. Ltd.", "Ravi Sharmaji"))
+    assert [finding.message for finding in report.findings if finding.code == PARTY_MISSING] == [
+        "Party 'Ravi Sharmaji' is not named in the contract"
+    ]
+
+
+def test_numbering_references_and_terms():
+    text = (
+        "1. SCOPE\n\n1.1 The \"Services\" are listed here. [Ref 1]\n1.3 Access is through the Client Portal. [Ref 4]\n\n"
+        "3. FEES\n\nThe fee covers the Services.\n"
+    )
+    report = ContractValidator().validate(text, reference_count=2)
+    assert [finding.code for finding in report.findings] == [NUMBERING, DANGLING_REFERENCE, UNDEFINED_TERM, NUMBERING]
+    assert set(report.sections_to_regenerate()) == {2}
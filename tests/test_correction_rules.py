@@ -0,0 +1,67 @@
+import pytest
+
+from app.agents.correction_rules import Rule, RuleEngine, standard_rule_engine
+
+
+def correct(text):
+    return standard_rule_engine.apply(text)[0]
+
+
+def test_collapses_spacing_and_keeps_line_structure():
+    text = "1.1  The Client  shall pay , as agreed.   \r\n  - monthly reports\n\n\n\nEnd."
+    assert correct(text) == "1.1 The Client shall pay, as agreed.\n  - monthly reports\n\nEnd."
+
+
+def test_drops_doubled_punctuation_but_keeps_ellipses():
+    assert correct("as agreed.. Payment,, then;; more...") == "as agreed. Payment, then; more..."
+
+
+def test_capitalises_after_a_sentence_end():
+    corrected, hits = standard_rule_engine.apply("The term is one year. the fee is fixed! it is due? yes")
+    assert corrected == "The term is one year. The fee is fixed! It is due? Yes"
+    assert hits["sentence_capitalization"] == 3
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "ABC Pvt. Ltd. and XYZ Ltd. the parties",
+        "a sum of Rs. five lakh",
+        "Acme Co. and its affiliates",
+        "Acme Inc. and its affiliates",
+        "under Sec. nine of the Act",
+        "as per sec. nine of the Act",
+        "see Cl. four below",
+        "under Art. fourteen of the Constitution",
+        "signed by Mr. sharma",
+        "signed by Mrs. rao and Ms. iyer",
+        "examined by Dr. mehta",
+        "listed in Sch. one",
+        "as set out in Para. two",
+        "Smt. devi and Shri. kumar",
+        "goods, services, etc. as listed",
+        "the parties, viz. the buyer",
+        "a record, e.g. an invoice",
+        "the seller, i.e. the company",
+        "Acme vs. the state",
+        "Acme v. the state",
+        "at No. twelve",
+    ],
+)
+def test_abbreviations_do_not_end_a_sentence(text):
+    assert correct(text) == text
+
+
+def test_abbreviation_must_be_a_whole_word():
+    # "deltd." is not "Ltd.", so the next word starts a sentence
+    assert correct("it was deltd. the end") == "it was deltd. The end"
+
+
+def test_engine_counts_hits_per_rule():
+    engine = RuleEngine([Rule("no_tabs", r"\t", " ")])
+    assert engine.apply("a\tb\tc") == ("a b c", {"no_tabs": 2})
+
+
+def test_capturing_groups_are_rejected():
+    with pytest.raises(ValueError, match="capturing groups"):
+        RuleEngine([Rule("grouped", r"(a)b", "")])
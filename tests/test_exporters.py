@@ -0,0 +1,144 @@
+import io
+import os
+import tempfile
+import zipfile
+from datetime import datetime
+
+import pytest
+
+from app.agents import exporters
+from app.agents.exporters import EXPORTERS, document_model, get_exporter, render_export, render_export_buffer
+
+CONTRACT = """SERVICE AGREEMENT
+
+1. PAYMENT TERMS
+
+2.1 The Client shall pay fees of Rs. 10,000 <plus GST> & expenses.
+
+- monthly invoices
+
+Signature: ____________________
+"""
+
+
+def test_every_format_is_registered():
+    assert set(EXPORTERS) == {"pdf", "docx", "html", "md"}
+    with pytest.raises(ValueError):
+        get_exporter("rtf")
+
+
+@pytest.mark.parametrize("fmt", sorted(EXPORTERS))
+def test_render_export_writes_the_file(tmp_path, fmt):
+    exporter = get_exporter(fmt)
+    path = tmp_path / f"contract{exporter.suffix}"
+    result = render_export(fmt, CONTRACT, str(path))
+    assert result["path"] == str(path) and result["format"] == fmt
+    assert path.stat().st_size > 0
+    assert list(tmp_path.iterdir()) == [path]  # no temporary files left behind
+
+
+def test_text_formats_escape_and_structure_the_contract():
+    blocks = document_model(CONTRACT)
+    html_output, markdown_output, docx_output = io.BytesIO(), io.BytesIO(), io.BytesIO()
+    get_exporter("html").render(blocks, html_output)
+    get_exporter("md").render(blocks, markdown_output)
+    get_exporter("docx").render(blocks, docx_output)
+
+    html = html_output.getvalue().decode("utf-8")
+    assert "<h1>SERVICE AGREEMENT</h1>" in html and "&lt;plus GST&gt; &amp; expenses" in html
+    assert "<ul>\n<li>monthly invoices</li>\n</ul>" in html
+    assert markdown_output.getvalue().decode("utf-8").startswith("# SERVICE AGREEMENT\n\n## 1. PAYMENT TERMS\n")
+    with zipfile.ZipFile(docx_output) as package:
+        assert {"[Content_Types].xml", "word/document.xml", "word/styles.xml"} <= set(package.namelist())
+        assert "&lt;plus GST&gt; &amp; expenses" in package.read("word/document.xml").decode("utf-8")
+
+
+def test_clauses_mentioning_signatures_are_not_exported_as_signature_blocks():
+    blocks = document_model(
+        "SERVICE AGREEMENT\n\n"
+        "2. WITNESS PROVISIONS\n"
+        "2.1 This Agreement takes effect on signature by both parties.\n"
+        "2.2 Each witness shall sign in ink.\n\n"
+        "Signature: ____________________\n"
+    )
+    html_output, markdown_output, docx_output = io.BytesIO(), io.BytesIO(), io.BytesIO()
+    get_exporter("html").render(blocks, html_output)
+    get_exporter("md").render(blocks, markdown_output)
+    get_exporter("docx").render(blocks, docx_output)
+
+    html = html_output.getvalue().decode("utf-8")
+    assert "<h2>2. WITNESS PROVISIONS</h2>" in html
+    assert '<p class="clause">2.1 This Agreement takes effect on signature by both parties.</p>' in html
+    assert html.count('class="signature"') == 1
+    assert '<p class="signature">Signature: ____________________</p>' in html
+    markdown = markdown_output.getvalue().decode("utf-8")
+    assert "## 2. WITNESS PROVISIONS\n\n2.1 This Agreement" in markdown
+    assert "parties.\n\n2.2 Each witness shall sign in ink.\n\nSignature:" in markdown
+    with zipfile.ZipFile(docx_output) as package:
+        document = package.read("word/document.xml").decode("utf-8")
+    assert document.count('<w:pStyle w:val="Signature"/>') == 1
+    assert '<w:pStyle w:val="Heading1"/></w:pPr><w:r><w:t xml:space="preserve">2. WITNESS PROVISIONS' in document
+
+
+def test_document_model_is_cached_per_contract_version(monkeypatch):
+    parses = []
+    parse = exporters.parse_contract
+    monkeypatch.setattr(exporters, "parse_contract", lambda text: parses.append(text) or parse(text))
+    version = datetime(2026, 1, 1)
+    first = document_model(CONTRACT, 101, version)
+    assert document_model(CONTRACT, 101, version) is first
+    assert len(parses) == 1
+
+    # Updated through another worker: a new version is parsed afresh
+    updated = CONTRACT.replace("Rs. 10,000", "Rs. 12,000")
+    blocks = document_model(updated, 101, datetime(2026, 1, 2))
+    assert len(parses) == 2
+    assert "Rs. 12,000" in " ".join(block.text for block in blocks)
+
+
+@pytest.mark.parametrize("fmt", sorted(EXPORTERS))
+def test_small_output_is_returned_from_memory(fmt):
+    result = render_export_buffer(fmt, CONTRACT, spill_threshold=10 * 1024 * 1024, trace_memory=False)
+    assert result["spill_path"] is None
+    assert len(result["data"]) == result["size"] == result["buffered_bytes"]
+
+
+@pytest.mark.parametrize("fmt", sorted(EXPORTERS))
+def test_large_output_spills_to_disk_while_it_is_written(fmt):
+    contract = CONTRACT + "\n\n".join(f"{n}. CLAUSE {n}\n\nThe parties agree to term {n}." for n in range(2, 300))
+    in_memory = render_export_buffer(fmt, contract, spill_threshold=10 * 1024 * 1024, trace_memory=False)
+    threshold = in_memory["size"] // 4
+    result = render_export_buffer(fmt, contract, spill_threshold=threshold, trace_memory=False)
+    try:
+        assert result["data"] is None
+        assert result["buffered_bytes"] <= threshold
+        with open(result["spill_path"], "rb") as spilled:
+            output = spilled.read()
+        assert len(output) == result["size"]
+        if fmt == "docx":
+            with zipfile.ZipFile(io.BytesIO(output)) as package, \
+                    zipfile.ZipFile(io.BytesIO(in_memory["data"])) as expected:
+                assert package.read("word/document.xml") == expected.read("word/document.xml")
+        elif fmt == "pdf":
+            assert output.startswith(b"%PDF") and output.rstrip().endswith(b"%%EOF")
+        else:
+            assert output == in_memory["data"]
+    finally:
+        os.remove(result["spill_path"])
+
+
+def test_failed_render_leaves_no_spill_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+
+    class Failing(exporters.Exporter):
+        format = "failing"
+        suffix = ".bin"
+
+        def render(self, blocks, output):
+            output.write(b"x" * 100)
+            raise RuntimeError("layout failed")
+
+    monkeypatch.setitem(EXPORTERS, "failing", Failing())
+    with pytest.raises(RuntimeError):
+        render_export_buffer("failing", CONTRACT, spill_threshold=10, trace_memory=False)
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,22 @@
+import asyncio
+
+from starlette.background import BackgroundTask
+
+from app.core.file_serving import FileRangeResponse
+
+
+def test_range_response_sends_the_range_and_runs_its_background_task(tmp_path):
+    path = tmp_path / "contract.pdf"
+    path.write_bytes(b"0123456789")
+    done = []
+    response = FileRangeResponse(str(path), 2, 5, 10, {"etag": '"key"'}, "application/pdf")
+    response.background = BackgroundTask(done.append, True)
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(response({"type": "http", "method": "GET"}, None, send))
+    assert messages[0]["status"] == 206
+    assert b"".join(message.get("body", b"") for message in messages[1:]) == b"2345"
+    assert done == [True]
@@ -0,0 +1,68 @@
+from app.agents.jurisdiction_agent import JurisdictionCustomizationAgent
+from app.agents.localization import LocalizationStats
+
+DRAFT = "SERVICE AGREEMENT\n\n1. SCOPE\n\nThe Supplier shall deliver the Services."
+
+
+class RecordingLocalizer:
+    def __init__(self):
+        self.calls = []
+
+    def localize(self, text, language, user_key=None):
+        self.calls.append((language, user_key))
+        return f"[{language}] {text}", LocalizationStats(language=language, segments=1, translated=1)
+
+
+def test_clauses_are_appended_once_and_aliases_resolved():
+    agent = JurisdictionCustomizationAgent()
+    customized = agent.customize_for_jurisdiction(DRAFT, "MH", ["Bangalore"])
+    assert customized == (
+        DRAFT
+        + "\n\nGoverning Law: This contract shall be governed by the laws of Maharashtra."
+        + "\n\nThis contract complies with the regulations of Maharashtra."
+        + "\n\nMulti-jurisdictional Application: While this contract is primarily governed by the laws of "
+        "Maharashtra, it also considers the relevant regulations of the following jurisdictions: Karnataka."
+    )
+
+
+def test_customizing_again_replaces_the_clauses():
+    agent = JurisdictionCustomizationAgent()
+    first = agent.customize_for_jurisdiction(DRAFT, "Maharashtra", ["Karnataka"])
+    second = agent.customize_for_jurisdiction(first, "Karnataka")
+    assert second == (
+        DRAFT
+        + "\n\nGoverning Law: This contract shall be governed by the laws of Karnataka."
+        + "\n\nThis contract complies with the regulations of Karnataka."
+    )
+
+
+def test_dict_contracts_get_metadata_without_touching_the_input():
+    agent = JurisdictionCustomizationAgent()
+    contract = {"content": DRAFT, "metadata": {"id": 7}}
+    customized = agent.customize_for_jurisdiction(contract, "IN-MH")
+    assert contract == {"content": DRAFT, "metadata": {"id": 7}}
+    metadata = customized["metadata"]
+    assert metadata["id"] == 7
+    assert metadata["jurisdictions"] == {"primary": "Maharashtra", "additional": []}
+    assert metadata["compliance_statement"] == "This contract complies with the regulations of Maharashtra."
+    assert {requirement["requirement_id"] for requirement in metadata["requirements"]} >= {"stamp-duty", "contract-act"}
+
+
+def test_translation_picks_the_jurisdictions_language():
+    localizer = RecordingLocalizer()
+    agent = JurisdictionCustomizationAgent(localizer=localizer)
+    customized = agent.customize_for_jurisdiction(
+        {"content": DRAFT}, "Maharashtra", requirements={"translate": True, "user_key": "u1"}
+    )
+    assert localizer.calls == [("mr", "u1")]
+    assert customized["content"].startswith("[mr] SERVICE AGREEMENT")
+    assert customized["content"].endswith("regulations of Maharashtra.")
+    assert customized["metadata"]["languages"] == ["mr", "en"]
+    assert customized["metadata"]["localization"]["translated"] == 1
+
+
+def test_english_target_is_not_translated():
+    localizer = RecordingLocalizer()
+    agent = JurisdictionCustomizationAgent(localizer=localizer)
+    agent.customize_for_jurisdiction(DRAFT, "India", requirements={"translate": True, "target_language": "en"})
+    assert localizer.calls == []
@@ -0,0 +1,77 @@
+import pytest
+
+from app.agents.jurisdiction_registry import JurisdictionRegistry, get_jurisdiction_registry, normalize_jurisdiction
+
+ENTRIES = [
+    {
+        "code": "IN", "name": "India", "aliases": ["Bharat"], "languages": ["en", "hi"],
+        "requirements": [
+            {"id": "stamp-duty", "category": "regulatory", "description": "Pay stamp duty", "mandatory": True},
+            {"id": "language", "category": "language", "description": "English is accepted"},
+        ],
+    },
+    {
+        "code": "IN-MH", "name": "Maharashtra", "parent": "IN", "aliases": ["MH", "Bombay"], "languages": ["mr", "en"],
+        "requirements": [
+            {"id": "stamp-duty", "category": "regulatory", "description": "Pay Maharashtra stamp duty", "mandatory": True},
+        ],
+    },
+    {"code": "IN-KA", "name": "Karnataka", "parent": "IN", "aliases": ["KA"]},
+]
+
+
+@pytest.fixture
+def registry():
+    return JurisdictionRegistry(ENTRIES)
+
+
+def test_normalize_jurisdiction():
+    assert normalize_jurisdiction("  The State of  Maharashtra. ") == "maharashtra"
+    assert normalize_jurisdiction("Union Territory of Ladakh") == "ladakh"
+
+
+@pytest.mark.parametrize("name", ["IN-MH", "MH", "maharashtra", "State of Maharashtra", "Bombay", "Pune, Maharashtra, India"])
+def test_names_codes_and_aliases_resolve_to_one_entry(registry, name):
+    assert registry.get(name).code == "IN-MH"
+
+
+def test_unknown_names(registry):
+    assert registry.get("Atlantis") is None
+    assert registry.get("") is None
+    assert registry.canonical_name("Atlantis") == "Atlantis"
+    assert "Atlantis" not in registry
+    assert registry.requirements("Atlantis") == ()
+
+
+def test_requirements_and_languages_are_inherited(registry):
+    karnataka = registry.get("KA")
+    assert karnataka.languages == ("en", "hi")
+    assert [requirement.requirement_id for requirement in karnataka.requirements] == ["stamp-duty", "language"]
+
+    maharashtra = registry.get("MH")
+    assert maharashtra.languages == ("mr", "en")
+    stamp_duty = maharashtra.requirements_for("regulatory")
+    assert [requirement.description for requirement in stamp_duty] == ["Pay Maharashtra stamp duty"]
+    assert stamp_duty[0].jurisdiction == "IN-MH"
+    assert len(maharashtra.mandatory_requirements) == 1
+    assert registry.requirements("Bombay", "language")[0].jurisdiction == "IN"
+
+
+@pytest.mark.parametrize(
+    "entries, message",
+    [
+        ([{"code": "A", "name": "A", "parent": "B"}, {"code": "B", "name": "B", "parent": "A"}], "cycle"),
+        ([{"code": "A", "name": "A", "parent": "Z"}], "Unknown parent"),
+        ([{"code": "A", "name": "A", "aliases": ["X"]}, {"code": "B", "name": "B", "aliases": ["x"]}], "used by both"),
+    ],
+)
+def test_invalid_registries_are_rejected(entries, message):
+    with pytest.raises(ValueError, match=message):
+        JurisdictionRegistry(entries)
+
+
+def test_bundled_registry_loads():
+    registry = get_jurisdiction_registry()
+    assert registry.get("India").code == "IN"
+    assert registry.canonical_name("Bengaluru") == "Karnataka"
+    assert all(registry.get(code) is not None for code in registry.codes())
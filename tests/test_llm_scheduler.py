@@ -0,0 +1,91 @@
+import threading
+import time
+
+import pytest
+
+from app.core.llm_scheduler import FairLLMScheduler, LLMCallCancelled, LLMPriority
+from app.core.metrics import metrics
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+def test_calls_return_the_result_and_free_the_slot():
+    scheduler = FairLLMScheduler(max_in_flight=2)
+    assert scheduler.call("user-1", LLMPriority.INTERACTIVE, lambda x: x * 2, 21) == 42
+    assert scheduler._in_flight == 0
+
+
+def test_rate_limit_halves_the_window():
+    scheduler = FairLLMScheduler(max_in_flight=8, backoff_interval=0)
+
+    def limited():
+        raise RateLimitError()
+
+    with pytest.raises(RateLimitError):
+        scheduler.call("user-1", LLMPriority.BATCH, limited)
+    assert scheduler._window == 4
+
+
+def test_waiting_users_are_served_round_robin():
+    scheduler = FairLLMScheduler(max_in_flight=1)
+    order = []
+    release = threading.Event()
+    holder = threading.Thread(target=scheduler.call, args=("holder", LLMPriority.BATCH, release.wait))
+    holder.start()
+    time.sleep(0.05)
+
+    threads = []
+    for user in ["a", "a", "a", "b"]:
+        thread = threading.Thread(target=scheduler.call, args=(user, LLMPriority.BATCH, order.append, user))
+        thread.start()
+        threads.append(thread)
+        time.sleep(0.02)
+    release.set()
+    for thread in [holder, *threads]:
+        thread.join()
+    # "b" arrived last but does not wait behind all of "a"'s calls
+    assert order.index("b") < 3
+
+
+def test_queue_wait_metrics_carry_no_user_ids():
+    scheduler = FairLLMScheduler(max_in_flight=1)
+    scheduler.call("user-12345", LLMPriority.INTERACTIVE, lambda: None)
+    series = metrics.snapshot()["summaries"]["llm_queue_wait_seconds"]
+    assert all("user" not in entry["labels"] for entry in series)
+    assert all("user-12345" not in entry["labels"].values() for entry in series)
+
+
+def test_cancelled_call_never_reaches_the_provider():
+    scheduler = FairLLMScheduler(max_in_flight=1)
+    cancel = threading.Event()
+    cancel.set()
+    calls = []
+    with pytest.raises(LLMCallCancelled):
+        scheduler.call("user-1", LLMPriority.BATCH, calls.append, 1, cancel=cancel)
+    assert calls == []
+    assert scheduler._in_flight == 0
+
+
+def test_cancelling_a_stream_closes_it():
+    scheduler = FairLLMScheduler(max_in_flight=1)
+    cancel = threading.Event()
+    closed = []
+
+    def chunks():
+        try:
+            for i in range(100):
+                yield i
+        finally:
+            closed.append(True)
+
+    received = []
+    with pytest.raises(LLMCallCancelled):
+        for chunk in scheduler.stream("user-1", LLMPriority.BATCH, chunks, cancel=cancel):
+            received.append(chunk)
+            if chunk == 2:
+                cancel.set()
+    assert received == [0, 1, 2]
+    assert closed == [True]
+    assert scheduler._in_flight == 0
@@ -0,0 +1,75 @@
+import pytest
+
+from app.agents.localization import Localizer
+from app.agents.translators import StubTranslator
+from app.core.translation_memory import TranslationMemory, normalize_segment
+
+
+class RecordingTranslator(StubTranslator):
+    def __init__(self):
+        super().__init__()
+        self.requests = []
+
+    def translate(self, segments, target_language, hints=None, user_key=None):
+        self.requests.append((list(segments), list(hints or [])))
+        return super().translate(segments, target_language, hints, user_key)
+
+
+@pytest.fixture
+def memory(tmp_path):
+    return TranslationMemory(str(tmp_path / "tm.sqlite3"))
+
+
+def localizer_for(memory, backend):
+    return Localizer(backend=backend, memory=memory, fuzzy_hint=0.5, batch_size=10)
+
+
+def test_segments_join_back_to_the_text():
+    text = "1. SCOPE\n\n1.1 The Supplier shall deliver. Payment is due on 5 May.\n  - keep records\n"
+    pieces = Localizer.segment(text)
+    assert "".join(piece for piece, _ in pieces) == text
+    assert [piece for piece, translatable in pieces if translatable] == [
+        "SCOPE", "The Supplier shall deliver.", "Payment is due on 5 May.", "keep records"
+    ]
+
+
+@pytest.mark.parametrize(
+    "stored, new",
+    [
+        ("The Employee shall not disclose Confidential Information.", "The Employee shall disclose Confidential Information."),
+        ("This applies during or after the term.", "This applies during and not after the term."),
+        ("The Supplier shall be liable for losses.", "The Supplier shall not be liable for losses."),
+    ],
+)
+def test_similar_segments_are_translated_with_a_hint_not_reused(memory, stored, new):
+    backend = RecordingTranslator()
+    localizer = localizer_for(memory, backend)
+    localizer.localize(stored, "hi")
+
+    text, stats = localizer.localize(new, "hi")
+    assert text == f"[hi] {new}"
+    assert backend.requests[-1] == ([new], [f"[hi] {stored}"])
+    assert (stats.exact_matches, stats.fuzzy_matches, stats.translated) == (0, 1, 1)
+
+
+def test_exact_matches_after_number_normalization_are_reused(memory):
+    backend = RecordingTranslator()
+    localizer = localizer_for(memory, backend)
+    localizer.localize("Pay INR 50,000 within 30 days.", "hi")
+
+    text, stats = localizer.localize("Pay  INR 75,000 within 15 days.", "hi")
+    assert text == "[hi] Pay INR 75,000 within 15 days."
+    assert backend.calls == 1
+    assert (stats.exact_matches, stats.translated, stats.hit_rate) == (1, 0, 1.0)
+
+
+def test_repeated_segments_are_translated_once(memory):
+    backend = RecordingTranslator()
+    text, stats = localizer_for(memory, backend).localize("Notice is required. Notice is required.\nNotice is required.", "mr")
+    assert text == "[mr] Notice is required. [mr] Notice is required.\n[mr] Notice is required."
+    assert backend.requests == [(["Notice is required."], [None])]
+    assert stats.segments == 1
+
+
+def test_normalize_segment():
+    assert normalize_segment("Pay  5,000 by 1 May") == ("Pay ⟦0⟧ by ⟦1⟧ May", ["5,000", "1"])
@@ -0,0 +1,54 @@
+import os
+
+from app.core.pdf_store import PdfStore
+
+
+def write(store, name, size):
+    key = PdfStore.key_for(name, "test")
+    path = store.path_for(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as file:
+        file.write(b"x" * size)
+    return key
+
+
+def test_least_recently_used_files_are_evicted_over_budget(tmp_path):
+    store = PdfStore(str(tmp_path), budget_bytes=250, max_age_seconds=3600)
+    first = write(store, "first", 100)
+    store.register(first)
+    second = write(store, "second", 100)
+    store.register(second)
+    assert store.lookup(first)  # now more recently used than second
+    store.register(write(store, "third", 100))
+
+    assert store.lookup(second) is None
+    assert store.lookup(first)
+    assert store.usage()["bytes"] == 200
+
+
+def test_pinned_file_survives_registration_over_budget(tmp_path):
+    store = PdfStore(str(tmp_path), budget_bytes=150, max_age_seconds=3600)
+    key = PdfStore.key_for("rendered for a waiting download", "test")
+    store.pin(key)
+    write(store, "rendered for a waiting download", 100)
+    store.register(key)
+    # Another render lands before the first download is streamed
+    other = write(store, "other", 100)
+    store.register(other)
+
+    assert os.path.exists(store.path_for(key))
+    assert store.lookup(key)
+    assert store.lookup(other) is None
+
+    store.unpin(key)
+    store.register(write(store, "later", 100))
+    assert store.lookup(key) is None
+
+
+def test_store_index_is_rebuilt_from_disk(tmp_path):
+    store = PdfStore(str(tmp_path), budget_bytes=1000, max_age_seconds=3600)
+    key = write(store, "kept", 100)
+    store.register(key)
+    reopened = PdfStore(str(tmp_path), budget_bytes=1000, max_age_seconds=3600)
+    assert reopened.lookup(key) == store.path_for(key)
+    assert reopened.usage()["bytes"] == 100
@@ -0,0 +1,203 @@
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from app.agents.correction_agent import CorrectionAgent
+from app.agents.drafting_agent import DraftingAgent
+from app.agents.jurisdiction_agent import JurisdictionCustomizationAgent
+from app.core.scheduler import StageClass, StageScheduler
+from app.pipeline import ContractPipeline
+
+
+class StubRetriever:
+    """Returns references derived from the request so leaks are visible."""
+
+    def search_legal_reference(self, user_inputs):
+        return [{
+            'title': f"Reference for {user_inputs['party1']}",
+            'content': f"Applies to {user_inputs['party1']} and {user_inputs['party2']}.",
+            'source': f"Act of {user_inputs['jurisdiction']}",
+            'categories': [user_inputs['contract_type']]
+        }]
+
+
+class StubCompletions:
+    """Echoes the parties named in the prompt back as a contract."""
+
+    def create(self, messages, stream=False, **kwargs):
+        prompt = messages[-1]["content"]
+        party1 = re.search(r"Employer: (.+)", prompt).group(1)
+        party2 = re.search(r"Employee: (.+)", prompt).group(1)
+        text = (
+            f"EMPLOYMENT AGREEMENT\n\n1. PARTIES\nthis agreement is between {party1} "
+            f"and {party2}. [Ref 1]\n\n2. TERM\nthe term is one year."
+        )
+        if stream:
+            return self.stream(prompt, text.split(" "))
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))])
+
+    def stream(self, prompt, words):
+        for i, word in enumerate(words):
+            piece = word if i == 0 else " " + word
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))])
+
+
+def stub_client():
+    return SimpleNamespace(chat=SimpleNamespace(completions=StubCompletions()))
+
+
+def inputs_for(i):
+    return {
+        "contract_type": "employment",
+        "party1": f"Employer-{i:04d}",
+        "party2": f"Employee-{i:04d}",
+        "jurisdiction": f"State-{i % 50:04d}",
+        "additional_jurisdictions": [],
+    }
+
+
+@pytest.fixture(scope="module")
+def scheduler():
+    scheduler = StageScheduler({StageClass.CPU: 4, StageClass.IO: 16})
+    yield scheduler
+    scheduler.shutdown()
+
+
+@pytest.mark.parametrize("speculative", [False, True])
+def test_concurrent_runs_keep_their_own_data(scheduler, speculative):
+    pipeline = ContractPipeline(
+        StubRetriever(),
+        DraftingAgent(client=stub_client()),
+        CorrectionAgent(),
+        JurisdictionCustomizationAgent(),
+        scheduler=scheduler,
+        speculative=speculative
+    )
+    runs = 200
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        results = list(pool.map(lambda i: (i, pipeline.run(inputs_for(i))), range(runs)))
+
+    for i, final_state in results:
+        assert not final_state["error"]
+        text = final_state["final_contract"]
+        seen = {name.lower() for name in re.findall(r"(?:Employer|Employee|State)-\d{4}", text, re.I)}
+        assert seen == {f"employer-{i:04d}", f"employee-{i:04d}", f"state-{i % 50:04d}"}
+        refs = final_state["legal_references"]
+        assert [ref['title'] for ref in refs] == [f"Reference for Employer-{i:04d}"]
+    if speculative:
+        stats = pipeline.speculation_stats()
+        assert stats["hits"] + stats["misses"] > 0
+
+
+class ChangingRetriever(StubRetriever):
+    """Returns different references on every call, slowly."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def search_legal_reference(self, user_inputs):
+        self.calls += 1
+        time.sleep(0.2)
+        refs = super().search_legal_reference(user_inputs)
+        refs[0]['content'] += f" Version {self.calls}."
+        return refs
+
+
+class SlowStreamingCompletions(StubCompletions):
+    """Streams one word every 10 ms and records how much of each stream was read."""
+
+    def __init__(self):
+        self.streams = []
+
+    def stream(self, prompt, words):
+        words = words * 20
+        record = {"version": re.search(r"Version (\d+)", prompt).group(1), "chunks": 0, "total": len(words), "closed": False}
+        self.streams.append(record)
+        try:
+            for chunk in super().stream(prompt, words):
+                time.sleep(0.01)
+                record["chunks"] += 1
+                yield chunk
+        finally:
+            record["closed"] = True
+
+
+def test_speculative_miss_cancels_the_speculative_call():
+    completions = SlowStreamingCompletions()
+    pipeline = ContractPipeline(
+        ChangingRetriever(),
+        DraftingAgent(client=SimpleNamespace(chat=SimpleNamespace(completions=completions))),
+        CorrectionAgent(),
+        JurisdictionCustomizationAgent(),
+        speculative=True
+    )
+    pipeline.run(inputs_for(1))  # fills the reference cache
+    final_state = pipeline.run(inputs_for(1))
+
+    assert pipeline.speculation_stats()["misses"] == 1
+    assert final_state["legal_references"][0]['content'].endswith("Version 2.")
+    # The speculative draft (with the cached version 1 references) was cut short
+    speculative = [record for record in completions.streams if record["version"] == "1"]
+    assert len(speculative) == 1
+    for _ in range(100):
+        if speculative[0]["closed"]:
+            break
+        time.sleep(0.01)
+    assert speculative[0]["closed"]
+    assert 0 < speculative[0]["chunks"] < speculative[0]["total"]
+
+
+class RecordingDrafter:
+    def __init__(self):
+        self.calls = []
+
+    def regenerate_section(self, section_text, problems, requirements, reference_count, user_key=None):
+        self.calls.append((section_text, problems))
+        return "The Client shall pay on signature. [Ref 1]"
+
+
+def test_regenerating_a_section_includes_its_sub_sections():
+    drafter = RecordingDrafter()
+    pipeline = ContractPipeline(
+        StubRetriever(), drafter, CorrectionAgent(), JurisdictionCustomizationAgent(), regenerate_sections=True
+    )
+    draft = (
+        "SERVICE AGREEMENT\n\n1. SCOPE\n\nThe Supplier shall deliver the Services. [Ref 1]\n\n"
+        "2. PAYMENT TERMS\n\nThe Client shall pay as follows. [Ref 4]\n\n"
+        "2.1 Fees are due within thirty days. [Ref 5]\n2.2 Late payments attract interest.\n\n"
+        "3. TERM\n\nThis agreement lasts one year.\n"
+    )
+    state = pipeline.validate_draft({
+        "user_inputs": {}, "legal_references": [{}], "corrected_draft": draft
+    })
+
+    assert len(drafter.calls) == 1
+    section_text, problems = drafter.calls[0]
+    assert "2.1 Fees are due" in section_text and "2.2 Late payments" in section_text
+    assert len(problems) == 2
+    assert "2.1" not in state["corrected_draft"]
+    assert "2. PAYMENT TERMS\n\nThe Client shall pay on signature. [Ref 1]\n\n3. TERM" in state["corrected_draft"]
+    assert state["validation"]["ok"]
+
+
+@pytest.mark.parametrize("target_language, stage_class", [(None, StageClass.CPU), ("Hindi", StageClass.IO)])
+def test_customization_runs_on_the_executor_for_its_workload(target_language, stage_class):
+    scheduler = StageScheduler({StageClass.CPU: 1, StageClass.IO: 1})
+    pipeline = ContractPipeline(
+        StubRetriever(), DraftingAgent(client=stub_client()), CorrectionAgent(), JurisdictionCustomizationAgent(),
+        scheduler=scheduler
+    )
+    threads = []
+    customize = pipeline.customize_contract
+    pipeline.customize_contract = lambda *args: threads.append(threading.current_thread().name) or customize(*args)
+    state = {"corrected_draft": "EMPLOYMENT AGREEMENT", "user_key": None,
+             "user_inputs": dict(inputs_for(1), target_language=target_language)}
+    try:
+        pipeline.customize_jurisdiction(state)
+    finally:
+        scheduler.shutdown()
+    assert len(threads) == 1 and threads[0].startswith(f"themis-{stage_class.value}")
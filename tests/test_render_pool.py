@@ -0,0 +1,66 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.core.render_pool import RenderJob, RenderPool, RenderQueueFull
+
+
+def render(seconds):
+    time.sleep(seconds)
+    return {"seconds": seconds, "pages": 1}
+
+
+def test_timed_out_render_keeps_its_slot_until_the_worker_finishes():
+    pool = RenderPool(workers=1, max_pending=1, timeout=0.2)
+
+    async def main():
+        job = await pool.ensure("slow", render, 1.0)
+        assert job.status == RenderJob.FAILED
+        # The worker is still busy with the render that timed out
+        with pytest.raises(RenderQueueFull):
+            pool.submit("next", render, 0)
+        await asyncio.sleep(1.2)
+        assert pool._pending == 0
+
+    try:
+        asyncio.run(main())
+    finally:
+        pool.shutdown()
+
+
+def test_pending_renders_share_one_job():
+    pool = RenderPool(workers=1, max_pending=4, timeout=5)
+
+    async def main():
+        first = pool.submit("key", render, 0.2)
+        second = pool.submit("key", render, 0.2)
+        assert first is second
+        await asyncio.shield(first.task)
+        return first
+
+    try:
+        job = asyncio.run(main())
+    finally:
+        pool.shutdown()
+    assert job.status == RenderJob.READY
+    assert job.result == {"seconds": 0.2, "pages": 1}
+    assert pool._pending == 0
+
+
+def test_on_ready_runs_off_the_event_loop():
+    pool = RenderPool(workers=1, max_pending=1, timeout=5)
+    calls = []
+
+    async def main():
+        job = await pool.ensure("key", render, 0, on_ready=lambda result: calls.append((result, threading.get_ident())))
+        return job, threading.get_ident()
+
+    try:
+        job, loop_thread = asyncio.run(main())
+    finally:
+        pool.shutdown()
+    assert job.status == RenderJob.READY
+    assert [result for result, _ in calls] == [{"seconds": 0, "pages": 1}]
+    assert calls[0][1] != loop_thread
@@ -0,0 +1,43 @@
+import contextvars
+import threading
+
+from app.core.scheduler import StageClass, StageScheduler
+
+request_id = contextvars.ContextVar("request_id", default=None)
+
+
+def test_stages_run_on_their_own_executor():
+    scheduler = StageScheduler({StageClass.CPU: 1, StageClass.IO: 2})
+    try:
+        names = {
+            stage_class: scheduler.run(stage_class, lambda: threading.current_thread().name)
+            for stage_class in StageClass
+        }
+    finally:
+        scheduler.shutdown()
+    assert names[StageClass.CPU].startswith("themis-cpu")
+    assert names[StageClass.IO].startswith("themis-io")
+
+
+def test_context_variables_reach_the_worker():
+    scheduler = StageScheduler({StageClass.CPU: 1, StageClass.IO: 1})
+    request_id.set("request-7")
+    try:
+        assert scheduler.run(StageClass.IO, request_id.get) == "request-7"
+    finally:
+        scheduler.shutdown()
+
+
+def test_saturation_is_reported_per_executor():
+    scheduler = StageScheduler({StageClass.CPU: 2, StageClass.IO: 4})
+    release = threading.Event()
+    try:
+        future = scheduler.submit(StageClass.CPU, release.wait)
+        while scheduler.saturation()["cpu"]["active"] == 0:
+            pass
+        assert scheduler.saturation()["cpu"]["saturation"] == 0.5
+        assert scheduler.saturation()["io"]["saturation"] == 0
+        release.set()
+        future.result()
+    finally:
+        scheduler.shutdown()
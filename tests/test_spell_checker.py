@@ -0,0 +1,51 @@
+import pytest
+
+from app.agents.correction_agent import CorrectionAgent
+from app.agents.spell_checker import SpellChecker, load_spell_checker
+from app.core.config import settings
+
+
+@pytest.fixture(scope="module")
+def checker():
+    return load_spell_checker()
+
+
+@pytest.mark.parametrize(
+    "word",
+    [
+        "pledgee", "pledgees", "bailment", "demised", "demising", "estopped", "challan", "consignees",
+        "mortgagors", "arbitrated", "ipso", "cgst", "sgst", "igst", "utgst", "gstin", "lessees",
+    ],
+)
+def test_legal_and_tax_words_are_left_alone(checker, word):
+    text = f"the {word} shall apply"
+    assert checker.correct(text) == (text, [])
+
+
+@pytest.mark.parametrize(
+    "typo, expected",
+    [("agrement", "agreement"), ("indemnfy", "indemnify"), ("claimss", "claims"), ("terminaton", "termination")],
+)
+def test_typos_are_still_corrected(checker, typo, expected):
+    assert checker.correct(f"the {typo} is void") == (f"the {expected} is void", [(typo, expected)])
+
+
+@pytest.mark.parametrize(
+    "word", ["consignees", "demising", "estopped", "arbitrated", "pledgee", "mortgagors", "remedies", "boxes"]
+)
+def test_inflections_of_known_words_are_known(word):
+    checker = SpellChecker(["consign", "demise", "estop", "arbitrate", "pledge", "mortgage", "remedy", "box"])
+    assert checker.is_known(word)
+    assert checker.suggest(word) is None
+
+
+def test_glossary_terms_win_over_general_words():
+    checker = SpellChecker(["ailment", "demise"], glossary=["non-bailable"])
+    assert "bailable" in checker and "non" in checker
+    assert checker.suggest("bailabel") == "bailable"
+    assert checker.suggest("ailmnt") == "ailment"
+
+
+def test_spelling_correction_is_off_by_default():
+    assert settings.SPELLCHECK_ENABLED is False
+    assert CorrectionAgent().spell_checker is None